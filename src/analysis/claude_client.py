@@ -1,107 +1,499 @@
 """Thin wrapper around the Anthropic Python SDK for Claude API calls."""
 
+import asyncio
+import collections
+import difflib
 import logging
+import random
 import time
-from typing import Optional
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, AsyncIterator, NamedTuple, Optional, Union
 
 import anthropic
 
-from src.config import ANTHROPIC_API_KEY, CLAUDE_MODEL
+from src.analysis.llm_cache import LLMCache
+from src.analysis.prompts import SYSTEM_PROMPT_SCIENTIST
+from src.config import (
+    ANTHROPIC_API_KEY,
+    CLAUDE_MODEL,
+    CLAUDE_REQUESTS_PER_MINUTE,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_TEMPERATURE,
+    LLM_CACHE_SIMILARITY_THRESHOLD,
+    LLM_CACHE_TTL_SECONDS,
+)
+
+if TYPE_CHECKING:
+    import httpx
 
 logger = logging.getLogger(__name__)
 
-SYSTEM_PROMPT_SCIENTIST = """You are a senior molecular diagnostics scientist specializing in TB \
-detection using qPCR-based point-of-care devices. You have deep expertise in:
-
-- qPCR interpretation: Ct values, amplification curve quality (sigmoid vs \
-sloping), limit of detection (LOD), and what these mean for assay performance
-- TB-specific assays: IS6110, IS1081 (M. tuberculosis detection), \
-rpoB (rifampicin resistance), Human (internal control)
-- Polymerase comparison: DsBio HS (hot-start) vs fTaq and their behavior \
-with different sample matrices
-- Sample types: tongue swabs, sputum, liquid controls, and how matrix \
-effects (inhibitors) impact PCR performance
-- Thermocycling optimization: preheating, touchdown sequences, annealing \
-temperature effects
-- Dual-channel qPCR: FAM (target detection) and ROX (internal control) \
-fluorophore channels
-
-Key domain knowledge:
-- Lower Ct = earlier amplification = more target DNA = better detection
-- Sigmoid curves indicate clean amplification; sloping curves suggest inhibition
-- A Ct difference >2 between conditions is generally meaningful
-- "0" or "-" in Ct data means no amplification detected
-- Human control (ROX channel) should always amplify in clinical samples
-- Good LOD for TB detection: reliable detection at <100 copies per reaction"""
+# A cached prefix is one static block, or up to three blocks ordered from
+# least to most frequently changing (the system prompt takes the fourth
+# cache breakpoint)
+CachedPrefix = Union[str, list[str], None]
+
+# Upper bound on any single retry wait, in seconds
+MAX_RETRY_WAIT = 60.0
+
+REVISION_PROMPT = """This request was answered before on slightly different input data. \
+The changes to the input are shown below as a unified diff, followed by the \
+previous response.
+
+## Changes to the Input Data
+```diff
+{diff}
+```
+
+## Previous Response
+{previous_response}
+
+Revise the previous response so it reflects the changed input. Keep everything \
+the changes do not affect, and return the complete revised response in the \
+same format."""
+
+
+class _PreparedRequest(NamedTuple):
+    """Message content for one request, plus its response-cache lookup result."""
+
+    system_prompt: str
+    content: Union[str, list[dict]]
+    cache_key: Optional[str] = None
+    template_key: Optional[str] = None
+    cached: Optional[str] = None
+
+
+def _cached_block(text: str) -> dict:
+    """Wrap text in a content block marked as a prompt-cache breakpoint."""
+    return {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+
+
+def _prefix_blocks(cached_prefix: CachedPrefix) -> list[str]:
+    """Normalize a cached prefix to a list of block texts."""
+    if not cached_prefix:
+        return []
+    if isinstance(cached_prefix, str):
+        return [cached_prefix]
+    return list(cached_prefix)
+
+
+def _user_content(user_prompt: str, cached_prefix: CachedPrefix) -> Union[str, list[dict]]:
+    """Build user message content, with each cached prefix block as its own breakpoint."""
+    blocks = _prefix_blocks(cached_prefix)
+    if blocks:
+        return [_cached_block(text) for text in blocks] + [{"type": "text", "text": user_prompt}]
+    return user_prompt
+
+
+def _revision_prompt(previous_input: str, new_input: str, previous_response: str) -> str:
+    """Build a prompt asking Claude to patch a previous response for changed input."""
+    diff = "\n".join(difflib.unified_diff(
+        previous_input.splitlines(), new_input.splitlines(),
+        fromfile="previous", tofile="current", n=2, lineterm="",
+    ))
+    return REVISION_PROMPT.format(diff=diff, previous_response=previous_response)
+
+
+def _server_retry_hint(error: anthropic.APIStatusError) -> float:
+    """Seconds the server asked us to wait, from retry-after or rate-limit reset headers."""
+    headers = error.response.headers
+    retry_after = headers.get("retry-after")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+
+    hint = 0.0
+    now = datetime.now(timezone.utc)
+    for name, value in headers.items():
+        if name.lower().startswith("anthropic-ratelimit-") and name.lower().endswith("-reset"):
+            try:
+                reset_at = datetime.fromisoformat(value)
+            except ValueError:
+                continue
+            hint = max(hint, (reset_at - now).total_seconds())
+    return hint
+
+
+def _retry_wait(attempt: int, error: anthropic.APIStatusError) -> float:
+    """Jittered exponential backoff, at least the server's hint, capped at MAX_RETRY_WAIT.
+
+    A retry-after hint longer than the cap is cut short; the retried request
+    may then be rejected again and use up another attempt.
+    """
+    base = min(2 ** attempt, 30)
+    wait = max(_server_retry_hint(error), random.uniform(base, base * 3))
+    return min(wait, MAX_RETRY_WAIT)
+
+
+def _default_http_client():
+    """Build the async HTTP transport, preferring aiohttp over httpx.
+
+    httpx's async pool degrades under many concurrent requests; the aiohttp
+    transport ships with the ``anthropic[aiohttp]`` extra. Falls back to the
+    SDK's default httpx client when the extra is not installed.
+    """
+    try:
+        return anthropic.DefaultAioHttpClient()
+    except RuntimeError:
+        logger.debug("aiohttp transport unavailable, using httpx")
+        return anthropic.DefaultAsyncHttpxClient()
+
+
+class RateLimiter:
+    """Async sliding-window limiter: at most ``rate`` requests per ``period`` seconds."""
+
+    def __init__(self, rate: int, period: float = 60.0):
+        self._rate = rate
+        self._period = period
+        self._timestamps: collections.deque[float] = collections.deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until another request fits in the window, then claim it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                while self._timestamps and now - self._timestamps[0] >= self._period:
+                    self._timestamps.popleft()
+                if len(self._timestamps) < self._rate:
+                    self._timestamps.append(now)
+                    return
+                await asyncio.sleep(self._period - (now - self._timestamps[0]))
 
 
 class ClaudeClient:
-    """Wrapper around the Anthropic API with retry logic and token budgeting."""
+    """Async wrapper around the Anthropic API with retry logic and token budgeting.
+
+    Independent calls on the same client can be awaited concurrently (e.g. via
+    ``asyncio.gather``) and share one connection pool, so create one client
+    and reuse it rather than constructing one per call. Use as an async
+    context manager, or call ``close()``, to release the pool when done.
+    """
 
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: Optional[str] = None,
         max_retries: int = 3,
+        cache: Optional[LLMCache] = None,
+        http_client: Optional["httpx.AsyncClient"] = None,
+        requests_per_minute: Optional[int] = CLAUDE_REQUESTS_PER_MINUTE,
     ):
-        self._client = anthropic.Anthropic(api_key=api_key or ANTHROPIC_API_KEY)
+        """Initialize the client.
+
+        Args:
+            api_key: Anthropic API key. Defaults to config.
+            model: Model name. Defaults to config.
+            max_retries: Attempts per request on rate-limit/server errors.
+            cache: Response cache. Defaults to one built from config.
+            http_client: Optional shared async HTTP client, e.g.
+                ``anthropic.DefaultAsyncHttpxClient(http2=True)`` (needs
+                ``h2``), to keep one warm connection pool across several
+                ClaudeClients. The caller owns it; ``close()`` leaves it open.
+            requests_per_minute: Client-side request rate cap shared by all
+                concurrent calls on this client. None disables it.
+        """
+        self._owns_http_client = http_client is None
+        self._client = anthropic.AsyncAnthropic(
+            api_key=api_key or ANTHROPIC_API_KEY,
+            http_client=http_client or _default_http_client(),
+        )
         self._model = model or CLAUDE_MODEL
         self._max_retries = max_retries
+        self._rate_limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+        self._cache = cache or LLMCache(
+            ttl_seconds=LLM_CACHE_TTL_SECONDS,
+            max_temperature=LLM_CACHE_MAX_TEMPERATURE,
+            enabled=LLM_CACHE_ENABLED,
+        )
+
+    async def __aenter__(self) -> "ClaudeClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
 
-    def send_message(
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool, unless it was injected."""
+        if self._owns_http_client:
+            await self._client.close()
+
+    async def send_message(
         self,
         user_prompt: str,
         system_prompt: Optional[str] = None,
         max_tokens: int = 8192,
         temperature: float = 0.3,
+        cached_prefix: CachedPrefix = None,
     ) -> str:
         """Send a message to Claude and return the response text.
 
+        The system prompt is always sent as a prompt-cache breakpoint. When
+        ``cached_prefix`` is given it is sent as further breakpoints ahead of
+        ``user_prompt``, so only the week-specific suffix is billed at the
+        full input rate on repeat calls. Identical requests are answered
+        from the local response cache when the temperature allows it; a
+        near-identical request on the same cached prefix is sent as a
+        revision of the previous response rather than from scratch.
+
         Args:
-            user_prompt: The user message content.
+            user_prompt: The user message content (dynamic suffix).
             system_prompt: Optional system prompt. Defaults to scientist prompt.
             max_tokens: Maximum tokens in the response.
             temperature: Sampling temperature.
+            cached_prefix: Optional static text placed before the user prompt
+                and marked for prompt caching. Pass a list to send several
+                blocks, each its own breakpoint, ordered from least to most
+                frequently changing.
 
         Returns:
             The assistant's response text.
         """
+        request = self._prepare_request(
+            user_prompt, system_prompt, max_tokens, temperature, cached_prefix
+        )
+        if request.cached is not None:
+            return request.cached
+
+        text = await self._create(request.system_prompt, request.content, max_tokens, temperature)
+        self._store(request, user_prompt, text)
+        return text
+
+    async def send_message_stream(
+        self,
+        user_prompt: str,
+        system_prompt: Optional[str] = None,
+        max_tokens: int = 8192,
+        temperature: float = 0.3,
+        cached_prefix: CachedPrefix = None,
+    ) -> AsyncIterator[str]:
+        """Stream a message to Claude, yielding response text as it arrives.
+
+        Takes the same arguments and uses the same caching as
+        ``send_message``; a cache hit is yielded as a single chunk. Failed
+        requests are retried only if no text has been yielded yet.
+        """
+        request = self._prepare_request(
+            user_prompt, system_prompt, max_tokens, temperature, cached_prefix
+        )
+        if request.cached is not None:
+            yield request.cached
+            return
+
+        chunks = []
+        async for text in self._stream(request.system_prompt, request.content, max_tokens, temperature):
+            chunks.append(text)
+            yield text
+        self._store(request, user_prompt, "".join(chunks))
+
+    def _prepare_request(
+        self,
+        user_prompt: str,
+        system_prompt: Optional[str],
+        max_tokens: int,
+        temperature: float,
+        cached_prefix: CachedPrefix,
+    ) -> _PreparedRequest:
+        """Build the message content and resolve it against the response cache."""
         if system_prompt is None:
             system_prompt = SYSTEM_PROMPT_SCIENTIST
 
+        content = _user_content(user_prompt, cached_prefix)
+
+        if not self._cache.accepts(temperature):
+            return _PreparedRequest(system_prompt, content)
+
+        cache_key = LLMCache.make_key(
+            model=self._model,
+            system=system_prompt,
+            user="".join(_prefix_blocks(cached_prefix)) + user_prompt,
+            temperature=temperature,
+            max_tokens=max_tokens,
+        )
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            logger.info("Using cached Claude response")
+            return _PreparedRequest(system_prompt, content, cached=cached)
+
+        template_key = None
+        if cached_prefix:
+            template_key = LLMCache.make_key(
+                model=self._model,
+                system=system_prompt,
+                user="".join(_prefix_blocks(cached_prefix)),
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            similar = self._cache.find_similar(
+                template_key, user_prompt, LLM_CACHE_SIMILARITY_THRESHOLD
+            )
+            if similar is not None:
+                logger.info("Near-duplicate of a cached request, revising previous response")
+                previous_input, previous_response = similar
+                revision = _revision_prompt(previous_input, user_prompt, previous_response)
+                content = _user_content(revision, cached_prefix)
+
+        return _PreparedRequest(system_prompt, content, cache_key, template_key)
+
+    def _store(self, request: _PreparedRequest, user_prompt: str, text: str) -> None:
+        """Save a fresh response to the cache, if the request is cacheable."""
+        if request.cache_key is None:
+            return
+        self._cache.set(request.cache_key, text)
+        if request.template_key is not None:
+            self._cache.remember(request.template_key, user_prompt, request.cache_key)
+
+    def _message_params(
+        self,
+        system_prompt: str,
+        content: Union[str, list[dict]],
+        max_tokens: int,
+        temperature: float,
+    ) -> dict:
+        """Build Messages API parameters, shared by direct and batch requests."""
+        return {
+            "model": self._model,
+            "max_tokens": max_tokens,
+            "system": [_cached_block(system_prompt)],
+            "messages": [{"role": "user", "content": content}],
+            "temperature": temperature,
+        }
+
+    async def _create(
+        self,
+        system_prompt: str,
+        content: Union[str, list[dict]],
+        max_tokens: int,
+        temperature: float,
+    ) -> str:
+        """Call the Messages API with retries and return the response text."""
         for attempt in range(self._max_retries):
+            await self._throttle()
             try:
-                message = self._client.messages.create(
-                    model=self._model,
-                    max_tokens=max_tokens,
-                    system=system_prompt,
-                    messages=[{"role": "user", "content": user_prompt}],
-                    temperature=temperature,
+                message = await self._client.messages.create(
+                    **self._message_params(system_prompt, content, max_tokens, temperature)
                 )
                 return message.content[0].text
+            except anthropic.APIStatusError as e:
+                await self._backoff(attempt, e)
+
+        raise RuntimeError(f"Failed after {self._max_retries} retries")
 
-            except anthropic.RateLimitError:
-                wait_time = 2 ** (attempt + 1)
-                logger.warning(f"Rate limited, waiting {wait_time}s (attempt {attempt + 1})")
-                time.sleep(wait_time)
+    async def _stream(
+        self,
+        system_prompt: str,
+        content: Union[str, list[dict]],
+        max_tokens: int,
+        temperature: float,
+    ) -> AsyncIterator[str]:
+        """Stream from the Messages API, retrying until the first chunk arrives."""
+        for attempt in range(self._max_retries):
+            started = False
+            await self._throttle()
+            try:
+                async with self._client.messages.stream(
+                    **self._message_params(system_prompt, content, max_tokens, temperature)
+                ) as stream:
+                    async for text in stream.text_stream:
+                        started = True
+                        yield text
+                return
             except anthropic.APIStatusError as e:
-                if e.status_code >= 500:
-                    wait_time = 2 ** (attempt + 1)
-                    logger.warning(f"Server error {e.status_code}, retrying in {wait_time}s")
-                    time.sleep(wait_time)
-                else:
+                if started:
                     raise
+                await self._backoff(attempt, e)
 
         raise RuntimeError(f"Failed after {self._max_retries} retries")
 
-    def send_message_with_system(
+    async def _throttle(self) -> None:
+        """Wait for the client-side rate limiter, if one is configured."""
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+
+    async def _backoff(self, attempt: int, error: anthropic.APIStatusError) -> None:
+        """Wait before retrying a rate-limit or server error; re-raise anything else."""
+        if isinstance(error, anthropic.RateLimitError):
+            wait_time = _retry_wait(attempt, error)
+            logger.warning(f"Rate limited, waiting {wait_time:.1f}s (attempt {attempt + 1})")
+        elif error.status_code >= 500:
+            wait_time = _retry_wait(attempt, error)
+            logger.warning(f"Server error {error.status_code}, retrying in {wait_time:.1f}s")
+        else:
+            raise error
+        await asyncio.sleep(wait_time)
+
+    async def submit_batch(self, jobs: list[dict]) -> str:
+        """Submit requests to the Message Batches API.
+
+        Batches are billed at half the standard rate but complete
+        asynchronously (usually within an hour), so use them for backfills
+        and other non-interactive runs. Batched requests bypass the local
+        response cache.
+
+        Args:
+            jobs: One dict per request with a unique ``custom_id`` plus the
+                ``send_message`` arguments (``user_prompt`` and optionally
+                ``system_prompt``, ``max_tokens``, ``temperature``,
+                ``cached_prefix``).
+
+        Returns:
+            The batch ID, for ``poll_batch``.
+        """
+        requests = []
+        for job in jobs:
+            system_prompt = job.get("system_prompt") or SYSTEM_PROMPT_SCIENTIST
+            content = _user_content(job["user_prompt"], job.get("cached_prefix"))
+            requests.append({
+                "custom_id": job["custom_id"],
+                "params": self._message_params(
+                    system_prompt,
+                    content,
+                    job.get("max_tokens", 8192),
+                    job.get("temperature", 0.3),
+                ),
+            })
+
+        batch = await self._client.messages.batches.create(requests=requests)
+        logger.info(f"Submitted message batch {batch.id} ({len(requests)} requests)")
+        return batch.id
+
+    async def poll_batch(
+        self,
+        batch_id: str,
+        poll_interval: float = 60.0,
+    ) -> dict[str, Optional[str]]:
+        """Wait for a message batch to end and collect its results.
+
+        Returns:
+            Dict mapping each custom_id to its response text, or None if
+            that request errored, was canceled, or expired.
+        """
+        while True:
+            batch = await self._client.messages.batches.retrieve(batch_id)
+            if batch.processing_status == "ended":
+                break
+            logger.info(f"Batch {batch_id} still {batch.processing_status}, checking again in {poll_interval:.0f}s")
+            await asyncio.sleep(poll_interval)
+
+        results: dict[str, Optional[str]] = {}
+        async for entry in await self._client.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = entry.result.message.content[0].text
+            else:
+                logger.warning(f"Batch request {entry.custom_id} {entry.result.type}")
+                results[entry.custom_id] = None
+        return results
+
+    async def send_message_with_system(
         self,
         user_prompt: str,
         system_prompt: str,
         max_tokens: int = 8192,
     ) -> str:
         """Send a message with a custom system prompt."""
-        return self.send_message(
+        return await self.send_message(
             user_prompt=user_prompt,
             system_prompt=system_prompt,
             max_tokens=max_tokens,
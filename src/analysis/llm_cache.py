@@ -0,0 +1,162 @@
+"""On-disk cache for Claude responses.
+
+Identical requests (same model, prompts, temperature and token limit) are
+served from ``data/llm_cache`` instead of the API, which makes development
+re-runs and replays after downstream failures free.
+
+Requests that share a static template (a cached prompt prefix) also record
+their dynamic text per template, so a near-duplicate re-run (e.g. a week
+re-run after a corrected sheet) can be matched to the previous response.
+"""
+
+import difflib
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+import orjson
+
+from src.config import LLM_CACHE_DIR
+
+# Previous inputs remembered per template for near-duplicate matching
+MAX_TEMPLATE_ENTRIES = 8
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """SHA-256 keyed store of response texts, one JSON file per entry.
+
+    Entries live at ``<cache_dir>/<key[:2]>/<key>.json``.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl_seconds: Optional[float] = None,
+        max_temperature: float = 0.0,
+        enabled: bool = True,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache files. Defaults to config.
+            ttl_seconds: Entry lifetime. None means entries never expire.
+            max_temperature: Highest sampling temperature that is cached.
+                Defaults to 0 (deterministic calls only); pass a higher value
+                to opt in to caching sampled responses.
+            enabled: Set False to bypass the cache entirely.
+        """
+        self._dir = cache_dir or LLM_CACHE_DIR
+        self._ttl = ttl_seconds
+        self._max_temperature = max_temperature
+        self._enabled = enabled
+
+    def accepts(self, temperature: float) -> bool:
+        """Whether a call at this temperature may be cached."""
+        return self._enabled and temperature <= self._max_temperature
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system: str,
+        user: str,
+        temperature: float,
+        max_tokens: int,
+    ) -> str:
+        """Compute the cache key for a request."""
+        payload = orjson.dumps(
+            {
+                "model": model,
+                "system": system,
+                "user": user,
+                "temp": temperature,
+                "max_tokens": max_tokens,
+            },
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        # Shard by key prefix so no directory grows to tens of thousands of files
+        return self._dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text, or None on a miss or expiry."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            entry = orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path.name}: {e}")
+            return None
+        if self._ttl is not None and time.time() - entry.get("created_at", 0) > self._ttl:
+            return None
+        return entry.get("response")
+
+    def set(self, key: str, response: str) -> None:
+        """Store a response text under the given key."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps({"created_at": time.time(), "response": response}))
+        os.replace(tmp_path, path)
+
+    def _template_path(self, template_key: str) -> Path:
+        return self._dir / "templates" / f"{template_key}.json"
+
+    def _load_template_entries(self, template_key: str) -> list[dict]:
+        path = self._template_path(template_key)
+        if not path.exists():
+            return []
+        try:
+            return orjson.loads(path.read_bytes())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable template index {path.name}: {e}")
+            return []
+
+    def remember(self, template_key: str, dynamic_text: str, key: str) -> None:
+        """Record the dynamic text of a cached request under its template."""
+        entries = [e for e in self._load_template_entries(template_key) if e["key"] != key]
+        entries.append({"key": key, "dynamic": dynamic_text})
+        entries = entries[-MAX_TEMPLATE_ENTRIES:]
+
+        path = self._template_path(template_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(orjson.dumps(entries))
+        os.replace(tmp_path, path)
+
+    def find_similar(
+        self,
+        template_key: str,
+        dynamic_text: str,
+        threshold: float,
+    ) -> Optional[tuple[str, str]]:
+        """Find a cached request on the same template with near-identical input.
+
+        Similarity is the line-level difflib ratio between dynamic texts.
+
+        Returns:
+            (previous dynamic text, previous response) for the closest entry
+            scoring at least ``threshold``, or None.
+        """
+        new_lines = dynamic_text.splitlines()
+        best = None
+        best_ratio = threshold
+        for entry in self._load_template_entries(template_key):
+            matcher = difflib.SequenceMatcher(
+                None, entry["dynamic"].splitlines(), new_lines, autojunk=False
+            )
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                response = self.get(entry["key"])
+                if response is not None:
+                    best, best_ratio = (entry["dynamic"], response), ratio
+        return best
@@ -0,0 +1,174 @@
+"""Prompt templates for the weekly analysis pipeline.
+
+Kept in one module so every stage shares a single copy of each template.
+"""
+
+SYSTEM_PROMPT_SCIENTIST = """You are a senior molecular diagnostics scientist specializing in TB \
+detection using qPCR-based point-of-care devices. You have deep expertise in:
+
+- qPCR interpretation: Ct values, amplification curve quality (sigmoid vs \
+sloping), limit of detection (LOD), and what these mean for assay performance
+- TB-specific assays: IS6110, IS1081 (M. tuberculosis detection), \
+rpoB (rifampicin resistance), Human (internal control)
+- Polymerase comparison: DsBio HS (hot-start) vs fTaq and their behavior \
+with different sample matrices
+- Sample types: tongue swabs, sputum, liquid controls, and how matrix \
+effects (inhibitors) impact PCR performance
+- Thermocycling optimization: preheating, touchdown sequences, annealing \
+temperature effects
+- Dual-channel qPCR: FAM (target detection) and ROX (internal control) \
+fluorophore channels
+
+Key domain knowledge:
+- Lower Ct = earlier amplification = more target DNA = better detection
+- Sigmoid curves indicate clean amplification; sloping curves suggest inhibition
+- A Ct difference >2 between conditions is generally meaningful
+- "0" or "-" in Ct data means no amplification detected
+- Human control (ROX channel) should always amplify in clinical samples
+- Good LOD for TB detection: reliable detection at <100 copies per reaction"""
+
+CONSTRAINT_SYSTEM_PROMPT = "You are a project management assistant analyzing team journals."
+
+# Stage 1 and 2 prompts are split into a static prefix (instructions plus the
+# slowly-changing project arc) and a dynamic suffix (this week's data). The
+# prefix is sent as a prompt-cache breakpoint, so it must not contain anything
+# week-specific.
+ANALYSIS_PROMPT = """## Your Analysis Tasks:
+
+1. EXPERIMENT FAMILY CLASSIFICATION
+   - For each experiment this week, identify its family/series
+   - Classify as: NEW (first time investigating this question), \
+CONTINUATION (same setup as a previous experiment), or \
+MODIFICATION (changed one or more variables from a previous experiment)
+   - If a continuation/modification, reference the previous experiment(s)
+   - In sparse weeks (1-3 experiments), focus on lineage rather than statistics
+
+2. EXECUTIVE SUMMARY (for leadership)
+   - 3-5 bullet points covering the week's most important findings
+   - Written for a non-scientist audience (clear, jargon-minimized)
+
+3. EXPERIMENT-BY-EXPERIMENT ANALYSIS (for scientists)
+   - For each experiment, evaluate:
+     - Did the experiment achieve its stated purpose?
+     - What do the Ct values tell us? (ONLY compare within same experiment family)
+     - If continuation/modification: how do results compare to previous runs \
+in this series? Did the variable change improve or worsen performance?
+     - Quality assessment: consistent replicates? controls amplifying?
+   - DO NOT compare Ct values across different experiment families/setups
+
+4. CONTRADICTION & ANOMALY CHECK
+   - Flag any results that contradict previous findings or expected behavior
+   - Flag unexpected Ct values (unusually high, unusually low, or missing)
+   - Flag when scientist Resume conclusions don't match the raw data
+   - For each flag, explain why it might have occurred and whether it needs follow-up
+
+5. CROSS-EXPERIMENT INSIGHTS
+   - Identify patterns or trends across this week's experiments
+   - Note any emerging conclusions about assay/polymerase/sample combinations
+
+6. UPDATED CUMULATIVE LEARNINGS
+   - Return an updated version of the cumulative learnings as a JSON block \
+wrapped in ```json ... ``` with these fields:
+     - key_learnings: list of strings (add new, keep valid existing ones)
+     - open_questions: list of strings (remove answered, add new)
+     - experiment_history_summary: dict with experiment family summaries
+     - goal_progress: dict with goal status updates
+
+## Institutional Knowledge (project history)
+{project_arc}"""
+
+ANALYSIS_DATA_PROMPT = """## This Week's Experiment Data
+{experiment_data}
+
+## Cumulative Learnings (from recent weeks)
+{cumulative_learnings}
+
+## Team Journal Entries (this week)
+{journal_entries}
+
+Complete the analysis tasks above using this week's data."""
+
+CONSTRAINT_EXTRACTION_PROMPT = """Read the following team journal entries and meeting minutes from this week.
+Extract practical constraints for experiment planning:
+
+1. DEVICE STATUS: Which devices (TS-003, TS-005, TS-006, etc.) are:
+   - Working normally (used in recent experiments)
+   - Having issues (debugging, firmware updates, hardware problems)
+   - Being modified or updated
+
+2. SCIENTIST AVAILABILITY: Based on journal entries, who is:
+   - Actively running experiments (available for more)
+   - Focused on engineering/hardware tasks (likely busy)
+   - Mentioned as absent or on other projects
+
+3. CONSUMABLE/REAGENT STATUS:
+   - Any reagent batches mentioned as running low or being ordered
+   - New reagent batches arriving
+   - Consumable issues (cartridge assembly problems, vial issues)
+
+4. BLOCKERS & DEPENDENCIES:
+   - Anything the team is waiting on (parts, approvals, external samples)
+   - Firmware or software updates needed before certain experiments
+   - Equipment being repaired or calibrated
+
+Return as structured JSON wrapped in ```json ... ```."""
+
+CONSTRAINT_DATA_PROMPT = """## Journal Entries
+{journal_text}"""
+
+# Appended to the analysis prefix when constraints are extracted in the same
+# call. The analysis comes first so its learnings block is the first JSON block.
+COMBINED_TASKS_PROMPT = """## Additional Task: Planning Constraints
+Also complete the following task using this week's team journal entries.
+
+{constraint_tasks}
+
+## Response Format
+Wrap the complete analysis (tasks 1-6) in <analysis>...</analysis>, then the \
+planning constraints in <constraints>...</constraints>."""
+
+# Stage 2 recommendations
+RECOMMENDATION_PROMPT = """## Your Recommendation Tasks:
+
+1. GOAL URGENCY ASSESSMENT
+   - For each goal, assess: days remaining, estimated % complete, risk level
+   - Flag any goals at risk of being missed
+
+2. STRATEGIC DIRECTION (for PM)
+   - What should the team focus on this week and why?
+   - Are there any pivots needed based on recent results?
+   - Explicitly connect your strategy to specific goals and deadlines
+
+3. SPECIFIC EXPERIMENT RECOMMENDATIONS (3-5 experiments)
+   For each recommended experiment:
+   - **Title**: Descriptive experiment name
+   - **Rationale**: Why this experiment, what question does it answer
+   - **Goal alignment**: Which goal(s) it advances and how
+   - **Parameters**:
+     - Assay(s): which assays to use
+     - Polymerase: DsBio HS or fTaq (and why)
+     - Sample type: tongue swab, sputum, liquid control, etc.
+     - Concentrations: specific copy numbers to test
+     - Sequence: which thermocycling protocol (e.g., V6 preheat+touchdown)
+     - Device: which device to use (considering availability)
+   - **Assigned to**: Suggested scientist (considering availability and expertise)
+   - **Expected outcome**: What result would be a success?
+   - **Decision criteria**: What will we learn, and what decision does it inform?
+   - **Priority**: High / Medium / Low
+
+4. EXPERIMENTS TO AVOID
+   - Any experiments that would be redundant given existing data
+   - Any experiments that are premature (need prerequisite results first)"""
+
+# Goals change far less often than the weekly analysis, so they are sent as
+# their own cached block between the task list and the week's data
+RECOMMENDATION_GOALS_PROMPT = """## Team Goals (with deadlines and requirements)
+{goals_text}"""
+
+RECOMMENDATION_DATA_PROMPT = """## Analysis Summary (from Stage 1)
+{analysis_summary}
+
+## Practical Constraints (auto-extracted from journals)
+{constraints}
+
+Complete the recommendation tasks above using this data."""
@@ -4,14 +4,34 @@ Stage 1: Analyze this week's experiments with full historical context.
 Stage 3: Update cumulative learnings after analysis.
 """
 
-import json
+import asyncio
+import io
 import logging
+import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
-from src.analysis.claude_client import ClaudeClient, SYSTEM_PROMPT_SCIENTIST
-from src.config import CUMULATIVE_LEARNINGS_PATH, KNOWLEDGE_DIR
+import orjson
+
+from src.analysis.claude_client import ClaudeClient
+from src.analysis.prompts import (
+    ANALYSIS_DATA_PROMPT,
+    ANALYSIS_PROMPT,
+    COMBINED_TASKS_PROMPT,
+    CONSTRAINT_DATA_PROMPT,
+    CONSTRAINT_EXTRACTION_PROMPT,
+    CONSTRAINT_SYSTEM_PROMPT,
+    SYSTEM_PROMPT_SCIENTIST,
+)
+from src.analysis.tokens import truncate_middle
+from src.config import (
+    ARC_HEAD_TOKENS,
+    ARC_TOKEN_BUDGET,
+    CUMULATIVE_LEARNINGS_PATH,
+    KNOWLEDGE_DIR,
+)
 from src.models.data import (
     AnalysisResult,
     CumulativeLearnings,
@@ -24,115 +44,65 @@ from src.parsers.journal import entries_to_summary_text
 
 logger = logging.getLogger(__name__)
 
-ANALYSIS_PROMPT = """## Institutional Knowledge (project history)
-{project_arc}
-
-## This Week's Experiment Data
-{experiment_data}
-
-## Cumulative Learnings (from recent weeks)
-{cumulative_learnings}
-
-## Team Journal Entries (this week)
-{journal_entries}
-
-## Your Analysis Tasks:
-
-1. EXPERIMENT FAMILY CLASSIFICATION
-   - For each experiment this week, identify its family/series
-   - Classify as: NEW (first time investigating this question), \
-CONTINUATION (same setup as a previous experiment), or \
-MODIFICATION (changed one or more variables from a previous experiment)
-   - If a continuation/modification, reference the previous experiment(s)
-   - In sparse weeks (1-3 experiments), focus on lineage rather than statistics
-
-2. EXECUTIVE SUMMARY (for leadership)
-   - 3-5 bullet points covering the week's most important findings
-   - Written for a non-scientist audience (clear, jargon-minimized)
-
-3. EXPERIMENT-BY-EXPERIMENT ANALYSIS (for scientists)
-   - For each experiment, evaluate:
-     - Did the experiment achieve its stated purpose?
-     - What do the Ct values tell us? (ONLY compare within same experiment family)
-     - If continuation/modification: how do results compare to previous runs \
-in this series? Did the variable change improve or worsen performance?
-     - Quality assessment: consistent replicates? controls amplifying?
-   - DO NOT compare Ct values across different experiment families/setups
-
-4. CONTRADICTION & ANOMALY CHECK
-   - Flag any results that contradict previous findings or expected behavior
-   - Flag unexpected Ct values (unusually high, unusually low, or missing)
-   - Flag when scientist Resume conclusions don't match the raw data
-   - For each flag, explain why it might have occurred and whether it needs follow-up
+# Opening fence of a ```json block; the closing fence is located with str.find
+_JSON_FENCE_RE = re.compile(r"```json\s*\n")
 
-5. CROSS-EXPERIMENT INSIGHTS
-   - Identify patterns or trends across this week's experiments
-   - Note any emerging conclusions about assay/polymerase/sample combinations
+# A JSON block with none of these keys is not a learnings block
+_LEARNINGS_KEYS = frozenset(CumulativeLearnings.model_fields)
 
-6. UPDATED CUMULATIVE LEARNINGS
-   - Return an updated version of the cumulative learnings as a JSON block \
-wrapped in ```json ... ``` with these fields:
-     - key_learnings: list of strings (add new, keep valid existing ones)
-     - open_questions: list of strings (remove answered, add new)
-     - experiment_history_summary: dict with experiment family summaries
-     - goal_progress: dict with goal status updates"""
 
-CONSTRAINT_EXTRACTION_PROMPT = """Read the following team journal entries and meeting minutes from this week.
-Extract practical constraints for experiment planning:
+@lru_cache(maxsize=4)
+def _read_project_arc(path: Path, mtime_ns: int) -> str:
+    """Read the arc narrative; cached per file modification time."""
+    arc_data = orjson.loads(path.read_bytes())
+    return arc_data.get("narrative", "")
 
-1. DEVICE STATUS: Which devices (TS-003, TS-005, TS-006, etc.) are:
-   - Working normally (used in recent experiments)
-   - Having issues (debugging, firmware updates, hardware problems)
-   - Being modified or updated
 
-2. SCIENTIST AVAILABILITY: Based on journal entries, who is:
-   - Actively running experiments (available for more)
-   - Focused on engineering/hardware tasks (likely busy)
-   - Mentioned as absent or on other projects
+@lru_cache(maxsize=4)
+def _read_cumulative_learnings(path: Path, mtime_ns: int) -> CumulativeLearnings:
+    """Read the learnings file; cached per file modification time."""
+    return CumulativeLearnings(**orjson.loads(path.read_bytes()))
 
-3. CONSUMABLE/REAGENT STATUS:
-   - Any reagent batches mentioned as running low or being ordered
-   - New reagent batches arriving
-   - Consumable issues (cartridge assembly problems, vial issues)
 
-4. BLOCKERS & DEPENDENCIES:
-   - Anything the team is waiting on (parts, approvals, external samples)
-   - Firmware or software updates needed before certain experiments
-   - Equipment being repaired or calibrated
+@lru_cache(maxsize=4)
+def _truncate_project_arc(project_arc: str) -> str:
+    """Truncate the project arc to its token budget, keeping origins and recent history."""
+    return truncate_middle(project_arc, ARC_TOKEN_BUDGET, ARC_HEAD_TOKENS)
 
-Return as structured JSON wrapped in ```json ... ```.
 
-## Journal Entries
-{journal_text}"""
+def invalidate_cache() -> None:
+    """Drop the in-process project arc and cumulative learnings caches."""
+    _read_project_arc.cache_clear()
+    _read_cumulative_learnings.cache_clear()
+    _truncate_project_arc.cache_clear()
 
 
 def load_project_arc() -> str:
     """Load the project arc narrative from the knowledge base."""
     arc_path = KNOWLEDGE_DIR / "project_arc.json"
     if arc_path.exists():
-        arc_data = json.loads(arc_path.read_text(encoding="utf-8"))
-        return arc_data.get("narrative", "")
+        return _read_project_arc(arc_path, arc_path.stat().st_mtime_ns)
     return "No project arc available. This is the first run without bootstrap data."
 
 
 def load_cumulative_learnings() -> CumulativeLearnings:
     """Load the cumulative learnings file."""
     if CUMULATIVE_LEARNINGS_PATH.exists():
-        data = json.loads(CUMULATIVE_LEARNINGS_PATH.read_text(encoding="utf-8"))
-        return CumulativeLearnings(**data)
+        cached = _read_cumulative_learnings(
+            CUMULATIVE_LEARNINGS_PATH, CUMULATIVE_LEARNINGS_PATH.stat().st_mtime_ns
+        )
+        return cached.model_copy(deep=True)
     return CumulativeLearnings()
 
 
 def save_cumulative_learnings(learnings: CumulativeLearnings) -> None:
     """Save updated cumulative learnings."""
     CUMULATIVE_LEARNINGS_PATH.parent.mkdir(parents=True, exist_ok=True)
-    CUMULATIVE_LEARNINGS_PATH.write_text(
-        json.dumps(learnings.model_dump(), indent=2, default=str),
-        encoding="utf-8",
-    )
+    CUMULATIVE_LEARNINGS_PATH.write_text(learnings.model_dump_json(indent=2), encoding="utf-8")
+    invalidate_cache()
 
 
-def extract_constraints(
+async def extract_constraints(
     journal_entries: list[JournalEntry],
     claude: ClaudeClient,
 ) -> str:
@@ -145,16 +115,17 @@ def extract_constraints(
     if not journal_text or journal_text == "No journal entries for this period.":
         return "{}"
 
-    prompt = CONSTRAINT_EXTRACTION_PROMPT.format(journal_text=journal_text)
-    response = claude.send_message(
+    prompt = CONSTRAINT_DATA_PROMPT.format(journal_text=journal_text)
+    response = await claude.send_message(
         prompt,
-        system_prompt="You are a project management assistant analyzing team journals.",
+        system_prompt=CONSTRAINT_SYSTEM_PROMPT,
         max_tokens=2048,
+        cached_prefix=CONSTRAINT_EXTRACTION_PROMPT,
     )
     return response
 
 
-def run_analysis(
+async def run_analysis(
     weekly_data: WeeklyData,
     claude: Optional[ClaudeClient] = None,
 ) -> AnalysisResult:
@@ -167,12 +138,139 @@ def run_analysis(
     Returns:
         AnalysisResult with AI-generated analysis.
     """
-    claude = claude or ClaudeClient()
+    if claude is None:
+        async with ClaudeClient() as claude:
+            return await run_analysis(weekly_data, claude)
+
+    cumulative = load_cumulative_learnings()
+    prefix, prompt = _build_analysis_prompt(weekly_data, cumulative)
+
+    response, updated_learnings = await _stream_analysis(claude, prompt, prefix, max_tokens=8192)
+    return _analysis_result(response, updated_learnings, cumulative)
+
+
+async def run_analyses(
+    weeks: list[WeeklyData],
+    claude: Optional[ClaudeClient] = None,
+    concurrency: int = 8,
+) -> list[AnalysisResult]:
+    """Run Stage 1 analysis for several weeks concurrently.
+
+    At most ``concurrency`` requests are in flight at once, sharing the
+    client's connection pool. As with ``run_analysis_batch``, every week is
+    analyzed against the current cumulative learnings.
+
+    Returns:
+        One AnalysisResult per week, in input order.
+    """
+    if claude is None:
+        async with ClaudeClient() as claude:
+            return await run_analyses(weeks, claude, concurrency)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _guarded(weekly_data: WeeklyData) -> AnalysisResult:
+        async with semaphore:
+            return await run_analysis(weekly_data, claude)
+
+    return await asyncio.gather(*[_guarded(weekly_data) for weekly_data in weeks])
+
+
+async def run_analysis_with_constraints(
+    weekly_data: WeeklyData,
+    claude: Optional[ClaudeClient] = None,
+) -> tuple[str, AnalysisResult]:
+    """Run constraint extraction and Stage 1 analysis in a single Claude call.
+
+    The journal entries are sent once and both task lists are answered in
+    tagged sections, instead of paying for the journal context twice.
+
+    Returns:
+        Tuple of (constraints JSON string, AnalysisResult).
+    """
+    if claude is None:
+        async with ClaudeClient() as claude:
+            return await run_analysis_with_constraints(weekly_data, claude)
+
+    journal_text = entries_to_summary_text(weekly_data.journal_entries)
+    if not journal_text or journal_text == "No journal entries for this period.":
+        return "{}", await run_analysis(weekly_data, claude)
+
+    cumulative = load_cumulative_learnings()
+    prefix, prompt = _build_analysis_prompt(weekly_data, cumulative)
+    prefix += "\n\n" + COMBINED_TASKS_PROMPT.format(constraint_tasks=CONSTRAINT_EXTRACTION_PROMPT)
+
+    # The constraints section has its own JSON block, so only look for the
+    # learnings inside the analysis section
+    response, updated_learnings = await _stream_analysis(
+        claude, prompt, prefix, max_tokens=8192 + 2048, section="analysis"
+    )
+
+    analysis_text = _tagged_section(response, "analysis")
+    constraints = _tagged_section(response, "constraints")
+    if analysis_text is None or constraints is None:
+        logger.warning("Combined response missing <analysis>/<constraints> tags")
+    if analysis_text is None:
+        # Without the tags the streamed search found nothing; search the
+        # whole response, which still rejects blocks without learnings keys
+        updated_learnings = _extract_learnings_json(response)
+    return (
+        constraints or "{}",
+        _analysis_result(analysis_text or response, updated_learnings, cumulative),
+    )
+
+
+async def run_analysis_batch(
+    weeks: list[WeeklyData],
+    claude: Optional[ClaudeClient] = None,
+    poll_interval: float = 60.0,
+) -> list[Optional[AnalysisResult]]:
+    """Run Stage 1 analysis for several weeks through the Message Batches API.
+
+    Intended for backfills: batches cost half as much but finish
+    asynchronously. Every week is analyzed against the current cumulative
+    learnings, since the batched requests cannot see each other's updates.
+
+    Returns:
+        One AnalysisResult per week, in input order (None if that request failed).
+    """
+    if claude is None:
+        async with ClaudeClient() as claude:
+            return await run_analysis_batch(weeks, claude, poll_interval)
 
-    # Load context
-    project_arc = load_project_arc()
     cumulative = load_cumulative_learnings()
 
+    jobs = []
+    for i, weekly_data in enumerate(weeks):
+        prefix, prompt = _build_analysis_prompt(weekly_data, cumulative)
+        jobs.append({
+            "custom_id": f"week-{i}-{weekly_data.week_start.isoformat()}",
+            "user_prompt": prompt,
+            "system_prompt": SYSTEM_PROMPT_SCIENTIST,
+            "max_tokens": 8192,
+            "cached_prefix": prefix,
+        })
+
+    batch_id = await claude.submit_batch(jobs)
+    responses = await claude.poll_batch(batch_id, poll_interval=poll_interval)
+
+    results = []
+    for job in jobs:
+        response = responses.get(job["custom_id"])
+        if response is None:
+            results.append(None)
+            continue
+        results.append(_analysis_result(response, _extract_learnings_json(response), cumulative))
+    return results
+
+
+def _build_analysis_prompt(
+    weekly_data: WeeklyData,
+    cumulative: CumulativeLearnings,
+) -> tuple[str, str]:
+    """Build the cached prefix and week-specific prompt for Stage 1."""
+    project_arc = _truncate_project_arc(load_project_arc())
+
     # Build experiment data text
     exp_texts = []
     for exp in weekly_data.experiments:
@@ -182,28 +280,64 @@ def run_analysis(
     # Build journal text
     journal_text = entries_to_summary_text(weekly_data.journal_entries)
 
-    # Build cumulative learnings text
-    cumulative_text = json.dumps(cumulative.model_dump(), indent=2, default=str)
-
-    # Truncate project arc if too long to fit in context
-    if len(project_arc) > 50000:
-        project_arc = project_arc[:50000] + "\n\n[... truncated for length ...]"
+    # Build cumulative learnings text (compact; indentation only costs tokens)
+    cumulative_text = cumulative.model_dump_json()
 
-    prompt = ANALYSIS_PROMPT.format(
-        project_arc=project_arc,
+    prefix = ANALYSIS_PROMPT.format(project_arc=project_arc)
+    prompt = ANALYSIS_DATA_PROMPT.format(
         experiment_data=experiment_data,
         cumulative_learnings=cumulative_text,
         journal_entries=journal_text,
     )
+    return prefix, prompt
+
+
+async def _stream_analysis(
+    claude: ClaudeClient,
+    prompt: str,
+    prefix: str,
+    max_tokens: int,
+    section: Optional[str] = None,
+) -> tuple[str, Optional[CumulativeLearnings]]:
+    """Stream a Stage 1 response, parsing the learnings block as soon as it closes.
 
-    response = claude.send_message(
+    The learnings JSON is parsed while the rest of the response is still
+    generating.
+
+    Args:
+        section: If set, only look for the learnings block inside
+            <section>...</section>.
+
+    Returns:
+        Tuple of (full response text, parsed learnings or None).
+    """
+    buffer = io.StringIO()
+    learnings_block = None
+    updated_learnings = None
+    async for chunk in claude.send_message_stream(
         prompt,
         system_prompt=SYSTEM_PROMPT_SCIENTIST,
-        max_tokens=8192,
-    )
-
-    # Try to extract updated learnings JSON from the response
-    updated_learnings = _extract_learnings_json(response)
+        max_tokens=max_tokens,
+        cached_prefix=prefix,
+    ):
+        buffer.write(chunk)
+        if learnings_block is None and "`" in chunk:
+            text = buffer.getvalue()
+            if section is not None:
+                text = _open_section(text, section)
+            if text:
+                learnings_block = _find_json_block(text)
+            if learnings_block is not None:
+                updated_learnings = _parse_learnings(learnings_block)
+    return buffer.getvalue(), updated_learnings
+
+
+def _analysis_result(
+    response: str,
+    updated_learnings: Optional[CumulativeLearnings],
+    cumulative: CumulativeLearnings,
+) -> AnalysisResult:
+    """Stamp the updated learnings and wrap the response in an AnalysisResult."""
     if updated_learnings:
         updated_learnings.last_updated = datetime.now().isoformat()
         updated_learnings.weeks_analyzed = cumulative.weeks_analyzed + 1
@@ -214,17 +348,109 @@ def run_analysis(
     )
 
 
-def _extract_learnings_json(response: str) -> Optional[CumulativeLearnings]:
-    """Extract the updated cumulative learnings JSON from Claude's response."""
-    import re
+def _tagged_section(response: str, tag: str) -> Optional[str]:
+    """Return the text between <tag> and </tag>, or None if either is missing."""
+    open_tag, close_tag = f"<{tag}>", f"</{tag}>"
+    start = response.find(open_tag)
+    if start == -1:
+        return None
+    start += len(open_tag)
+    end = response.find(close_tag, start)
+    if end == -1:
+        return None
+    return response[start:end].strip()
 
-    # Find JSON block in the response
-    json_match = re.search(r"```json\s*\n(.*?)\n```", response, re.DOTALL)
-    if json_match:
+
+def _open_section(response: str, tag: str) -> str:
+    """Return the text after <tag>, up to </tag> if it has arrived yet.
+
+    Returns an empty string while the opening tag has not arrived.
+    """
+    open_tag = f"<{tag}>"
+    start = response.find(open_tag)
+    if start == -1:
+        return ""
+    start += len(open_tag)
+    end = response.find(f"</{tag}>", start)
+    return response[start:] if end == -1 else response[start:end]
+
+
+def _find_json_block(text: str) -> Optional[str]:
+    """Return the contents of the first complete ```json fenced block, if any."""
+    opening = _JSON_FENCE_RE.search(text)
+    if opening is None:
+        return None
+    end = text.find("\n```", opening.end())
+    if end == -1:
+        return None
+    return text[opening.end():end]
+
+
+def _parse_learnings(block: str) -> Optional[CumulativeLearnings]:
+    """Parse a learnings JSON block into a CumulativeLearnings model."""
+    try:
+        data = orjson.loads(block)
+    except orjson.JSONDecodeError:
         try:
-            data = json.loads(json_match.group(1))
-            return CumulativeLearnings(**data)
-        except (json.JSONDecodeError, Exception) as e:
+            data = orjson.loads(_repair_json(block))
+            logger.info("Parsed learnings JSON after repairing it")
+        except orjson.JSONDecodeError as e:
             logger.warning(f"Failed to parse learnings JSON: {e}")
+            return None
+
+    # Guard against saving some other JSON block (e.g. the constraints) as
+    # an empty learnings object over the accumulated history
+    if not isinstance(data, dict) or not _LEARNINGS_KEYS.intersection(data):
+        logger.warning("JSON block has no learnings fields; not using it as learnings")
+        return None
+
+    try:
+        return CumulativeLearnings(**data)
+    except Exception as e:
+        logger.warning(f"Failed to parse learnings JSON: {e}")
+        return None
+
+
+# Raw control characters Claude sometimes leaves inside JSON strings
+_STRING_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+
+
+def _repair_json(text: str) -> str:
+    """Fix the near-valid JSON Claude occasionally returns.
 
-    return None
+    Escapes raw newlines and tabs inside strings and drops trailing commas
+    before a closing bracket or brace.
+    """
+    out = []
+    in_string = False
+    escaped = False
+    n = len(text)
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            out.append(_STRING_ESCAPES.get(ch, ch))
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch == ",":
+            j = i + 1
+            while j < n and text[j].isspace():
+                j += 1
+            if j < n and text[j] in "}]":
+                continue
+        out.append(ch)
+    return "".join(out)
+
+
+def _extract_learnings_json(response: str) -> Optional[CumulativeLearnings]:
+    """Extract the updated cumulative learnings JSON from Claude's response."""
+    block = _find_json_block(response)
+    if block is None:
+        return None
+    return _parse_learnings(block)
@@ -0,0 +1,47 @@
+"""Token estimates and budget-based truncation for Claude prompts.
+
+Kept free of the Anthropic SDK so callers that only size prompts do not
+pay for importing it.
+"""
+
+import math
+
+# Approximate characters per token for Claude on English/technical prose
+CHARS_PER_TOKEN = 3.5
+# Lower bound for number- and table-heavy lab text, for sizing data that
+# must not overflow the context window
+CONSERVATIVE_CHARS_PER_TOKEN = 2.5
+
+
+def estimate_tokens(text: str, chars_per_token: float = CHARS_PER_TOKEN) -> int:
+    """Estimate the token count of text without a tokenizer round trip."""
+    return math.ceil(len(text) / chars_per_token)
+
+
+def truncate_middle(
+    text: str,
+    token_budget: int,
+    head_tokens: int,
+    marker: str = "\n\n[... middle truncated ...]\n\n",
+) -> str:
+    """Fit text into a token budget by keeping its head and tail.
+
+    The head keeps roughly ``head_tokens`` and the tail fills the rest of
+    the budget. Cuts are moved to line boundaries where possible.
+    """
+    if estimate_tokens(text) <= token_budget:
+        return text
+
+    head_chars = int(head_tokens * CHARS_PER_TOKEN)
+    tail_chars = int((token_budget - head_tokens) * CHARS_PER_TOKEN) - len(marker)
+
+    head_end = text.rfind("\n", 0, head_chars)
+    if head_end <= 0:
+        head_end = head_chars
+    tail_start = text.find("\n", len(text) - tail_chars)
+    if tail_start == -1:
+        tail_start = len(text) - tail_chars
+    else:
+        tail_start += 1
+
+    return text[:head_end] + marker + text[tail_start:]
@@ -6,20 +6,34 @@ a comprehensive knowledge base of the Stampede project history.
 Run with: python -m src.bootstrap.knowledge_builder
 """
 
-import json
+import asyncio
+import io
 import logging
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Optional, TypeVar
 
-from src.analysis.claude_client import ClaudeClient
+import orjson
+
+from src.analysis.llm_cache import LLMCache
+from src.analysis.prompts import SYSTEM_PROMPT_SCIENTIST
+from src.analysis.tokens import CONSERVATIVE_CHARS_PER_TOKEN, estimate_tokens
+from src.bootstrap.parsed_cache import ParsedCache
 from src.config import (
+    CLAUDE_MAX_CONCURRENCY,
     DRIVE_FOLDER_ID,
+    EXCLUDED_FILENAME_SUBSTRINGS,
     EXPERIMENT_BATCH_SIZE,
     HALF_YEAR_PERIODS,
     KNOWLEDGE_DIR,
+    MAX_DRIVE_CONCURRENCY,
+    MAX_INPUT_TOKENS,
 )
+from src.drive.cache import DriveCache
 from src.drive.client import DriveClient, MIME_SPREADSHEET, MIME_DOCUMENT
 from src.drive.docs import DocsReader
 from src.drive.sheets import SheetsReader
@@ -27,20 +41,34 @@ from src.models.data import HalfYearSummary, ProjectArc
 from src.parsers.experiment_sheet import parse_experiment_grid, experiment_to_summary_text
 from src.parsers.journal import parse_journal_text
 
+if TYPE_CHECKING:
+    # The Anthropic SDK is slow to import; it is loaded when a client is built
+    from src.analysis.claude_client import ClaudeClient
+
 logger = logging.getLogger(__name__)
 
-HALF_YEAR_SUMMARY_PROMPT = """You are building a comprehensive history of a TB diagnostics R&D project.
+T = TypeVar("T")
+R = TypeVar("R")
 
-## Previous Half-Year Summaries
-{previous_summaries}
+# Filename date patterns: "H1 2022" half-years and MM_DD_YYYY dates
+_HALF_YEAR_RE = re.compile(r"H([12])\s*(\d{4})")
+_MDY_RE = re.compile(r"(\d{2})_(\d{2})_(\d{4})")
 
-## This Half-Year: Experiment Batch Summaries
-{experiment_summaries}
 
-## This Half-Year: Journal & Meeting Insights
-{journal_insights}
+@lru_cache(maxsize=None)
+def _half_year_bounds(half: int, year: int) -> tuple[date, date]:
+    """First and last day of a half-year."""
+    if half == 1:
+        return date(year, 1, 1), date(year, 6, 30)
+    return date(year, 7, 1), date(year, 12, 31)
 
-Generate a comprehensive summary for this half-year ({period}, {start_date} to {end_date}) covering:
+
+# Each prompt is a static instruction block, sent as a prompt-cache prefix,
+# followed by a data template for the per-call payload.
+HALF_YEAR_SUMMARY_PROMPT = """You are building a comprehensive history of a TB diagnostics R&D project.
+
+Generate a comprehensive summary for the half-year period given below, using the \
+previous half-year summaries for context, covering:
 
 1. MILESTONES & ACHIEVEMENTS
    - What was accomplished this period
@@ -71,13 +99,26 @@ Generate a comprehensive summary for this half-year ({period}, {start_date} to {
 
 If there is no data for this period, note that and summarize what is known."""
 
+# Sent as a second cached block: unchanged when a period is re-run
+HALF_YEAR_PREVIOUS_PROMPT = """## Previous Half-Year Summaries
+{previous_summaries}"""
+
+HALF_YEAR_DATA_PROMPT = """## Period
+{period} ({start_date} to {end_date})
+
+## This Half-Year: Experiment Batch Summaries
+{experiment_summaries}
+
+## This Half-Year: Journal & Meeting Insights
+{journal_insights}"""
+
 EXPERIMENT_BATCH_PROMPT = """For each experiment in this batch, extract:
 - What was being tested and why
 - Key results (best Ct values, LOD achieved, pass/fail)
 - What was learned (conclusions from the Resume field)
-- Experiment family it belongs to (e.g., "LOD testing", "Preheat sequence optimization")
+- Experiment family it belongs to (e.g., "LOD testing", "Preheat sequence optimization")"""
 
-## Experiment Data
+EXPERIMENT_BATCH_DATA_PROMPT = """## Experiment Data
 {experiment_data}"""
 
 JOURNAL_INSIGHTS_PROMPT = """Read the following journal/meeting entries from a TB diagnostics R&D project.
@@ -87,9 +128,9 @@ Identify and summarize:
 2. Hardware/firmware milestones
 3. Team changes or organizational shifts
 4. Problems encountered and how they were resolved
-5. Key findings or breakthroughs mentioned
+5. Key findings or breakthroughs mentioned"""
 
-## Journal Entries
+JOURNAL_INSIGHTS_DATA_PROMPT = """## Journal Entries
 {journal_text}"""
 
 PROJECT_ARC_PROMPT = """You have summaries from 4 years of a TB diagnostics R&D project.
@@ -104,27 +145,132 @@ Synthesize these into a comprehensive project narrative:
 7. FAILED APPROACHES: What dead ends were explored and abandoned?
 8. CURRENT STATE OF THE ART: Where does the project stand today?
 9. OPEN QUESTIONS: What fundamental questions remain unanswered?
-10. INSTITUTIONAL KNOWLEDGE: Key facts any new team member should know
+10. INSTITUTIONAL KNOWLEDGE: Key facts any new team member should know"""
 
-## Half-Year Summaries
+PROJECT_ARC_DATA_PROMPT = """## Half-Year Summaries
 {all_summaries}"""
 
 
+def _is_excluded(name: str) -> bool:
+    """Whether a spreadsheet name marks it as a non-experiment sheet."""
+    lowered = name.lower()
+    return any(term in lowered for term in EXCLUDED_FILENAME_SUBSTRINGS)
+
+
+# Output tokens reserved for the journal insights response
+JOURNAL_MAX_TOKENS = 4096
+
+
+def _input_budget(static_prompt: str, max_tokens: int) -> int:
+    """Tokens left for a request's data once its fixed parts and output are reserved."""
+    static_tokens = estimate_tokens(
+        SYSTEM_PROMPT_SCIENTIST + static_prompt, CONSERVATIVE_CHARS_PER_TOKEN
+    )
+    return MAX_INPUT_TOKENS - max_tokens - static_tokens
+
+
+def _join_capped(parts: list[str], token_budget: int) -> str:
+    """Join parts with separators, stopping once ``token_budget`` is reached.
+
+    The budget is converted to characters at the conservative ratio, since
+    a request over the context window fails outright. Builds the result in a
+    StringIO so the full joined text is never held alongside the source list.
+    """
+    separator = "\n\n---\n\n"
+    limit = int(token_budget * CONSERVATIVE_CHARS_PER_TOKEN)
+    buf = io.StringIO()
+    for i, part in enumerate(parts):
+        if i:
+            buf.write(separator)
+        buf.write(part)
+        if buf.tell() > limit:
+            total = buf.tell() + sum(len(separator) + len(p) for p in parts[i + 1:])
+            logger.warning(
+                f"Document text ({total:,} chars) exceeds the {token_budget:,}-token "
+                f"input budget; truncating to {limit:,} chars"
+            )
+            return buf.getvalue()[:limit] + "\n\n[... truncated ...]"
+    return buf.getvalue()
+
+
+async def _map_in_threads(
+    fn: Callable[[T], R],
+    items: list[T],
+    pool: Optional[ThreadPoolExecutor] = None,
+) -> list[R]:
+    """Run a blocking function over items in a thread pool, preserving order.
+
+    Pass ``pool`` to share one concurrency limit between several maps running
+    at the same time; otherwise a pool of MAX_DRIVE_CONCURRENCY is used.
+    """
+    loop = asyncio.get_running_loop()
+    if pool is not None:
+        return await asyncio.gather(*(loop.run_in_executor(pool, fn, item) for item in items))
+    with ThreadPoolExecutor(max_workers=MAX_DRIVE_CONCURRENCY) as own_pool:
+        return await asyncio.gather(*(loop.run_in_executor(own_pool, fn, item) for item in items))
+
+
+async def _summarize_experiment_batches(
+    claude: "ClaudeClient",
+    experiments_text: list[str],
+) -> list[str]:
+    """Summarize experiments in batches, running batches concurrently.
+
+    At most CLAUDE_MAX_CONCURRENCY calls are in flight; the client's rate
+    limiter spaces them out further if needed. Failed batches are logged
+    and dropped, and the rest keep their original order.
+    """
+    batches = [
+        experiments_text[i:i + EXPERIMENT_BATCH_SIZE]
+        for i in range(0, len(experiments_text), EXPERIMENT_BATCH_SIZE)
+    ]
+    semaphore = asyncio.Semaphore(CLAUDE_MAX_CONCURRENCY)
+
+    async def summarize(batch_num: int, batch: list[str]) -> Optional[str]:
+        async with semaphore:
+            logger.info(f"  Processing batch {batch_num}/{len(batches)} ({len(batch)} experiments)")
+            batch_data = "\n\n---\n\n".join(batch)
+            prompt = EXPERIMENT_BATCH_DATA_PROMPT.format(experiment_data=batch_data)
+            try:
+                return await claude.send_message(
+                    prompt, max_tokens=4096, cached_prefix=EXPERIMENT_BATCH_PROMPT
+                )
+            except Exception as e:
+                logger.error(f"  Batch {batch_num} failed: {e}")
+                return None
+
+    results = await asyncio.gather(
+        *(summarize(i + 1, batch) for i, batch in enumerate(batches))
+    )
+    return [summary for summary in results if summary is not None]
+
+
 class KnowledgeBuilder:
     """Builds institutional knowledge from historical Drive data."""
 
     def __init__(
         self,
         drive_client: Optional[DriveClient] = None,
-        claude_client: Optional[ClaudeClient] = None,
+        claude_client: Optional["ClaudeClient"] = None,
+        parsed_cache: Optional[ParsedCache] = None,
     ):
-        self._drive = drive_client or DriveClient()
-        self._claude = claude_client or ClaudeClient()
-        self._sheets_reader = SheetsReader(self._drive.sheets)
-        self._docs_reader = DocsReader(self._drive.docs)
-        KNOWLEDGE_DIR.mkdir(parents=True, exist_ok=True)
+        self._drive_client = drive_client
+        self._claude_client = claude_client
+        self._parsed_cache = parsed_cache or ParsedCache()
+
+    @cached_property
+    def _drive(self) -> DriveClient:
+        """The Drive client, built on first use unless one was passed in."""
+        return self._drive_client or DriveClient()
 
-    def run(self, folder_id: Optional[str] = None) -> None:
+    @cached_property
+    def _claude(self) -> "ClaudeClient":
+        """The Claude client, built on first use unless one was passed in."""
+        from src.analysis.claude_client import ClaudeClient
+
+        return self._claude_client or ClaudeClient()
+
+    async def run(self, folder_id: Optional[str] = None) -> None:
         """Run the full bootstrap process.
 
         Args:
@@ -133,81 +279,124 @@ class KnowledgeBuilder:
         folder_id = folder_id or DRIVE_FOLDER_ID
         if not folder_id:
             raise ValueError("No Drive folder ID configured")
+        KNOWLEDGE_DIR.mkdir(parents=True, exist_ok=True)
 
-        previous_summaries: list[str] = []
-
-        for period, start_str, end_str in HALF_YEAR_PERIODS:
-            summary_path = KNOWLEDGE_DIR / f"{period}.json"
-
-            # Check if already processed (resumability)
-            if summary_path.exists():
-                logger.info(f"Skipping {period} (already processed)")
-                existing = json.loads(summary_path.read_text())
-                previous_summaries.append(
-                    f"### {period}\n{existing.get('raw_summary', '')}"
+        try:
+            previous_summaries: list[str] = []
+            # Listed once, on the first period that needs processing, and
+            # filtered per period from then on
+            all_spreadsheets: Optional[list[dict]] = None
+            all_documents: Optional[list[dict]] = None
+
+            for period, start_str, end_str in HALF_YEAR_PERIODS:
+                summary_path = KNOWLEDGE_DIR / f"{period}.json"
+                text_path = KNOWLEDGE_DIR / f"{period}.md"
+
+                # Check if already processed (resumability). The .md sibling holds
+                # the summary text; older runs only wrote the .json.
+                if text_path.exists():
+                    logger.info(f"Skipping {period} (already processed)")
+                    previous_summaries.append(
+                        f"### {period}\n{text_path.read_text(encoding='utf-8')}"
+                    )
+                    continue
+                if summary_path.exists():
+                    logger.info(f"Skipping {period} (already processed)")
+                    existing = orjson.loads(summary_path.read_bytes())
+                    previous_summaries.append(
+                        f"### {period}\n{existing.get('raw_summary', '')}"
+                    )
+                    continue
+
+                if all_spreadsheets is None:
+                    all_spreadsheets = self._drive.list_files_in_folder(
+                        folder_id, MIME_SPREADSHEET, exclude_names=EXCLUDED_FILENAME_SUBSTRINGS
+                    )
+                    all_documents = self._drive.list_documents(folder_id)
+
+                logger.info(f"Processing {period} ({start_str} to {end_str})")
+                summary = await self._process_half_year(
+                    folder_id, period, start_str, end_str, previous_summaries,
+                    all_spreadsheets, all_documents,
                 )
-                continue
-
-            logger.info(f"Processing {period} ({start_str} to {end_str})")
-            summary = self._process_half_year(
-                folder_id, period, start_str, end_str, previous_summaries
-            )
-
-            # Save summary
-            summary_path.write_text(
-                json.dumps(summary.model_dump(), indent=2, default=str),
-                encoding="utf-8",
-            )
-            previous_summaries.append(f"### {period}\n{summary.raw_summary}")
-            logger.info(f"Saved {period} summary")
 
-        # Synthesize project arc
-        self._synthesize_project_arc(previous_summaries)
-        logger.info("Bootstrap complete!")
-
-    def _process_half_year(
+                # Save summary
+                summary_path.write_bytes(
+                    orjson.dumps(summary.model_dump(), option=orjson.OPT_INDENT_2)
+                )
+                text_path.write_text(summary.raw_summary, encoding="utf-8")
+                previous_summaries.append(f"### {period}\n{summary.raw_summary}")
+                logger.info(f"Saved {period} summary")
+
+            # Synthesize project arc
+            await self._synthesize_project_arc(previous_summaries)
+            logger.info("Bootstrap complete!")
+        finally:
+            # Only close a client this builder created
+            if self._claude_client is None and "_claude" in self.__dict__:
+                await self._claude.close()
+
+    async def _process_half_year(
         self,
         folder_id: str,
         period: str,
         start_str: str,
         end_str: str,
         previous_summaries: list[str],
+        all_spreadsheets: Optional[list[dict]] = None,
+        all_documents: Optional[list[dict]] = None,
     ) -> HalfYearSummary:
-        """Process a single half-year period."""
+        """Process a single half-year period.
+
+        Pass the full folder listings when processing several periods, so
+        the folder is listed once; otherwise only this period's candidates
+        are queried from Drive.
+        """
         start_date = date.fromisoformat(start_str)
         end_date = date.fromisoformat(end_str)
 
-        # Discover all files in the folder
-        all_spreadsheets = self._drive.list_spreadsheets(folder_id)
-        all_documents = self._drive.list_documents(folder_id)
-
-        # Filter files by date (using filename date patterns or modified time)
-        period_sheets = self._filter_by_period(all_spreadsheets, start_date, end_date)
-        period_docs = self._filter_by_period(all_documents, start_date, end_date)
+        # Candidate files, then confirm each by modified time or filename
+        # date pattern
+        if all_spreadsheets is not None and all_documents is not None:
+            candidate_sheets, candidate_docs = all_spreadsheets, all_documents
+        else:
+            candidate_sheets = self._drive.list_files_by_period(
+                folder_id, MIME_SPREADSHEET, start_date, end_date,
+                exclude_names=EXCLUDED_FILENAME_SUBSTRINGS,
+            )
+            candidate_docs = self._drive.list_files_by_period(
+                folder_id, MIME_DOCUMENT, start_date, end_date
+            )
+        period_sheets = self._filter_by_period(candidate_sheets, start_date, end_date)
+        period_docs = self._filter_by_period(candidate_docs, start_date, end_date)
 
         logger.info(
             f"  Found {len(period_sheets)} sheets, {len(period_docs)} docs for {period}"
         )
 
         # Parse and batch-analyze experiment sheets
-        experiment_summaries = self._process_experiment_sheets(period_sheets)
+        experiment_summaries = await self._process_experiment_sheets(period_sheets)
 
         # Parse and analyze journals/docs
-        journal_insights = self._process_documents(period_docs)
+        journal_insights = await self._process_documents(period_docs)
 
         # Generate half-year summary
         prev_text = "\n\n".join(previous_summaries) if previous_summaries else "None (this is the first period)"
 
-        prompt = HALF_YEAR_SUMMARY_PROMPT.format(
-            previous_summaries=prev_text,
+        prompt = HALF_YEAR_DATA_PROMPT.format(
             experiment_summaries=experiment_summaries or "No experiment data found for this period.",
             journal_insights=journal_insights or "No journal data found for this period.",
             period=period,
             start_date=start_str,
             end_date=end_str,
         )
+        previous_block = HALF_YEAR_PREVIOUS_PROMPT.format(previous_summaries=prev_text)
 
-        raw_summary = self._claude.send_message(prompt, max_tokens=4096)
+        raw_summary = await self._claude.send_message(
+            prompt,
+            max_tokens=4096,
+            cached_prefix=[HALF_YEAR_SUMMARY_PROMPT, previous_block],
+        )
 
         return HalfYearSummary(
             period=period,
@@ -248,26 +437,17 @@ class KnowledgeBuilder:
         self, name: str, start_date: date, end_date: date
     ) -> bool:
         """Check if a filename contains date info matching the period."""
-        import re
-
         # Check for "H1 YYYY" or "H2 YYYY" pattern
-        m = re.search(r"H([12])\s*(\d{4})", name)
+        m = _HALF_YEAR_RE.search(name)
         if m:
-            half = int(m.group(1))
-            year = int(m.group(2))
-            if half == 1:
-                file_start = date(year, 1, 1)
-                file_end = date(year, 6, 30)
-            else:
-                file_start = date(year, 7, 1)
-                file_end = date(year, 12, 31)
+            file_start, file_end = _half_year_bounds(int(m.group(1)), int(m.group(2)))
             return (
                 start_date <= file_start <= end_date
                 or start_date <= file_end <= end_date
             )
 
         # Check for MM_DD_YYYY pattern
-        m = re.search(r"(\d{2})_(\d{2})_(\d{4})", name)
+        m = _MDY_RE.search(name)
         if m:
             try:
                 file_date = date(int(m.group(3)), int(m.group(1)), int(m.group(2)))
@@ -277,74 +457,81 @@ class KnowledgeBuilder:
 
         return False
 
-    def _process_experiment_sheets(self, sheets: list[dict]) -> str:
+    def _parse_sheet(self, sheet_file: dict) -> Optional[str]:
+        """Fetch and summarize one experiment sheet (runs in a worker thread)."""
+        try:
+            return self._parsed_cache.get_or_parse(
+                "sheets", sheet_file, lambda: self._summarize_sheet(sheet_file)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to parse sheet {sheet_file.get('name')}: {e}")
+            return None
+
+    def _summarize_sheet(self, sheet_file: dict) -> str:
+        """Read and parse one experiment sheet into summary text."""
+        grid = SheetsReader(self._drive.thread_sheets()).read_sheet(sheet_file["id"])
+        exp = parse_experiment_grid(grid, sheet_file.get("name", ""))
+        return experiment_to_summary_text(exp)
+
+    def _read_doc(self, doc_file: dict) -> Optional[str]:
+        """Fetch one document's text with a name header (runs in a worker thread)."""
+        try:
+            text = self._parsed_cache.get_or_parse(
+                "docs",
+                doc_file,
+                lambda: DocsReader(self._drive.thread_docs()).read_document_text(doc_file["id"]),
+            )
+            return f"### {doc_file.get('name', 'Unknown Document')}\n{text}"
+        except Exception as e:
+            logger.warning(f"Failed to read doc {doc_file.get('name')}: {e}")
+            return None
+
+    async def _process_experiment_sheets(self, sheets: list[dict]) -> str:
         """Parse and batch-analyze experiment sheets."""
+        # Drive's name filter matches word prefixes only; recheck here
+        sheets = [s for s in sheets if not _is_excluded(s.get("name", ""))]
         if not sheets:
             return ""
 
-        # Parse all sheets
-        experiments_text = []
-        for sheet_file in sheets:
-            try:
-                grid = self._sheets_reader.read_sheet(sheet_file["id"])
-                exp = parse_experiment_grid(grid, sheet_file.get("name", ""))
-                text = experiment_to_summary_text(exp)
-                experiments_text.append(text)
-            except Exception as e:
-                logger.warning(f"Failed to parse sheet {sheet_file.get('name')}: {e}")
+        # Fetch and parse all sheets concurrently
+        results = await _map_in_threads(self._parse_sheet, sheets)
+        experiments_text = [text for text in results if text is not None]
 
         if not experiments_text:
             return ""
 
         # Batch experiments and send to Claude for analysis
-        batch_summaries = []
-        for i in range(0, len(experiments_text), EXPERIMENT_BATCH_SIZE):
-            batch = experiments_text[i : i + EXPERIMENT_BATCH_SIZE]
-            batch_data = "\n\n---\n\n".join(batch)
-
-            prompt = EXPERIMENT_BATCH_PROMPT.format(experiment_data=batch_data)
-
-            try:
-                summary = self._claude.send_message(prompt, max_tokens=4096)
-                batch_summaries.append(summary)
-            except Exception as e:
-                logger.error(f"Failed to analyze experiment batch: {e}")
-
+        batch_summaries = await _summarize_experiment_batches(self._claude, experiments_text)
         return "\n\n---\n\n".join(batch_summaries)
 
-    def _process_documents(self, docs: list[dict]) -> str:
+    async def _process_documents(self, docs: list[dict]) -> str:
         """Parse and analyze journal/meeting documents."""
         if not docs:
             return ""
 
-        all_text_parts = []
-        for doc_file in docs:
-            try:
-                text = self._docs_reader.read_document_text(doc_file["id"])
-                all_text_parts.append(
-                    f"### {doc_file.get('name', 'Unknown Document')}\n{text}"
-                )
-            except Exception as e:
-                logger.warning(f"Failed to read doc {doc_file.get('name')}: {e}")
+        results = await _map_in_threads(self._read_doc, docs)
+        all_text_parts = [text for text in results if text is not None]
 
         if not all_text_parts:
             return ""
 
-        combined_text = "\n\n---\n\n".join(all_text_parts)
-
-        # If text is very long, truncate to fit token limits
-        if len(combined_text) > 100000:
-            combined_text = combined_text[:100000] + "\n\n[... truncated ...]"
+        # Cap the combined text to fit the input token budget
+        combined_text = _join_capped(
+            all_text_parts, _input_budget(JOURNAL_INSIGHTS_PROMPT, JOURNAL_MAX_TOKENS)
+        )
+        all_text_parts.clear()
 
-        prompt = JOURNAL_INSIGHTS_PROMPT.format(journal_text=combined_text)
+        prompt = JOURNAL_INSIGHTS_DATA_PROMPT.format(journal_text=combined_text)
 
         try:
-            return self._claude.send_message(prompt, max_tokens=4096)
+            return await self._claude.send_message(
+                prompt, max_tokens=JOURNAL_MAX_TOKENS, cached_prefix=JOURNAL_INSIGHTS_PROMPT
+            )
         except Exception as e:
             logger.error(f"Failed to analyze documents: {e}")
             return ""
 
-    def _synthesize_project_arc(self, all_summaries: list[str]) -> None:
+    async def _synthesize_project_arc(self, all_summaries: list[str]) -> None:
         """Generate the overall project arc from all half-year summaries."""
         arc_path = KNOWLEDGE_DIR / "project_arc.json"
 
@@ -353,12 +540,26 @@ class KnowledgeBuilder:
             return
 
         combined = "\n\n".join(all_summaries)
-        prompt = PROJECT_ARC_PROMPT.format(all_summaries=combined)
+        prompt = PROJECT_ARC_DATA_PROMPT.format(all_summaries=combined)
 
+        # Stream the narrative into a .md sibling as it is generated, so the
+        # long synthesis can be followed (tail -f) before it completes
+        text_path = KNOWLEDGE_DIR / "project_arc.md"
+        partial_path = text_path.with_name(text_path.name + ".partial")
+        chunks: list[str] = []
         try:
-            narrative = self._claude.send_message(prompt, max_tokens=8192)
+            with partial_path.open("w", encoding="utf-8") as f:
+                async for text in self._claude.send_message_stream(
+                    prompt, max_tokens=8192, cached_prefix=PROJECT_ARC_PROMPT
+                ):
+                    f.write(text)
+                    f.flush()
+                    chunks.append(text)
+            partial_path.replace(text_path)
+            narrative = "".join(chunks)
         except Exception as e:
             logger.error(f"Failed to synthesize project arc: {e}")
+            partial_path.unlink(missing_ok=True)
             narrative = "Failed to generate project arc."
 
         arc = ProjectArc(
@@ -367,16 +568,15 @@ class KnowledgeBuilder:
             half_year_summaries=[p[0] for p in HALF_YEAR_PERIODS],
         )
 
-        arc_path.write_text(
-            json.dumps(arc.model_dump(), indent=2), encoding="utf-8"
-        )
-        logger.info("Saved project_arc.json")
+        arc_path.write_bytes(orjson.dumps(arc.model_dump(), option=orjson.OPT_INDENT_2))
+        logger.info("Saved project_arc.json and project_arc.md")
 
 
-def process_single_half(
+async def process_single_half(
     half: str,
     folder_id: str,
     output_dir: Optional[Path] = None,
+    use_cache: bool = True,
 ) -> Path:
     """Process a single half-year period and save draft for review.
 
@@ -384,6 +584,8 @@ def process_single_half(
         half: Period name (e.g., "H1_2022")
         folder_id: Google Drive folder ID containing the data
         output_dir: Output directory (defaults to KNOWLEDGE_DIR)
+        use_cache: If False, bypass the local Claude response, parsed-file and
+            Drive listing caches
 
     Returns:
         Path to the generated draft markdown file.
@@ -407,120 +609,144 @@ def process_single_half(
     logger.info(f"Folder ID: {folder_id}")
 
     # Initialize clients
-    drive = DriveClient()
-    claude = ClaudeClient()
-    sheets_reader = SheetsReader(drive.sheets)
-    docs_reader = DocsReader(drive.docs)
-
-    # Load any previous summaries for context
-    previous_summaries = []
-    for prev_period, _, _ in HALF_YEAR_PERIODS:
-        if prev_period == period:
-            break
-        prev_path = output_dir / f"{prev_period}.md"
-        if prev_path.exists():
-            prev_content = prev_path.read_text(encoding="utf-8")
-            previous_summaries.append(f"### {prev_period}\n{prev_content}")
-            logger.info(f"  Loaded previous summary: {prev_period}")
-
-    # Discover files in the folder (all files, not filtered by date)
-    logger.info("Discovering files in folder...")
-    all_spreadsheets = drive.list_files_in_folder(folder_id, mime_type=MIME_SPREADSHEET)
-    all_documents = drive.list_files_in_folder(folder_id, mime_type=MIME_DOCUMENT)
-    logger.info(f"  Found {len(all_spreadsheets)} spreadsheets")
-    logger.info(f"  Found {len(all_documents)} documents")
-
-    # Parse experiment sheets
-    logger.info("Parsing experiment sheets...")
-    experiments_text = []
-    for i, sheet_file in enumerate(all_spreadsheets):
-        name = sheet_file.get("name", "")
-        if "goal" in name.lower():
-            continue
-        try:
-            grid = sheets_reader.read_sheet(sheet_file["id"])
-            exp = parse_experiment_grid(grid, name)
-            text = experiment_to_summary_text(exp)
-            experiments_text.append(text)
-            logger.info(f"  [{i+1}/{len(all_spreadsheets)}] Parsed: {name}")
-        except Exception as e:
-            logger.warning(f"  [{i+1}/{len(all_spreadsheets)}] Failed: {name} - {e}")
+    from src.analysis.claude_client import ClaudeClient
+
+    drive = DriveClient(cache=None if use_cache else DriveCache(enabled=False))
+    parsed_cache = ParsedCache(enabled=use_cache)
+
+    async with ClaudeClient(cache=None if use_cache else LLMCache(enabled=False)) as claude:
+        # Load any previous summaries for context
+        previous_summaries = []
+        for prev_period, _, _ in HALF_YEAR_PERIODS:
+            if prev_period == period:
+                break
+            prev_path = output_dir / f"{prev_period}.md"
+            if prev_path.exists():
+                prev_content = prev_path.read_text(encoding="utf-8")
+                previous_summaries.append(f"### {prev_period}\n{prev_content}")
+                logger.info(f"  Loaded previous summary: {prev_period}")
+
+        # Discover files in the folder (all files, not filtered by date). The
+        # listing shares the main Drive service, so both run on one worker thread.
+        logger.info("Discovering files in folder...")
+
+        def list_folder() -> tuple[list[dict], list[dict]]:
+            return (
+                drive.list_files_in_folder(
+                    folder_id, mime_type=MIME_SPREADSHEET, exclude_names=EXCLUDED_FILENAME_SUBSTRINGS
+                ),
+                drive.list_files_in_folder(folder_id, mime_type=MIME_DOCUMENT),
+            )
 
-    logger.info(f"  Successfully parsed {len(experiments_text)} experiments")
+        all_spreadsheets, all_documents = await asyncio.to_thread(list_folder)
+        logger.info(f"  Found {len(all_spreadsheets)} spreadsheets")
+        logger.info(f"  Found {len(all_documents)} documents")
 
-    # Batch-analyze experiments with Claude
-    logger.info("Analyzing experiments with Claude...")
-    batch_summaries = []
-    batch_size = EXPERIMENT_BATCH_SIZE
-    for i in range(0, len(experiments_text), batch_size):
-        batch = experiments_text[i:i + batch_size]
-        batch_num = i // batch_size + 1
-        total_batches = (len(experiments_text) + batch_size - 1) // batch_size
-        logger.info(f"  Processing batch {batch_num}/{total_batches} ({len(batch)} experiments)")
+        def parse_sheet(indexed: tuple[int, dict]) -> Optional[str]:
+            i, sheet_file = indexed
+            name = sheet_file.get("name", "")
+            def summarize() -> str:
+                grid = SheetsReader(drive.thread_sheets()).read_sheet(sheet_file["id"])
+                return experiment_to_summary_text(parse_experiment_grid(grid, name))
 
-        batch_data = "\n\n---\n\n".join(batch)
-        prompt = EXPERIMENT_BATCH_PROMPT.format(experiment_data=batch_data)
+            try:
+                text = parsed_cache.get_or_parse("sheets", sheet_file, summarize)
+                logger.info(f"  [{i+1}/{len(all_spreadsheets)}] Parsed: {name}")
+                return text
+            except Exception as e:
+                logger.warning(f"  [{i+1}/{len(all_spreadsheets)}] Failed: {name} - {e}")
+                return None
 
-        try:
-            summary = claude.send_message(prompt, max_tokens=4096)
-            batch_summaries.append(summary)
-        except Exception as e:
-            logger.error(f"  Batch {batch_num} failed: {e}")
+        def read_doc(indexed: tuple[int, dict]) -> Optional[str]:
+            i, doc_file = indexed
+            name = doc_file.get("name", "")
+            try:
+                text = parsed_cache.get_or_parse(
+                    "docs",
+                    doc_file,
+                    lambda: DocsReader(drive.thread_docs()).read_document_text(doc_file["id"]),
+                )
+                logger.info(f"  [{i+1}/{len(all_documents)}] Read: {name}")
+                return f"### {name}\n{text}"
+            except Exception as e:
+                logger.warning(f"  [{i+1}/{len(all_documents)}] Failed: {name} - {e}")
+                return None
+
+        async def analyze_experiments() -> tuple[int, str]:
+            logger.info("Parsing experiment sheets...")
+            experiment_sheets = [
+                (i, sheet_file) for i, sheet_file in enumerate(all_spreadsheets)
+                if not _is_excluded(sheet_file.get("name", ""))
+            ]
+            results = await _map_in_threads(parse_sheet, experiment_sheets, drive_pool)
+            experiments_text = [text for text in results if text is not None]
+            logger.info(f"  Successfully parsed {len(experiments_text)} experiments")
+
+            logger.info("Analyzing experiments with Claude...")
+            batch_summaries = await _summarize_experiment_batches(claude, experiments_text)
+            analysis = "\n\n---\n\n".join(batch_summaries) if batch_summaries else "No experiment data found."
+            return len(experiments_text), analysis
+
+        async def analyze_documents() -> tuple[int, str]:
+            logger.info("Parsing and analyzing documents...")
+            results = await _map_in_threads(read_doc, list(enumerate(all_documents)), drive_pool)
+            doc_texts = [text for text in results if text is not None]
+            doc_count = len(doc_texts)
+            if not doc_texts:
+                return 0, "No documents found."
+
+            combined_docs = _join_capped(
+                doc_texts, _input_budget(JOURNAL_INSIGHTS_PROMPT, JOURNAL_MAX_TOKENS)
+            )
+            doc_texts.clear()
 
-    experiment_analysis = "\n\n---\n\n".join(batch_summaries) if batch_summaries else "No experiment data found."
+            prompt = JOURNAL_INSIGHTS_DATA_PROMPT.format(journal_text=combined_docs)
+            try:
+                analysis = await claude.send_message(
+                    prompt, max_tokens=JOURNAL_MAX_TOKENS, cached_prefix=JOURNAL_INSIGHTS_PROMPT
+                )
+            except Exception as e:
+                logger.error(f"Journal analysis failed: {e}")
+                analysis = "Failed to analyze documents."
+            return doc_count, analysis
+
+        # Sheets and documents are independent until the summary, so their
+        # Drive reads and Claude calls overlap; one pool caps the Drive reads
+        with ThreadPoolExecutor(max_workers=MAX_DRIVE_CONCURRENCY) as drive_pool:
+            (sheet_count, experiment_analysis), (doc_count, journal_analysis) = await asyncio.gather(
+                analyze_experiments(), analyze_documents()
+            )
 
-    # Parse and analyze documents
-    logger.info("Parsing and analyzing documents...")
-    doc_texts = []
-    for i, doc_file in enumerate(all_documents):
-        name = doc_file.get("name", "")
-        try:
-            text = docs_reader.read_document_text(doc_file["id"])
-            doc_texts.append(f"### {name}\n{text}")
-            logger.info(f"  [{i+1}/{len(all_documents)}] Read: {name}")
-        except Exception as e:
-            logger.warning(f"  [{i+1}/{len(all_documents)}] Failed: {name} - {e}")
+        # Generate half-year summary
+        logger.info("Generating half-year summary...")
+        prev_text = "\n\n".join(previous_summaries) if previous_summaries else "None (this is the first period)"
 
-    if doc_texts:
-        combined_docs = "\n\n---\n\n".join(doc_texts)
-        if len(combined_docs) > 100000:
-            combined_docs = combined_docs[:100000] + "\n\n[... truncated ...]"
+        prompt = HALF_YEAR_DATA_PROMPT.format(
+            experiment_summaries=experiment_analysis,
+            journal_insights=journal_analysis,
+            period=period,
+            start_date=start_str,
+            end_date=end_str,
+        )
+        previous_block = HALF_YEAR_PREVIOUS_PROMPT.format(previous_summaries=prev_text)
 
-        prompt = JOURNAL_INSIGHTS_PROMPT.format(journal_text=combined_docs)
         try:
-            journal_analysis = claude.send_message(prompt, max_tokens=4096)
+            summary = await claude.send_message(
+                prompt,
+                max_tokens=4096,
+                cached_prefix=[HALF_YEAR_SUMMARY_PROMPT, previous_block],
+            )
         except Exception as e:
-            logger.error(f"Journal analysis failed: {e}")
-            journal_analysis = "Failed to analyze documents."
-    else:
-        journal_analysis = "No documents found."
-
-    # Generate half-year summary
-    logger.info("Generating half-year summary...")
-    prev_text = "\n\n".join(previous_summaries) if previous_summaries else "None (this is the first period)"
-
-    prompt = HALF_YEAR_SUMMARY_PROMPT.format(
-        previous_summaries=prev_text,
-        experiment_summaries=experiment_analysis,
-        journal_insights=journal_analysis,
-        period=period,
-        start_date=start_str,
-        end_date=end_str,
-    )
-
-    try:
-        summary = claude.send_message(prompt, max_tokens=4096)
-    except Exception as e:
-        logger.error(f"Summary generation failed: {e}")
-        summary = f"Failed to generate summary: {e}"
+            logger.error(f"Summary generation failed: {e}")
+            summary = f"Failed to generate summary: {e}"
 
     # Save as draft markdown for review
     draft_path = output_dir / f"{period}_DRAFT.md"
     draft_content = f"""# {period} Summary (DRAFT)
 
 **Period**: {start_str} to {end_str}
-**Spreadsheets processed**: {len(experiments_text)}
-**Documents processed**: {len(doc_texts)}
+**Spreadsheets processed**: {sheet_count}
+**Documents processed**: {doc_count}
 **Generated**: {datetime.now().isoformat()}
 
 ---
@@ -566,6 +792,7 @@ def main():
     # Parse arguments
     half = None
     folder_id = None
+    use_cache = "--no-cache" not in sys.argv
 
     for arg in sys.argv[1:]:
         if arg.startswith("--half="):
@@ -575,7 +802,7 @@ def main():
 
     if half and folder_id:
         # Single half-year mode
-        draft_path = process_single_half(half, folder_id)
+        draft_path = asyncio.run(process_single_half(half, folder_id, use_cache=use_cache))
         print(f"\n{'='*60}")
         print(f"DRAFT SAVED: {draft_path}")
         print(f"{'='*60}")
@@ -587,15 +814,25 @@ def main():
         print("5. Run the next half-year period")
     elif half or folder_id:
         print("Error: Both --half and --folder are required for single-half mode")
-        print("Usage: python -m src.bootstrap.knowledge_builder --half=H1_2022 --folder=FOLDER_ID")
+        print("Usage: python -m src.bootstrap.knowledge_builder --half=H1_2022 --folder=FOLDER_ID [--no-cache]")
         print("\nAvailable periods:")
         for period, start, end in HALF_YEAR_PERIODS:
             print(f"  {period}: {start} to {end}")
         sys.exit(1)
     else:
         # Full bootstrap mode (legacy)
-        builder = KnowledgeBuilder()
-        builder.run()
+        from src.analysis.claude_client import ClaudeClient
+
+        async def bootstrap() -> None:
+            async with ClaudeClient(cache=None if use_cache else LLMCache(enabled=False)) as claude:
+                builder = KnowledgeBuilder(
+                    drive_client=None if use_cache else DriveClient(cache=DriveCache(enabled=False)),
+                    claude_client=claude,
+                    parsed_cache=ParsedCache(enabled=use_cache),
+                )
+                await builder.run()
+
+        asyncio.run(bootstrap())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,85 @@
+"""On-disk cache for parsed Drive file contents.
+
+Bootstrap re-runs re-read and re-parse the same sheets and documents for
+every period. Drive reports a ``modifiedTime`` for each file, so parser
+output can be stored under ``data/parsed_cache`` keyed by file ID and
+modification time; editing a file in Drive invalidates its entry, and so
+does bumping ``PARSED_CACHE_VERSION`` after a parser change.
+"""
+
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+from src.config import PARSED_CACHE_DIR, PARSED_CACHE_VERSION
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_CHARS_RE = re.compile(r"[^0-9A-Za-z_-]")
+
+
+class ParsedCache:
+    """Text store of parser output, one file per Drive file version.
+
+    Entries live at ``<cache_dir>/<kind>/<file_id>.<modifiedTime>.v<N>.txt``,
+    where N is ``PARSED_CACHE_VERSION``.
+    Safe to use from the bootstrap worker threads.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, enabled: bool = True):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache files. Defaults to config.
+            enabled: Set False to bypass the cache entirely.
+        """
+        self._dir = cache_dir or PARSED_CACHE_DIR
+        self._enabled = enabled
+
+    def _path(self, kind: str, file: dict) -> Optional[Path]:
+        modified = file.get("modifiedTime")
+        if not self._enabled or not modified:
+            return None
+        # "." never survives the sanitizing, so it cleanly separates the parts
+        file_id = _UNSAFE_CHARS_RE.sub("", file["id"])
+        version = _UNSAFE_CHARS_RE.sub("", modified)
+        return self._dir / kind / f"{file_id}.{version}.v{PARSED_CACHE_VERSION}.txt"
+
+    def get_or_parse(self, kind: str, file: dict, parse: Callable[[], str]) -> str:
+        """Return cached parser output for a Drive file, parsing on a miss.
+
+        Args:
+            kind: Cache namespace, e.g. "sheets" or "docs".
+            file: Drive file metadata with ``id`` and ``modifiedTime``.
+                Files without ``modifiedTime`` are never cached.
+            parse: Produces the text on a miss. Exceptions propagate and
+                nothing is stored.
+        """
+        path = self._path(kind, file)
+        if path is None:
+            return parse()
+
+        try:
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Parsed cache read failed for {path.name}: {e}")
+
+        text = parse()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+            # Drop entries for older versions of the same file, or written
+            # by an older parser
+            for stale in path.parent.glob(f"{path.name.split('.', 1)[0]}.*.txt"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"Parsed cache write failed for {path.name}: {e}")
+        return text
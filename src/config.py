@@ -1,9 +1,10 @@
 """Configuration settings for the Stampede Weekly Report Generator."""
 
-import json
 import os
 from pathlib import Path
+from typing import Optional
 
+import orjson
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,6 +15,9 @@ DATA_DIR = PROJECT_ROOT / "data"
 KNOWLEDGE_DIR = DATA_DIR / "institutional_knowledge"
 CUMULATIVE_LEARNINGS_PATH = DATA_DIR / "cumulative_learnings.json"
 CHARTS_DIR = DATA_DIR / "charts"
+LLM_CACHE_DIR = DATA_DIR / "llm_cache"
+PARSED_CACHE_DIR = DATA_DIR / "parsed_cache"
+DRIVE_CACHE_PATH = DATA_DIR / "drive_cache.sqlite3"
 
 # Google API settings
 GOOGLE_SCOPES = [
@@ -31,6 +35,25 @@ REPORTS_FOLDER_ID = os.getenv("REPORTS_FOLDER_ID", "")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 CLAUDE_MODEL = "claude-sonnet-4-5-20250929"
 
+# Client-side limits for parallel Claude calls (match the account's rate tier)
+CLAUDE_MAX_CONCURRENCY = 4
+CLAUDE_REQUESTS_PER_MINUTE = 50
+
+# Local Claude response cache (set STAMPEDE_DISABLE_LLM_CACHE=1 to bypass).
+# Caching is strict (temperature 0) by default; the pipeline opts in at its
+# standard 0.3 sampling temperature.
+LLM_CACHE_ENABLED = not os.getenv("STAMPEDE_DISABLE_LLM_CACHE")
+LLM_CACHE_MAX_TEMPERATURE = 0.3
+LLM_CACHE_TTL_SECONDS: Optional[float] = None  # None = entries never expire
+# Line-level similarity above which a re-run on the same prompt template
+# revises the previous response instead of regenerating it from scratch
+LLM_CACHE_SIMILARITY_THRESHOLD = 0.95
+
+# Project arc budget in the Stage 1 prompt: a fixed head (project origins,
+# stable across weeks for prompt caching) plus the most recent history
+ARC_TOKEN_BUDGET = 20_000
+ARC_HEAD_TOKENS = 2_000
+
 # Bootstrap half-year periods
 HALF_YEAR_PERIODS = [
     ("H1_2022", "2022-01-01", "2022-06-30"),
@@ -45,6 +68,34 @@ HALF_YEAR_PERIODS = [
 
 EXPERIMENT_BATCH_SIZE = 12
 
+# Spreadsheets whose (lowercased) name contains any of these are not
+# experiment sheets and are skipped by the bootstrap
+EXCLUDED_FILENAME_SUBSTRINGS = ("goal",)
+
+# Input token budget per Claude request (200K context window, minus headroom
+# for the estimate's error). Data sections are truncated to fit within it.
+MAX_INPUT_TOKENS = 180_000
+
+# Drive folder listing cache (set STAMPEDE_DISABLE_DRIVE_CACHE=1 to bypass).
+# Listings are reused for the TTL, so files added within it may be missed.
+DRIVE_CACHE_ENABLED = not os.getenv("STAMPEDE_DISABLE_DRIVE_CACHE")
+DRIVE_CACHE_TTL_SECONDS = 3600.0
+
+# Parsed file cache format version. Bump it whenever a parser or summary
+# function changes its output, so entries written by older code are re-parsed
+PARSED_CACHE_VERSION = 2
+
+# Retries for idempotent Google API reads on 429/5xx (googleapiclient backs
+# off exponentially with jitter between attempts)
+GOOGLE_API_NUM_RETRIES = 5
+
+# Parallel Sheets/Docs reads during bootstrap (bounded by Google's per-user QPS)
+MAX_DRIVE_CONCURRENCY = 8
+
+# Render report charts in worker processes once a week has at least this many
+# experiments; below it, process startup costs more than the rendering
+CHART_PROCESS_POOL_MIN_EXPERIMENTS = 20
+
 
 def get_google_credentials_info() -> dict:
     """Load Google service account credentials from env var.
@@ -57,8 +108,8 @@ def get_google_credentials_info() -> dict:
 
     # Check if it's a file path
     if os.path.isfile(key_data):
-        with open(key_data) as f:
-            return json.load(f)
+        with open(key_data, "rb") as f:
+            return orjson.loads(f.read())
 
     # Otherwise treat as raw JSON
-    return json.loads(key_data)
+    return orjson.loads(key_data)
@@ -0,0 +1,204 @@
+"""SQLite cache for Drive folder listings.
+
+Walking a large Shared Drive tree takes many paginated list calls, and the
+tree changes slowly. Listings are stored in ``data/drive_cache.sqlite3``
+and reused for a short TTL, so repeated runs (e.g. re-running a report or
+a bootstrap period) skip the walk.
+
+Recently modified files are kept in sync incrementally with the Drive
+Changes API: after one full query, later runs only fetch the changes since
+the stored page token.
+"""
+
+import logging
+import sqlite3
+import time
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+import orjson
+
+from src.config import DRIVE_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    key TEXT PRIMARY KEY,
+    folder_id TEXT NOT NULL,
+    files TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    corpus TEXT PRIMARY KEY,
+    page_token TEXT NOT NULL,
+    covered_since TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS recent_files (
+    corpus TEXT NOT NULL,
+    id TEXT NOT NULL,
+    mime_type TEXT,
+    modified_time TEXT NOT NULL,
+    file TEXT NOT NULL,
+    PRIMARY KEY (corpus, id)
+);
+"""
+
+
+class SyncState(NamedTuple):
+    """Changes API position for one corpus (a Shared Drive, or "" for My Drive)."""
+
+    page_token: str
+    covered_since: str  # recent_files holds every file modified after this
+
+
+class DriveCache:
+    """Folder listings keyed by folder ID and query, expiring after a TTL,
+    plus a Changes-API-synced index of recently modified files.
+
+    Opens a short-lived connection per operation, so it is safe to use from
+    worker threads. Listing reads and writes log database errors and carry
+    on; the recent-files methods raise sqlite3.Error so the caller can fall
+    back to querying Drive directly.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_seconds: float = 3600.0,
+        enabled: bool = True,
+    ):
+        """Initialize the cache.
+
+        Args:
+            path: SQLite database file. Defaults to config.
+            ttl_seconds: How long a listing is reused.
+            enabled: Set False to bypass the cache entirely.
+        """
+        self._path = path or DRIVE_CACHE_PATH
+        self._ttl = ttl_seconds
+        self._enabled = enabled
+        self._schema_ready = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection for one operation, committing on success and closing it after."""
+        if not self._schema_ready:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(self._path, timeout=30)) as conn:
+            if not self._schema_ready:
+                conn.executescript(_SCHEMA)
+                self._schema_ready = True
+            with conn:
+                yield conn
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def get(self, key: str) -> Optional[list[dict]]:
+        """Return a cached listing, or None on a miss or expiry."""
+        if not self._enabled:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT files, fetched_at FROM listings WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Drive cache read failed: {e}")
+            return None
+        if row is None or time.time() - row[1] > self._ttl:
+            return None
+        return orjson.loads(row[0])
+
+    def set(self, key: str, folder_id: str, files: list[dict]) -> None:
+        """Store the listing for a folder query."""
+        if not self._enabled:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO listings VALUES (?, ?, ?, ?)",
+                    (key, folder_id, orjson.dumps(files).decode(), time.time()),
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Drive cache write failed: {e}")
+
+    def invalidate(self, folder_id: str) -> None:
+        """Drop every cached listing rooted at a folder."""
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM listings WHERE folder_id = ?", (folder_id,))
+        except sqlite3.Error as e:
+            logger.warning(f"Drive cache invalidation failed: {e}")
+
+    def prune(self) -> int:
+        """Delete expired listings. Returns the number removed."""
+        try:
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    "DELETE FROM listings WHERE fetched_at < ?", (time.time() - self._ttl,)
+                )
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Drive cache prune failed: {e}")
+            return 0
+
+    def sync_state(self, corpus: str) -> Optional[SyncState]:
+        """Return the stored Changes API position for a corpus, if any."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT page_token, covered_since FROM sync_state WHERE corpus = ?", (corpus,)
+            ).fetchone()
+        return SyncState(*row) if row else None
+
+    def reset_recent_files(
+        self, corpus: str, files: list[dict], page_token: str, covered_since: str
+    ) -> None:
+        """Replace a corpus's recent files after a full query."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM recent_files WHERE corpus = ?", (corpus,))
+            self._upsert(conn, corpus, files)
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (corpus, page_token, covered_since),
+            )
+
+    def apply_changes(
+        self, corpus: str, changed: list[dict], removed_ids: list[str], page_token: str
+    ) -> None:
+        """Apply one Changes API sync to a corpus's recent files."""
+        with self._connect() as conn:
+            self._upsert(conn, corpus, changed)
+            conn.executemany(
+                "DELETE FROM recent_files WHERE corpus = ? AND id = ?",
+                [(corpus, file_id) for file_id in removed_ids],
+            )
+            conn.execute(
+                "UPDATE sync_state SET page_token = ? WHERE corpus = ?", (page_token, corpus)
+            )
+
+    def recent_files(
+        self, corpus: str, modified_after: str, mime_type: Optional[str] = None
+    ) -> list[dict]:
+        """Files in a corpus modified after an RFC 3339 timestamp, newest first."""
+        query = "SELECT file FROM recent_files WHERE corpus = ? AND modified_time > ?"
+        params: list = [corpus, modified_after]
+        if mime_type:
+            query += " AND mime_type = ?"
+            params.append(mime_type)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY modified_time DESC", params).fetchall()
+        return [orjson.loads(row[0]) for row in rows]
+
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, corpus: str, files: list[dict]) -> None:
+        conn.executemany(
+            "INSERT OR REPLACE INTO recent_files VALUES (?, ?, ?, ?, ?)",
+            [
+                (corpus, f["id"], f.get("mimeType"), f.get("modifiedTime", ""), orjson.dumps(f).decode())
+                for f in files
+            ],
+        )
@@ -1,15 +1,28 @@
 """Google Drive API client for file discovery and authentication."""
 
-import json
 import logging
 import os
-from datetime import datetime, timedelta, timezone
-from typing import Optional
-
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+import google_auth_httplib2
+import httplib2
+import orjson
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 
-from src.config import GOOGLE_SCOPES, get_google_credentials_info
+from src.config import (
+    DRIVE_CACHE_ENABLED,
+    DRIVE_CACHE_TTL_SECONDS,
+    GOOGLE_API_NUM_RETRIES,
+    GOOGLE_SCOPES,
+    MAX_DRIVE_CONCURRENCY,
+    get_google_credentials_info,
+)
+from src.drive.cache import DriveCache
 
 logger = logging.getLogger(__name__)
 
@@ -19,16 +32,29 @@ MIME_DOCUMENT = "application/vnd.google-apps.document"
 MIME_PRESENTATION = "application/vnd.google-apps.presentation"
 MIME_FOLDER = "application/vnd.google-apps.folder"
 
+FILE_FIELDS = "nextPageToken, files(id, name, mimeType, modifiedTime)"
+
+# Drive rejects overly long queries; rclone uses the same 50-parent limit
+MAX_PARENTS_PER_QUERY = 50
+
+# Drive accepts at most 100 calls in one batch request
+MAX_BATCH_REQUESTS = 100
+
 
 class DriveClient:
     """Google Drive API client for file discovery and authentication."""
 
-    def __init__(self, credentials_info: Optional[dict] = None):
+    def __init__(
+        self,
+        credentials_info: Optional[dict] = None,
+        cache: Optional[DriveCache] = None,
+    ):
         """Initialize the Drive client.
 
         Args:
             credentials_info: Service account credentials dict. If None,
                 loads from environment.
+            cache: Folder listing cache. Defaults to one built from config.
         """
         if credentials_info is None:
             credentials_info = get_google_credentials_info()
@@ -40,15 +66,53 @@ class DriveClient:
         self._sheets_service = build("sheets", "v4", credentials=self._credentials)
         self._docs_service = build("docs", "v1", credentials=self._credentials)
         self._slides_service = build("slides", "v1", credentials=self._credentials)
+        self._local = threading.local()
+        self._shared_drive_ids: dict[str, Optional[str]] = {}
+        self._cache = cache or DriveCache(
+            ttl_seconds=DRIVE_CACHE_TTL_SECONDS, enabled=DRIVE_CACHE_ENABLED
+        )
 
-    def _is_shared_drive(self, folder_id: str) -> bool:
-        """Check if a folder ID is a Shared Drive (Team Drive)."""
-        try:
-            # Try to get it as a shared drive
-            self._drive_service.drives().get(driveId=folder_id).execute()
-            return True
-        except Exception:
-            return False
+    def _shared_drive_id(self, folder_id: str) -> Optional[str]:
+        """Return folder_id if it is a Shared Drive (Team Drive) root, else None.
+
+        Looked up with one metadata read per folder ID and memoized: a Shared
+        Drive root reports its own ID as ``driveId``.
+        """
+        if folder_id not in self._shared_drive_ids:
+            metadata = (
+                self._drive_service.files()
+                .get(fileId=folder_id, fields="id, driveId", supportsAllDrives=True)
+                .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+            )
+            is_root = metadata.get("driveId") == folder_id
+            self._shared_drive_ids[folder_id] = folder_id if is_root else None
+        return self._shared_drive_ids[folder_id]
+
+    def _thread_service(self, name: str, version: str):
+        """Get a service for the calling thread, built on its own HTTP connection.
+
+        httplib2 connections are not thread-safe, so worker threads must not
+        share the default service objects.
+        """
+        services = getattr(self._local, "services", None)
+        if services is None:
+            services = self._local.services = {}
+        if name not in services:
+            http = google_auth_httplib2.AuthorizedHttp(self._credentials, http=httplib2.Http())
+            services[name] = build(name, version, http=http, cache_discovery=False)
+        return services[name]
+
+    def thread_drive(self):
+        """Drive service safe to use from the calling thread."""
+        return self._thread_service("drive", "v3")
+
+    def thread_sheets(self):
+        """Sheets service safe to use from the calling thread."""
+        return self._thread_service("sheets", "v4")
+
+    def thread_docs(self):
+        """Docs service safe to use from the calling thread."""
+        return self._thread_service("docs", "v1")
 
     @property
     def credentials(self):
@@ -75,6 +139,7 @@ class DriveClient:
         folder_id: str,
         mime_type: Optional[str] = None,
         recursive: bool = True,
+        exclude_names: Sequence[str] = (),
     ) -> list[dict]:
         """List all files in a Drive folder.
 
@@ -82,88 +147,227 @@ class DriveClient:
             folder_id: Google Drive folder ID (supports Shared Drives).
             mime_type: Optional MIME type filter.
             recursive: Whether to recurse into subfolders.
+            exclude_names: Name terms to filter out server-side (see
+                _exclude_names_query).
 
         Returns:
             List of file metadata dicts with id, name, mimeType, modifiedTime.
         """
-        all_files = []
-        is_shared_drive = self._is_shared_drive(folder_id)
-        self._list_files_recursive(folder_id, mime_type, recursive, all_files, is_shared_drive, folder_id if is_shared_drive else None)
-        return all_files
+        return self._list_tree(
+            folder_id, mime_type, recursive, _exclude_names_query(exclude_names)
+        )
 
-    def _list_files_recursive(
+    def list_files_by_type(
+        self,
+        folder_id: str,
+        mime_types: Sequence[str],
+        recursive: bool = True,
+    ) -> dict[str, list[dict]]:
+        """List files of several MIME types with a single walk of the folder tree.
+
+        Args:
+            folder_id: Google Drive folder ID (supports Shared Drives).
+            mime_types: MIME types to list.
+            recursive: Whether to recurse into subfolders.
+
+        Returns:
+            Dict of MIME type to its file metadata dicts, for every requested type.
+        """
+        type_query = " or ".join(f"mimeType = '{mime_type}'" for mime_type in mime_types)
+        by_type: dict[str, list[dict]] = {mime_type: [] for mime_type in mime_types}
+        for f in self._list_tree(folder_id, None, recursive, f"({type_query})"):
+            by_type[f["mimeType"]].append(f)
+        return by_type
+
+    def list_files_by_period(
+        self,
+        folder_id: str,
+        mime_type: Optional[str],
+        start_date: date,
+        end_date: date,
+        recursive: bool = True,
+        exclude_names: Sequence[str] = (),
+    ) -> list[dict]:
+        """List files modified within a date range, filtering server-side.
+
+        Also returns files whose name contains one of the period's years, so
+        callers can still match period-named files (e.g. "H1 2022") that were
+        modified outside the range. Drive matches name terms by prefix only,
+        so names that embed the year mid-token are not caught this way.
+
+        Args:
+            folder_id: Google Drive folder ID (supports Shared Drives).
+            mime_type: Optional MIME type filter.
+            start_date: First day of the period (inclusive).
+            end_date: Last day of the period (inclusive).
+            recursive: Whether to recurse into subfolders.
+            exclude_names: Name terms to filter out server-side (see
+                _exclude_names_query).
+
+        Returns:
+            List of file metadata dicts with id, name, mimeType, modifiedTime.
+        """
+        clauses = [
+            f"(modifiedTime >= '{start_date.isoformat()}T00:00:00' and "
+            f"modifiedTime <= '{end_date.isoformat()}T23:59:59')"
+        ]
+        for year in range(start_date.year, end_date.year + 1):
+            clauses.append(f"name contains '{year}'")
+        period_query = "(" + " or ".join(clauses) + ")"
+        exclude_query = _exclude_names_query(exclude_names)
+        if exclude_query:
+            period_query = f"{period_query} and {exclude_query}"
+
+        return self._list_tree(folder_id, mime_type, recursive, period_query)
+
+    def _list_tree(
         self,
         folder_id: str,
         mime_type: Optional[str],
         recursive: bool,
-        results: list[dict],
-        is_shared_drive: bool = False,
+        extra_query: Optional[str],
+    ) -> list[dict]:
+        """List a folder (tree), served from the listing cache when fresh."""
+        key = orjson.dumps([folder_id, mime_type, recursive, extra_query]).decode()
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        all_files = []
+        drive_id = self._shared_drive_id(folder_id)
+        self._list_files_recursive(
+            folder_id, mime_type, recursive, all_files, drive_id, extra_query=extra_query,
+        )
+        self._cache.set(key, folder_id, all_files)
+        return all_files
+
+    def list_files_multiparent(
+        self,
+        parent_ids: list[str],
+        mime_type: Optional[str] = None,
+        extra_query: Optional[str] = None,
         drive_id: Optional[str] = None,
-    ) -> None:
-        """Recursively list files in a folder."""
-        query_parts = [f"'{folder_id}' in parents", "trashed = false"]
-        if mime_type:
-            query_parts.append(f"mimeType = '{mime_type}'")
+        fields: str = FILE_FIELDS,
+        pool: Optional[ThreadPoolExecutor] = None,
+    ) -> list[dict]:
+        """List files whose parent is any of several folders.
 
-        query = " and ".join(query_parts)
-        page_token = None
+        Parents are combined into ``'a' in parents or 'b' in parents ...``
+        queries of up to MAX_PARENTS_PER_QUERY folders each, so a level of
+        subfolders costs one paginated request per chunk instead of one per
+        folder. Multiple chunks are listed concurrently.
 
+        Args:
+            parent_ids: Folder IDs to list the direct children of.
+            mime_type: Optional MIME type filter.
+            extra_query: Optional additional ``q`` clause, ANDed in.
+            drive_id: Shared Drive ID, if the folders live in one.
+            fields: Partial-response field selector for the list call.
+            pool: Executor for the chunk queries. Pass one to reuse its
+                threads (and their Drive services) across calls.
+
+        Returns:
+            List of file metadata dicts.
+        """
+        chunks = [
+            parent_ids[i:i + MAX_PARENTS_PER_QUERY]
+            for i in range(0, len(parent_ids), MAX_PARENTS_PER_QUERY)
+        ]
+
+        def query_for(chunk: list[str]) -> str:
+            parents = " or ".join(f"'{pid}' in parents" for pid in chunk)
+            query_parts = [f"({parents})", "trashed = false"]
+            if mime_type:
+                query_parts.append(f"mimeType = '{mime_type}'")
+            if extra_query:
+                query_parts.append(extra_query)
+            return " and ".join(query_parts)
+
+        if len(chunks) <= 1:
+            return [
+                f for chunk in chunks
+                for f in self._list_query(self._drive_service, query_for(chunk), fields, drive_id)
+            ]
+
+        def list_chunk(chunk: list[str]) -> list[dict]:
+            drive = self._thread_service("drive", "v3")
+            return self._list_query(drive, query_for(chunk), fields, drive_id)
+
+        if pool is not None:
+            return [f for files in pool.map(list_chunk, chunks) for f in files]
+        with ThreadPoolExecutor(max_workers=min(len(chunks), MAX_DRIVE_CONCURRENCY)) as own_pool:
+            return [f for files in own_pool.map(list_chunk, chunks) for f in files]
+
+    def _list_query(self, drive, query: str, fields: str, drive_id: Optional[str]) -> list[dict]:
+        """Run a files.list query through all its pages."""
+        files = []
+        page_token = None
         while True:
             list_params = {
                 "q": query,
-                "fields": "nextPageToken, files(id, name, mimeType, modifiedTime, createdTime)",
+                "fields": fields,
                 "pageToken": page_token,
                 "pageSize": 100,
                 "supportsAllDrives": True,
                 "includeItemsFromAllDrives": True,
             }
             # For Shared Drives, use corpora='drive' with driveId
-            if is_shared_drive and drive_id:
+            if drive_id:
                 list_params["corpora"] = "drive"
                 list_params["driveId"] = drive_id
             else:
                 list_params["spaces"] = "drive"
 
-            response = self._drive_service.files().list(**list_params).execute()
-
-            files = response.get("files", [])
-            results.extend(files)
+            request = drive.files().list(**list_params)
+            response = request.execute(num_retries=GOOGLE_API_NUM_RETRIES)
+            files.extend(response.get("files", []))
             page_token = response.get("nextPageToken")
             if not page_token:
-                break
-
-        # Recurse into subfolders
-        if recursive:
-            folder_query = (
-                f"'{folder_id}' in parents and "
-                f"mimeType = '{MIME_FOLDER}' and "
-                "trashed = false"
-            )
-            page_token = None
-            while True:
-                list_params = {
-                    "q": folder_query,
-                    "fields": "nextPageToken, files(id, name)",
-                    "pageToken": page_token,
-                    "pageSize": 100,
-                    "supportsAllDrives": True,
-                    "includeItemsFromAllDrives": True,
-                }
-                if is_shared_drive and drive_id:
-                    list_params["corpora"] = "drive"
-                    list_params["driveId"] = drive_id
-                else:
-                    list_params["spaces"] = "drive"
-
-                response = self._drive_service.files().list(**list_params).execute()
-                folders = response.get("files", [])
-                for folder in folders:
-                    self._list_files_recursive(
-                        folder["id"], mime_type, recursive, results, is_shared_drive, drive_id
-                    )
-                page_token = response.get("nextPageToken")
-                if not page_token:
-                    break
+                return files
+
+    def _list_files_recursive(
+        self,
+        folder_id: str,
+        mime_type: Optional[str],
+        recursive: bool,
+        results: list[dict],
+        drive_id: Optional[str] = None,
+        extra_query: Optional[str] = None,
+    ) -> None:
+        """List files in a folder tree, one folder level at a time.
+
+        Each level is a single multi-parent query that matches both the
+        requested files and the subfolders to descend into. Subfolders are
+        only included in the results when no filter is given.
+        """
+        filters = [f"mimeType = '{mime_type}'"] if mime_type else []
+        if extra_query:
+            filters.append(extra_query)
+        file_filter = " and ".join(filters)
+
+        if not recursive:
+            results.extend(self.list_files_multiparent([folder_id], mime_type, extra_query, drive_id))
+            return
+
+        query = f"(({file_filter}) or mimeType = '{MIME_FOLDER}')" if file_filter else None
+        level = [folder_id]
+        seen = set(level)
+        # One pool for the whole walk: its threads keep their Drive services
+        # from level to level instead of building new ones per level
+        with ThreadPoolExecutor(max_workers=MAX_DRIVE_CONCURRENCY) as pool:
+            while level:
+                next_level = []
+                children = self.list_files_multiparent(
+                    level, extra_query=query, drive_id=drive_id, pool=pool
+                )
+                for f in children:
+                    is_folder = f.get("mimeType") == MIME_FOLDER
+                    if is_folder and f["id"] not in seen:
+                        seen.add(f["id"])
+                        next_level.append(f["id"])
+                    if not is_folder or not file_filter or mime_type == MIME_FOLDER:
+                        results.append(f)
+                level = next_level
 
     def list_recent_files(
         self,
@@ -174,7 +378,10 @@ class DriveClient:
         """List files modified in the last N days.
 
         Uses direct API query with modifiedTime filter for efficiency.
-        Much faster than recursive traversal for large Shared Drives.
+        Much faster than recursive traversal for large Shared Drives. With
+        the cache enabled, the first call stores the results and a Changes
+        API token; later calls fetch only what changed since and answer
+        from the local index.
 
         Args:
             folder_id: Google Drive folder ID or Shared Drive ID.
@@ -186,42 +393,87 @@ class DriveClient:
         """
         cutoff = datetime.now(timezone.utc) - timedelta(days=days)
         cutoff_str = cutoff.strftime("%Y-%m-%dT%H:%M:%S")
+        drive_id = self._shared_drive_id(folder_id)
+
+        if not self._cache.enabled:
+            return self._query_recent_files(cutoff_str, mime_type, drive_id)
 
-        # Build query with modification time filter
+        # Keep a local index of recent files: one full query, then only the
+        # deltas from the Changes API on later runs
+        corpus = drive_id or ""
+        try:
+            state = self._cache.sync_state(corpus)
+            if state is None or cutoff_str < state.covered_since:
+                # Take the token first so changes made during the query are not missed
+                page_token = self._start_page_token(drive_id)
+                files = self._query_recent_files(cutoff_str, None, drive_id)
+                self._cache.reset_recent_files(corpus, files, page_token, cutoff_str)
+            else:
+                self._sync_changes(corpus, state.page_token, drive_id)
+            return self._cache.recent_files(corpus, cutoff_str, mime_type)
+        except sqlite3.Error as e:
+            logger.warning(f"Recent files index unavailable, querying Drive directly: {e}")
+            return self._query_recent_files(cutoff_str, mime_type, drive_id)
+
+    def _query_recent_files(
+        self, cutoff_str: str, mime_type: Optional[str], drive_id: Optional[str]
+    ) -> list[dict]:
+        """Query files modified after a cutoff with a modifiedTime filter."""
         query_parts = [f"modifiedTime > '{cutoff_str}'", "trashed = false"]
         if mime_type:
             query_parts.append(f"mimeType = '{mime_type}'")
-        query = " and ".join(query_parts)
-
-        is_shared_drive = self._is_shared_drive(folder_id)
-        results = []
-        page_token = None
+        return self._list_query(self._drive_service, " and ".join(query_parts), FILE_FIELDS, drive_id)
+
+    def _start_page_token(self, drive_id: Optional[str]) -> str:
+        """Get the Changes API token for the current state of a corpus."""
+        params = {"supportsAllDrives": True}
+        if drive_id:
+            params["driveId"] = drive_id
+        response = (
+            self._drive_service.changes()
+            .getStartPageToken(**params)
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+        )
+        return response["startPageToken"]
 
+    def _sync_changes(self, corpus: str, page_token: str, drive_id: Optional[str]) -> None:
+        """Fetch changes since page_token and apply them to the recent-files index."""
+        changed: list[dict] = []
+        removed: list[str] = []
         while True:
-            list_params = {
-                "q": query,
-                "fields": "nextPageToken, files(id, name, mimeType, modifiedTime, createdTime)",
+            params = {
                 "pageToken": page_token,
-                "pageSize": 100,
+                "fields": (
+                    "nextPageToken, newStartPageToken, "
+                    "changes(changeType, fileId, removed, "
+                    "file(id, name, mimeType, modifiedTime, trashed))"
+                ),
+                "pageSize": 1000,
                 "supportsAllDrives": True,
                 "includeItemsFromAllDrives": True,
             }
+            if drive_id:
+                params["driveId"] = drive_id
+            response = (
+                self._drive_service.changes()
+                .list(**params)
+                .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+            )
+            for change in response.get("changes", []):
+                # Shared Drive changes (renames, settings) carry no file
+                if change.get("changeType", "file") != "file":
+                    continue
+                file = change.get("file")
+                if change.get("removed") or not file or file.get("trashed"):
+                    removed.append(change.get("fileId"))
+                else:
+                    file.pop("trashed", None)
+                    changed.append(file)
 
-            if is_shared_drive:
-                list_params["corpora"] = "drive"
-                list_params["driveId"] = folder_id
-            else:
-                list_params["spaces"] = "drive"
-
-            response = self._drive_service.files().list(**list_params).execute()
-            files = response.get("files", [])
-            results.extend(files)
-
-            page_token = response.get("nextPageToken")
-            if not page_token:
-                break
-
-        return results
+            if "newStartPageToken" in response:
+                self._cache.apply_changes(corpus, changed, removed, response["newStartPageToken"])
+                return
+            page_token = response["nextPageToken"]
 
     def list_spreadsheets(self, folder_id: str) -> list[dict]:
         """List all Google Sheets in a folder."""
@@ -236,9 +488,43 @@ class DriveClient:
         return (
             self._drive_service.files()
             .get(fileId=file_id, fields="id, name, mimeType, modifiedTime, createdTime")
-            .execute()
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
         )
 
+    def share_with_anyone(self, file_ids: Sequence[str]) -> list[str]:
+        """Make files readable by anyone with the link, up to 100 per batch HTTP request.
+
+        Args:
+            file_ids: Google Drive file IDs.
+
+        Returns:
+            IDs of the files that were shared, in input order. Failures are
+            logged and left out.
+        """
+        shared: set[str] = set()
+
+        def collect(request_id, response, exception):
+            if exception is not None:
+                logger.warning(f"Could not share {request_id}: {exception}")
+            else:
+                shared.add(request_id)
+
+        unique_ids = list(dict.fromkeys(file_ids))
+        for start in range(0, len(unique_ids), MAX_BATCH_REQUESTS):
+            batch = self._drive_service.new_batch_http_request(callback=collect)
+            for file_id in unique_ids[start:start + MAX_BATCH_REQUESTS]:
+                batch.add(
+                    self._drive_service.permissions().create(
+                        fileId=file_id,
+                        body={"type": "anyone", "role": "reader"},
+                        fields="id",
+                        supportsAllDrives=True,
+                    ),
+                    request_id=file_id,
+                )
+            batch.execute()
+        return [file_id for file_id in unique_ids if file_id in shared]
+
     def upload_file(
         self,
         file_path: str,
@@ -291,7 +577,8 @@ class DriveClient:
             folder_id: Destination folder ID.
 
         Returns:
-            Tuple of (presentation_id, presentation_object).
+            Tuple of (presentation_id, presentation_object). The object only
+            carries the slide object IDs, the one part callers read.
         """
         # Create file metadata with target folder as parent
         file_metadata = {
@@ -312,11 +599,23 @@ class DriveClient:
         )
         presentation_id = file["id"]
 
-        # Get the full presentation object via Slides API
+        # Get the new deck's slide IDs via Slides API; the full object also
+        # carries every master and layout, which nothing here reads
         presentation = (
             self._slides_service.presentations()
-            .get(presentationId=presentation_id)
-            .execute()
+            .get(presentationId=presentation_id, fields="slides.objectId")
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
         )
 
         return presentation_id, presentation
+
+
+def _exclude_names_query(terms: Sequence[str]) -> Optional[str]:
+    """Build a ``q`` clause dropping files whose name contains any of the terms.
+
+    Drive matches ``name contains`` case-insensitively but by word prefix
+    only, so callers should still filter names client-side.
+    """
+    if not terms:
+        return None
+    return " and ".join(f"not name contains '{term}'" for term in terms)
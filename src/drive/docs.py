@@ -2,8 +2,16 @@
 
 import logging
 
+from src.config import GOOGLE_API_NUM_RETRIES
+
 logger = logging.getLogger(__name__)
 
+# Only what _extract_text reads: paragraph text runs and table cell content
+# (cells are returned whole, so nested tables keep their text)
+DOCUMENT_TEXT_FIELDS = (
+    "body.content(paragraph.elements.textRun.content,table.tableRows.tableCells.content)"
+)
+
 
 class DocsReader:
     """Reads content from Google Docs using the Docs API v1."""
@@ -25,30 +33,43 @@ class DocsReader:
         Returns:
             Plain text content of the document.
         """
-        doc = self._service.documents().get(documentId=document_id).execute()
+        doc = (
+            self._service.documents()
+            .get(documentId=document_id, fields=DOCUMENT_TEXT_FIELDS)
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
+        )
         body = doc.get("body", {})
         content = body.get("content", [])
 
-        text_parts = []
-        for element in content:
-            self._extract_text(element, text_parts)
-
-        return "".join(text_parts)
-
-    def _extract_text(self, element: dict, parts: list[str]) -> None:
-        """Recursively extract text from a document element."""
-        if "paragraph" in element:
-            paragraph = element["paragraph"]
-            for elem in paragraph.get("elements", []):
-                if "textRun" in elem:
-                    parts.append(elem["textRun"].get("content", ""))
-        elif "table" in element:
-            table = element["table"]
-            for row in table.get("tableRows", []):
-                for cell in row.get("tableCells", []):
-                    for content in cell.get("content", []):
-                        self._extract_text(content, parts)
-                    parts.append("\t")
-                parts.append("\n")
-        elif "sectionBreak" in element:
-            pass  # Section breaks don't contain text
+        return "".join(self._extract_text(content))
+
+    def _extract_text(self, content: list[dict]) -> list[str]:
+        """Extract text runs from document elements in reading order.
+
+        Walks nested tables with an explicit stack instead of recursion, so
+        deeply nested documents cannot hit the recursion limit. Plain
+        strings on the stack are cell/row separators emitted as-is.
+        """
+        parts: list[str] = []
+        stack: list = list(reversed(content))
+        while stack:
+            element = stack.pop()
+            if isinstance(element, str):
+                parts.append(element)
+            elif "paragraph" in element:
+                parts.extend(
+                    elem["textRun"].get("content", "")
+                    for elem in element["paragraph"].get("elements", [])
+                    if "textRun" in elem
+                )
+            elif "table" in element:
+                # Push in reverse so cells pop in reading order
+                pending: list = []
+                for row in element["table"].get("tableRows", []):
+                    for cell in row.get("tableCells", []):
+                        pending.extend(cell.get("content", []))
+                        pending.append("\t")
+                    pending.append("\n")
+                stack.extend(reversed(pending))
+            # Section breaks and other elements don't contain text
+        return parts
@@ -3,6 +3,8 @@
 import logging
 from typing import Optional
 
+from src.config import GOOGLE_API_NUM_RETRIES
+
 logger = logging.getLogger(__name__)
 
 
@@ -42,39 +44,43 @@ class SheetsReader:
             spreadsheet = (
                 self._service.spreadsheets()
                 .get(spreadsheetId=spreadsheet_id, fields="sheets.properties.title")
-                .execute()
+                .execute(num_retries=GOOGLE_API_NUM_RETRIES)
             )
             sheets = spreadsheet.get("sheets", [])
             if not sheets:
                 return []
             full_range = sheets[0]["properties"]["title"]
 
+        grids = self.read_ranges(spreadsheet_id, [full_range])
+        return grids[0] if grids else []
+
+    def read_ranges(self, spreadsheet_id: str, ranges: list[str]) -> list[list[list[str]]]:
+        """Read several ranges (e.g. whole tabs) of one spreadsheet in a single request.
+
+        Args:
+            spreadsheet_id: The Google Sheets file ID.
+            ranges: A1 ranges or sheet tab names.
+
+        Returns:
+            One normalized 2D list of cell values per range, in order.
+        """
+        if not ranges:
+            return []
+
         result = (
             self._service.spreadsheets()
             .values()
-            .get(
+            .batchGet(
                 spreadsheetId=spreadsheet_id,
-                range=full_range,
+                ranges=ranges,
                 valueRenderOption="UNFORMATTED_VALUE",
                 dateTimeRenderOption="FORMATTED_STRING",
+                fields="valueRanges.values",
             )
-            .execute()
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
         )
-
-        values = result.get("values", [])
-        # Normalize: ensure all rows have the same number of columns
-        if values:
-            max_cols = max(len(row) for row in values)
-            normalized = []
-            for row in values:
-                str_row = [str(cell) if cell is not None else "" for cell in row]
-                # Pad short rows
-                while len(str_row) < max_cols:
-                    str_row.append("")
-                normalized.append(str_row)
-            return normalized
-
-        return []
+        value_ranges = result.get("valueRanges", [])
+        return [_normalize(vr.get("values", [])) for vr in value_ranges]
 
     def get_sheet_names(self, spreadsheet_id: str) -> list[str]:
         """Get all sheet tab names in a spreadsheet.
@@ -88,9 +94,20 @@ class SheetsReader:
         spreadsheet = (
             self._service.spreadsheets()
             .get(spreadsheetId=spreadsheet_id, fields="sheets.properties.title")
-            .execute()
+            .execute(num_retries=GOOGLE_API_NUM_RETRIES)
         )
         return [
             sheet["properties"]["title"]
             for sheet in spreadsheet.get("sheets", [])
         ]
+
+
+def _normalize(values: list[list]) -> list[list[str]]:
+    """Stringify cells and pad rows so all have the same number of columns."""
+    if not values:
+        return []
+    max_cols = max(map(len, values))
+    return [
+        [str(cell) if cell is not None else "" for cell in row] + [""] * (max_cols - len(row))
+        for row in values
+    ]
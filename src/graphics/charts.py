@@ -5,10 +5,13 @@ Only compares like-to-like within the same experiment family.
 """
 
 import logging
+import os
 import re
-from collections import defaultdict
+import statistics
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import matplotlib
 
@@ -16,7 +19,12 @@ matplotlib.use("Agg")  # Non-interactive backend for server use
 import matplotlib.pyplot as plt
 import numpy as np
 
-from src.models.data import Experiment, Goal, Run
+# Applied once at import (and so in each chart worker process) rather than
+# per chart, since every call re-parses the style file
+plt.style.use("seaborn-v0_8-whitegrid")
+
+from src.config import CHART_PROCESS_POOL_MIN_EXPERIMENTS
+from src.models.data import Experiment, Goal
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +49,27 @@ COLORS = {
     "gray": "#999999",
 }
 
+# Resolution of the report PNGs; slides show charts at roughly 10 inches wide
+CHART_DPI = 110
+
+# Copy number in a channel label, e.g. "IS 6600 cp"
+_COPY_NUMBER_RE = re.compile(r"([\d.]+)\s*cp", re.IGNORECASE)
+
+# Experiment family by filename keyword; earlier keywords take precedence
+_FAMILY_KEYWORDS = {
+    "preheat": "Preheat Seq",
+    "evagreen": "Evagreen",
+    "anneal": "Anneal Temp",
+    "cross": "Cross Rxn",
+    "rxn": "Cross Rxn",
+    "lod": "LOD Testing",
+    "sputum": "Sputum",
+    "msm": "MSM",
+}
+_FAMILY_PRECEDENCE = {keyword: i for i, keyword in enumerate(_FAMILY_KEYWORDS)}
+# Lookahead so overlapping keywords are all found in one scan
+_FAMILY_RE = re.compile(f"(?=({'|'.join(_FAMILY_KEYWORDS)}))")
+
 
 def generate_all_charts(
     experiments: list[Experiment],
@@ -60,70 +89,119 @@ def generate_all_charts(
         List of generated chart file paths.
     """
     output_dir.mkdir(parents=True, exist_ok=True)
-    chart_paths = []
+    jobs = _chart_jobs(experiments, goals, goal_assessment)
+
+    if len(experiments) >= CHART_PROCESS_POOL_MIN_EXPERIMENTS and len(jobs) > 1:
+        # Rendering is CPU-bound pure Python, so large reports render each
+        # chart in its own process
+        workers = min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_render_chart, generate, args, output_dir)
+                for generate, args in jobs
+            ]
+            paths = [f.result() for f in futures]
+    else:
+        # One figure is cleared and reused for every chart; creating a fresh
+        # figure per chart dominates the cost of these small PNGs.
+        fig = plt.figure()
+        try:
+            paths = [generate(fig, *args, output_dir) for generate, args in jobs]
+        finally:
+            plt.close(fig)
+
+    return [path for path in paths if path]
+
+
+def _chart_jobs(
+    experiments: list[Experiment], goals: list[Goal], goal_assessment: str
+) -> list[tuple[Callable[..., Optional[Path]], tuple]]:
+    """List the applicable chart generators and their data arguments, in report order."""
+    jobs = []
 
     # 1. LOD Curves (if LOD experiments exist)
     lod_exps = [e for e in experiments if _is_lod_experiment(e)]
     if lod_exps:
-        path = _generate_lod_chart(lod_exps, output_dir)
-        if path:
-            chart_paths.append(path)
+        jobs.append((_generate_lod_chart, (lod_exps,)))
 
     # 2. Ct Comparison (for experiments with multiple runs)
     multi_run = [e for e in experiments if len(e.runs) >= 2]
     if multi_run:
-        path = _generate_ct_comparison(multi_run, output_dir)
-        if path:
-            chart_paths.append(path)
+        jobs.append((_generate_ct_comparison, (multi_run,)))
 
     # 3. Goal Progress Dashboard
     if goals:
-        path = _generate_goal_dashboard(goals, goal_assessment, output_dir)
-        if path:
-            chart_paths.append(path)
+        jobs.append((_generate_goal_dashboard, (goals, goal_assessment)))
 
     # 4. Weekly Activity Summary
     if experiments:
-        path = _generate_activity_summary(experiments, output_dir)
-        if path:
-            chart_paths.append(path)
+        jobs.append((_generate_activity_summary, (experiments,)))
 
     # 5. Replicate Consistency
     if multi_run:
-        path = _generate_replicate_consistency(multi_run, output_dir)
-        if path:
-            chart_paths.append(path)
+        jobs.append((_generate_replicate_consistency, (multi_run,)))
+
+    return jobs
 
-    return chart_paths
+
+def _render_chart(
+    generate: Callable[..., Optional[Path]], args: tuple, output_dir: Path
+) -> Optional[Path]:
+    """Run one chart generator on a figure of its own (process pool worker)."""
+    fig = plt.figure()
+    try:
+        return generate(fig, *args, output_dir)
+    finally:
+        plt.close(fig)
 
 
 def _is_lod_experiment(exp: Experiment) -> bool:
     """Check if an experiment is an LOD (limit of detection) test."""
     text = f"{exp.purpose} {exp.experiments_desc} {exp.source_file}".lower()
-    return "lod" in text or "limit of detection" in text or "cp" in " ".join(
-        ca.label.lower() for ca in exp.channel_assignments
-    )
+    if "lod" in text or "limit of detection" in text:
+        return True
+    return any("cp" in ca.label.lower() for ca in exp.channel_assignments)
+
+
+def _experiment_family(source_file: str) -> str:
+    """Infer an experiment's family from its filename."""
+    keywords = _FAMILY_RE.findall(source_file.lower())
+    if not keywords:
+        return "Other"
+    return _FAMILY_KEYWORDS[min(keywords, key=_FAMILY_PRECEDENCE.__getitem__)]
 
 
 def _extract_copy_numbers(exp: Experiment) -> list[float]:
     """Extract copy numbers from channel assignments (e.g., 'IS 6600 cp')."""
     copies = []
     for ca in exp.channel_assignments:
-        m = re.search(r"([\d.]+)\s*cp", ca.label, re.IGNORECASE)
+        m = _COPY_NUMBER_RE.search(ca.label)
         if m:
             copies.append(float(m.group(1)))
     return copies
 
 
-def _get_fam_ct_list(run: Run) -> list[Optional[float]]:
-    """Get FAM Ct values as a list [ch0, ch1, ch2, ch3, ch4]."""
-    return [run.ct_fam.ch0, run.ct_fam.ch1, run.ct_fam.ch2, run.ct_fam.ch3, run.ct_fam.ch4]
+def _reset_figure(fig: plt.Figure, figsize: tuple[float, float]) -> None:
+    """Clear a reused figure and resize it for the next chart."""
+    fig.clf()
+    fig.set_size_inches(*figsize)
+
+
+def _save_png(fig: plt.Figure, path: Path) -> None:
+    """Write a chart PNG.
+
+    Margins come from ``tight_layout`` rather than ``bbox_inches="tight"``,
+    which renders the figure a second time to measure it.
+    """
+    fig.savefig(path, dpi=CHART_DPI, pil_kwargs={"optimize": True})
 
 
-def _generate_lod_chart(experiments: list[Experiment], output_dir: Path) -> Optional[Path]:
+def _generate_lod_chart(
+    fig: plt.Figure, experiments: list[Experiment], output_dir: Path
+) -> Optional[Path]:
     """Generate LOD curve chart (Ct vs copy number)."""
-    fig, ax = plt.subplots(figsize=(10, 6))
-    plt.style.use("seaborn-v0_8-whitegrid")
+    _reset_figure(fig, (10, 6))
+    ax = fig.add_subplot()
 
     has_data = False
     for exp_idx, exp in enumerate(experiments):
@@ -131,17 +209,16 @@ def _generate_lod_chart(experiments: list[Experiment], output_dir: Path) -> Opti
         if not copies:
             continue
 
+        copies_arr = np.array(copies, dtype=float)
         for run in exp.runs:
-            cts = _get_fam_ct_list(run)
-            # Map channels to copy numbers
-            plot_copies = []
-            plot_cts = []
-            for i, (cp, ct) in enumerate(zip(copies, cts)):
-                if ct is not None and ct > 0:
-                    plot_copies.append(cp)
-                    plot_cts.append(ct)
-
-            if plot_copies:
+            # Map channels to copy numbers; missing Cts (None) become NaN,
+            # which the amplification mask drops
+            cts_arr = np.array(run.fam_cts[:len(copies_arr)], dtype=float)
+            amplified = cts_arr > 0
+            plot_copies = copies_arr[:len(cts_arr)][amplified]
+            plot_cts = cts_arr[amplified]
+
+            if plot_copies.size:
                 has_data = True
                 label = f"{run.run_id}" if len(experiments) == 1 else f"{exp.source_file[:30]}|{run.run_id}"
                 ax.plot(
@@ -153,7 +230,6 @@ def _generate_lod_chart(experiments: list[Experiment], output_dir: Path) -> Opti
                 )
 
     if not has_data:
-        plt.close(fig)
         return None
 
     ax.set_xscale("log")
@@ -163,19 +239,18 @@ def _generate_lod_chart(experiments: list[Experiment], output_dir: Path) -> Opti
     ax.invert_yaxis()  # Lower Ct = better, so invert
     ax.legend(fontsize=8, loc="best")
 
+    fig.tight_layout()
     path = output_dir / "lod_curves.png"
-    fig.savefig(path, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    _save_png(fig, path)
     return path
 
 
-def _generate_ct_comparison(experiments: list[Experiment], output_dir: Path) -> Optional[Path]:
+def _generate_ct_comparison(
+    fig: plt.Figure, experiments: list[Experiment], output_dir: Path
+) -> Optional[Path]:
     """Generate Ct value comparison chart across runs within experiments."""
-    fig, axes = plt.subplots(
-        1, min(len(experiments), 3),
-        figsize=(5 * min(len(experiments), 3), 6),
-        squeeze=False,
-    )
+    _reset_figure(fig, (5 * min(len(experiments), 3), 6))
+    axes = fig.subplots(1, min(len(experiments), 3), squeeze=False)
 
     for idx, exp in enumerate(experiments[:3]):
         ax = axes[0, idx]
@@ -183,8 +258,7 @@ def _generate_ct_comparison(experiments: list[Experiment], output_dir: Path) ->
         ct_values = []
 
         for run in exp.runs:
-            cts = _get_fam_ct_list(run)
-            valid_cts = [c for c in cts if c is not None and c > 0]
+            valid_cts = run.valid_fam_cts
             if valid_cts:
                 run_ids.append(run.run_id[-15:])
                 ct_values.append(valid_cts)
@@ -194,7 +268,7 @@ def _generate_ct_comparison(experiments: list[Experiment], output_dir: Path) ->
             continue
 
         # Box plot for each run
-        bp = ax.boxplot(ct_values, labels=run_ids, patch_artist=True)
+        bp = ax.bxp(_box_stats(ct_values, run_ids), patch_artist=True)
         for patch in bp["boxes"]:
             patch.set_facecolor(CB_PALETTE[idx % len(CB_PALETTE)])
             patch.set_alpha(0.6)
@@ -207,17 +281,45 @@ def _generate_ct_comparison(experiments: list[Experiment], output_dir: Path) ->
     fig.tight_layout()
 
     path = output_dir / "ct_comparison.png"
-    fig.savefig(path, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    _save_png(fig, path)
     return path
 
 
+def _box_stats(values: list[list[float]], labels: list[str]) -> list[dict]:
+    """Box plot statistics for each list of values, as ``Axes.boxplot`` computes them.
+
+    Quartiles for all boxes come from one NaN-padded percentile call.
+    Whiskers extend to the furthest value within 1.5 IQR of the box.
+    """
+    grid = np.full((len(values), max(map(len, values))), np.nan)
+    for i, row in enumerate(values):
+        grid[i, :len(row)] = row
+    q1, med, q3 = np.nanpercentile(grid, [25, 50, 75], axis=1)
+    iqr = q3 - q1
+    inside = (grid >= (q1 - 1.5 * iqr)[:, None]) & (grid <= (q3 + 1.5 * iqr)[:, None])
+    whislo = np.fmin(np.nanmin(np.where(inside, grid, np.nan), axis=1), q1)
+    whishi = np.fmax(np.nanmax(np.where(inside, grid, np.nan), axis=1), q3)
+    outside = ~inside & ~np.isnan(grid)
+    return [
+        {
+            "label": label,
+            "q1": q1[i],
+            "med": med[i],
+            "q3": q3[i],
+            "whislo": whislo[i],
+            "whishi": whishi[i],
+            "fliers": grid[i][outside[i]],
+        }
+        for i, label in enumerate(labels)
+    ]
+
+
 def _generate_goal_dashboard(
-    goals: list[Goal], goal_assessment: str, output_dir: Path
+    fig: plt.Figure, goals: list[Goal], goal_assessment: str, output_dir: Path
 ) -> Optional[Path]:
     """Generate goal progress dashboard chart."""
-    fig, ax = plt.subplots(figsize=(10, max(3, len(goals) * 0.8)))
-    plt.style.use("seaborn-v0_8-whitegrid")
+    _reset_figure(fig, (10, max(3, len(goals) * 0.8)))
+    ax = fig.add_subplot()
 
     # Parse goal assessment to estimate progress percentages
     goal_names = []
@@ -245,7 +347,6 @@ def _generate_goal_dashboard(
             colors.append(COLORS["red"])
 
     if not goal_names:
-        plt.close(fig)
         return None
 
     y_pos = range(len(goal_names))
@@ -268,8 +369,7 @@ def _generate_goal_dashboard(
 
     fig.tight_layout()
     path = output_dir / "goal_dashboard.png"
-    fig.savefig(path, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    _save_png(fig, path)
     return path
 
 
@@ -295,32 +395,16 @@ def _estimate_goal_progress(goal_name: str, assessment: str) -> float:
     return 25  # default
 
 
-def _generate_activity_summary(experiments: list[Experiment], output_dir: Path) -> Optional[Path]:
+def _generate_activity_summary(
+    fig: plt.Figure, experiments: list[Experiment], output_dir: Path
+) -> Optional[Path]:
     """Generate weekly experiment activity summary infographic."""
-    fig, axes = plt.subplots(1, 3, figsize=(12, 4))
+    _reset_figure(fig, (12, 4))
+    axes = fig.subplots(1, 3)
 
     # 1. Experiments count by type/family
     ax1 = axes[0]
-    families = defaultdict(int)
-    for exp in experiments:
-        # Infer family from filename
-        name = exp.source_file.lower()
-        if "preheat" in name:
-            families["Preheat Seq"] += 1
-        elif "evagreen" in name:
-            families["Evagreen"] += 1
-        elif "anneal" in name:
-            families["Anneal Temp"] += 1
-        elif "cross" in name or "rxn" in name:
-            families["Cross Rxn"] += 1
-        elif "lod" in name:
-            families["LOD Testing"] += 1
-        elif "sputum" in name:
-            families["Sputum"] += 1
-        elif "msm" in name:
-            families["MSM"] += 1
-        else:
-            families["Other"] += 1
+    families = Counter(_experiment_family(exp.source_file) for exp in experiments)
 
     if families:
         names = list(families.keys())
@@ -331,12 +415,9 @@ def _generate_activity_summary(experiments: list[Experiment], output_dir: Path)
 
     # 2. Tester activity
     ax2 = axes[1]
-    testers = defaultdict(int)
-    for exp in experiments:
-        for t in exp.tester.split(","):
-            t = t.strip()
-            if t:
-                testers[t] += 1
+    testers = Counter(
+        t for exp in experiments for t in map(str.strip, exp.tester.split(",")) if t
+    )
 
     if testers:
         names = list(testers.keys())
@@ -347,10 +428,7 @@ def _generate_activity_summary(experiments: list[Experiment], output_dir: Path)
 
     # 3. Device usage
     ax3 = axes[2]
-    devices = defaultdict(int)
-    for exp in experiments:
-        if exp.device:
-            devices[exp.device] += 1
+    devices = Counter(exp.device for exp in experiments if exp.device)
 
     if devices:
         names = list(devices.keys())
@@ -367,17 +445,16 @@ def _generate_activity_summary(experiments: list[Experiment], output_dir: Path)
     fig.tight_layout()
 
     path = output_dir / "activity_summary.png"
-    fig.savefig(path, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    _save_png(fig, path)
     return path
 
 
 def _generate_replicate_consistency(
-    experiments: list[Experiment], output_dir: Path
+    fig: plt.Figure, experiments: list[Experiment], output_dir: Path
 ) -> Optional[Path]:
     """Generate replicate consistency dot plot."""
-    fig, ax = plt.subplots(figsize=(10, 6))
-    plt.style.use("seaborn-v0_8-whitegrid")
+    _reset_figure(fig, (10, 6))
+    ax = fig.add_subplot()
 
     y_labels = []
     x_data = []
@@ -385,8 +462,7 @@ def _generate_replicate_consistency(
 
     for exp in experiments:
         for run in exp.runs:
-            cts = _get_fam_ct_list(run)
-            valid = [c for c in cts if c is not None and c > 0]
+            valid = run.valid_fam_cts
             if len(valid) >= 2:
                 has_data = True
                 label = run.run_id[-20:]
@@ -394,13 +470,12 @@ def _generate_replicate_consistency(
                 x_data.append(valid)
 
     if not has_data:
-        plt.close(fig)
         return None
 
     for i, (label, cts) in enumerate(zip(y_labels[-15:], x_data[-15:])):
         ax.scatter(cts, [i] * len(cts), color=CB_PALETTE[0], alpha=0.7, s=60)
-        mean_ct = np.mean(cts)
-        std_ct = np.std(cts)
+        mean_ct = statistics.fmean(cts)
+        std_ct = statistics.pstdev(cts, mean_ct)
         ax.plot(mean_ct, i, "D", color=CB_PALETTE[3], markersize=8)
         ax.annotate(
             f"SD={std_ct:.1f}", (max(cts) + 0.5, i),
@@ -414,6 +489,5 @@ def _generate_replicate_consistency(
 
     fig.tight_layout()
     path = output_dir / "replicate_consistency.png"
-    fig.savefig(path, dpi=150, bbox_inches="tight")
-    plt.close(fig)
+    _save_png(fig, path)
     return path
@@ -10,32 +10,35 @@ Wires together all pipeline stages:
 Run with: python -m src.main
 """
 
-import json
+import asyncio
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Optional
 
 from src.analysis.claude_client import ClaudeClient
+from src.analysis.llm_cache import LLMCache
 from src.analysis.recommender import run_recommendations
 from src.analysis.summarizer import (
-    extract_constraints,
     load_cumulative_learnings,
-    run_analysis,
+    run_analysis_with_constraints,
     save_cumulative_learnings,
 )
+from src.bootstrap.parsed_cache import ParsedCache
 from src.config import (
     CHARTS_DIR,
     DRIVE_FOLDER_ID,
+    MAX_DRIVE_CONCURRENCY,
     REPORTS_FOLDER_ID,
 )
+from src.drive.cache import DriveCache
 from src.drive.client import DriveClient, MIME_DOCUMENT, MIME_SPREADSHEET
 from src.drive.docs import DocsReader
 from src.drive.sheets import SheetsReader
-from src.graphics.charts import generate_all_charts
 from src.models.data import Experiment, Goal, JournalEntry, WeeklyData
-from src.output.slides import create_weekly_report
 from src.parsers.experiment_sheet import parse_experiment_grid
 from src.parsers.goals import parse_goals_grid
 from src.parsers.journal import parse_journal_text
@@ -43,12 +46,13 @@ from src.parsers.journal import parse_journal_text
 logger = logging.getLogger(__name__)
 
 
-def run_weekly_pipeline(
+async def run_weekly_pipeline(
     days_back: int = 7,
     folder_id: Optional[str] = None,
     reports_folder_id: Optional[str] = None,
     dry_run: bool = False,
     all_files: bool = False,
+    use_cache: bool = True,
 ) -> Optional[str]:
     """Run the full weekly report pipeline.
 
@@ -58,6 +62,8 @@ def run_weekly_pipeline(
         reports_folder_id: Output folder ID (defaults to config).
         dry_run: If True, skip Slides generation and just print analysis.
         all_files: If True, process all files in folder (for historical data).
+        use_cache: If False, bypass the local Claude response, Drive
+            listing and parsed file caches.
 
     Returns:
         URL of the generated Slides report, or None if dry_run.
@@ -71,10 +77,9 @@ def run_weekly_pipeline(
     logger.info("=== Stampede Weekly Report Pipeline ===")
 
     # Initialize clients
-    drive = DriveClient()
-    claude = ClaudeClient()
+    drive = _drive_client(use_cache)
     sheets_reader = SheetsReader(drive.sheets)
-    docs_reader = DocsReader(drive.docs)
+    parsed_cache = ParsedCache(enabled=use_cache)
 
     # Calculate date range
     today = date.today()
@@ -91,9 +96,11 @@ def run_weekly_pipeline(
 
     # Discover experiment sheets (all files or recent only)
     if all_files:
-        recent_sheets = drive.list_files_in_folder(folder_id, mime_type=MIME_SPREADSHEET)
+        # One walk of the folder tree for both types
+        by_type = drive.list_files_by_type(folder_id, [MIME_SPREADSHEET, MIME_DOCUMENT])
+        recent_sheets = by_type[MIME_SPREADSHEET]
         logger.info(f"  Found {len(recent_sheets)} spreadsheets")
-        recent_docs = drive.list_files_in_folder(folder_id, mime_type=MIME_DOCUMENT)
+        recent_docs = by_type[MIME_DOCUMENT]
         logger.info(f"  Found {len(recent_docs)} documents")
     else:
         recent_sheets = drive.list_recent_files(folder_id, days=days_back, mime_type=MIME_SPREADSHEET)
@@ -101,57 +108,44 @@ def run_weekly_pipeline(
         recent_docs = drive.list_recent_files(folder_id, days=days_back, mime_type=MIME_DOCUMENT)
         logger.info(f"  Found {len(recent_docs)} recent documents")
 
-    # Parse experiment sheets
-    experiments: list[Experiment] = []
-    for sheet_file in recent_sheets:
-        name = sheet_file.get("name", "")
-        # Skip non-experiment files (e.g., goals, journals)
-        if "goal" in name.lower() or "journal" in name.lower():
-            continue
-        try:
-            grid = sheets_reader.read_sheet(sheet_file["id"])
-            exp = parse_experiment_grid(grid, name)
-            if exp.runs:  # Only include sheets that have experiment data
-                experiments.append(exp)
-        except Exception as e:
-            logger.warning(f"  Failed to parse sheet '{name}': {e}")
+    # Read and parse sheets and docs concurrently; the calls are network-bound
+    with ThreadPoolExecutor(max_workers=MAX_DRIVE_CONCURRENCY) as pool:
+        sheet_results = pool.map(partial(_read_experiment, drive, parsed_cache), recent_sheets)
+        doc_results = pool.map(partial(_read_journal, drive, parsed_cache), recent_docs)
 
-    logger.info(f"  Parsed {len(experiments)} experiments with data")
+        experiments: list[Experiment] = [exp for exp in sheet_results if exp is not None]
+        logger.info(f"  Parsed {len(experiments)} experiments with data")
 
-    # Parse journal documents
-    journal_entries: list[JournalEntry] = []
-    for doc_file in recent_docs:
-        name = doc_file.get("name", "")
-        try:
-            text = docs_reader.read_document_text(doc_file["id"])
-            entries = parse_journal_text(text, name)
+        journal_entries: list[JournalEntry] = []
+        for entries in doc_results:
             if all_files:
                 # For historical data, include all entries
                 journal_entries.extend(entries)
             else:
                 # Filter to this week's entries
-                week_entries = [
+                journal_entries.extend(
                     e for e in entries
                     if e.entry_date is not None and week_start <= e.entry_date <= week_end
-                ]
-                journal_entries.extend(week_entries)
-        except Exception as e:
-            logger.warning(f"  Failed to parse doc '{name}': {e}")
+                )
 
     logger.info(f"  Found {len(journal_entries)} journal entries for this week")
 
     # Parse goals (look for goals spreadsheet)
     goals: list[Goal] = []
-    all_sheets = drive.list_spreadsheets(folder_id)
-    for sheet_file in all_sheets:
-        if "goal" in sheet_file.get("name", "").lower():
-            try:
-                grid = sheets_reader.read_sheet(sheet_file["id"])
-                goals = parse_goals_grid(grid, sheet_file.get("name", ""))
-                logger.info(f"  Parsed {len(goals)} goals from '{sheet_file['name']}'")
-            except Exception as e:
-                logger.warning(f"  Failed to parse goals sheet: {e}")
-            break
+    # With --all the sheet listing above already covers the whole folder, and
+    # a recently edited goals sheet is already in it; only list the whole
+    # folder when the goals sheet was not modified this period
+    goal_sheets = _goal_sheets(recent_sheets)
+    if not goal_sheets and not all_files:
+        goal_sheets = _goal_sheets(drive.list_spreadsheets(folder_id))
+    if goal_sheets:
+        sheet_file = goal_sheets[0]
+        try:
+            grid = sheets_reader.read_sheet(sheet_file["id"])
+            goals = parse_goals_grid(grid, sheet_file.get("name", ""))
+            logger.info(f"  Parsed {len(goals)} goals from '{sheet_file['name']}'")
+        except Exception as e:
+            logger.warning(f"  Failed to parse goals sheet: {e}")
 
     # Build weekly data model
     weekly_data = WeeklyData(
@@ -162,20 +156,18 @@ def run_weekly_pipeline(
         goals=goals,
     )
 
-    # === Pre-Stage: Extract Constraints ===
-    logger.info("Extracting practical constraints from journals...")
-    constraints_json = extract_constraints(journal_entries, claude)
-    logger.info("  Constraints extracted")
-
-    # === Stage 1: Analysis ===
-    logger.info("Stage 1: Running AI analysis...")
-    analysis = run_analysis(weekly_data, claude)
-    logger.info("  Analysis complete")
+    cache = None if use_cache else LLMCache(enabled=False)
+    async with ClaudeClient(cache=cache) as claude:
+        # === Pre-Stage + Stage 1: Constraints and Analysis ===
+        # One call answers both, so the journal context is only sent once.
+        logger.info("Extracting constraints and running Stage 1 AI analysis...")
+        constraints_json, analysis = await run_analysis_with_constraints(weekly_data, claude)
+        logger.info("  Constraints extracted, analysis complete")
 
-    # === Stage 2: Recommendations ===
-    logger.info("Stage 2: Generating recommendations...")
-    recommendations = run_recommendations(analysis, goals, constraints_json, claude)
-    logger.info("  Recommendations generated")
+        # === Stage 2: Recommendations ===
+        logger.info("Stage 2: Generating recommendations...")
+        recommendations = await run_recommendations(analysis, goals, constraints_json, claude)
+        logger.info("  Recommendations generated")
 
     # === Stage 3: Update Cumulative Learnings ===
     if analysis.updated_learnings:
@@ -192,6 +184,10 @@ def run_weekly_pipeline(
         print(constraints_json)
         return None
 
+    # Imported here so dry runs never load matplotlib (~0.3 s)
+    from src.graphics.charts import generate_all_charts
+    from src.output.slides import create_weekly_report
+
     # === Stage 4: Generate Charts ===
     logger.info("Stage 4: Generating charts...")
     CHARTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -217,6 +213,76 @@ def run_weekly_pipeline(
     return report_url
 
 
+@lru_cache(maxsize=2)
+def _drive_client(use_cache: bool) -> DriveClient:
+    """Drive client shared by pipeline runs in the same process.
+
+    Building one loads the service account credentials and four API
+    services; reusing it also keeps its Shared Drive lookups and
+    per-thread connections across runs (e.g. several weeks in a row).
+    """
+    return DriveClient(cache=None if use_cache else DriveCache(enabled=False))
+
+
+def _goal_sheets(sheet_files: list[dict]) -> list[dict]:
+    """Spreadsheets whose name marks them as a goals sheet."""
+    return [f for f in sheet_files if "goal" in f.get("name", "").lower()]
+
+
+def _read_experiment(
+    drive: DriveClient, parsed_cache: ParsedCache, sheet_file: dict
+) -> Optional[Experiment]:
+    """Read and parse one experiment sheet (runs in a worker thread).
+
+    Parsed experiments are cached as JSON per file version, so unchanged
+    sheets are not re-read on later runs.
+
+    Returns:
+        The experiment, or None if the file is skipped, has no runs, or fails.
+    """
+    name = sheet_file.get("name", "")
+    # Skip non-experiment files (e.g., goals, journals)
+    if "goal" in name.lower() or "journal" in name.lower():
+        return None
+
+    def parse() -> str:
+        grid = SheetsReader(drive.thread_sheets()).read_sheet(sheet_file["id"])
+        return parse_experiment_grid(grid, name).model_dump_json()
+
+    try:
+        exp = Experiment.model_validate_json(
+            parsed_cache.get_or_parse("experiments", sheet_file, parse)
+        )
+    except Exception as e:
+        logger.warning(f"  Failed to parse sheet '{name}': {e}")
+        return None
+    # Only include sheets that have experiment data
+    return exp if exp.runs else None
+
+
+def _read_journal(
+    drive: DriveClient, parsed_cache: ParsedCache, doc_file: dict
+) -> list[JournalEntry]:
+    """Read and parse one journal document (runs in a worker thread).
+
+    Document text is cached per file version, shared with the bootstrap.
+
+    Returns:
+        All entries in the document; empty if it fails.
+    """
+    name = doc_file.get("name", "")
+    try:
+        text = parsed_cache.get_or_parse(
+            "docs",
+            doc_file,
+            lambda: DocsReader(drive.thread_docs()).read_document_text(doc_file["id"]),
+        )
+        return parse_journal_text(text, name)
+    except Exception as e:
+        logger.warning(f"  Failed to parse doc '{name}': {e}")
+        return []
+
+
 def main():
     """Entry point."""
     logging.basicConfig(
@@ -227,6 +293,7 @@ def main():
     # Parse command line arguments
     dry_run = "--dry-run" in sys.argv
     all_files = "--all" in sys.argv  # Process all files, not just recent
+    use_cache = "--no-cache" not in sys.argv
 
     if dry_run:
         logger.info("Running in dry-run mode (no Slides output)")
@@ -241,12 +308,13 @@ def main():
         elif arg.startswith("--folder="):
             folder_id = arg.split("=")[1]
 
-    url = run_weekly_pipeline(
+    url = asyncio.run(run_weekly_pipeline(
         days_back=days_back,
         folder_id=folder_id,
         dry_run=dry_run,
         all_files=all_files,
-    )
+        use_cache=use_cache,
+    ))
     if url:
         print(f"\nReport URL: {url}")
 
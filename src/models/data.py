@@ -72,6 +72,17 @@ class Run(BaseModel):
     video_file: str = ""
     report_file: str = ""
 
+    @property
+    def fam_cts(self) -> tuple[Optional[float], ...]:
+        """FAM Ct values in channel order (ch0-ch4)."""
+        fam = self.ct_fam
+        return (fam.ch0, fam.ch1, fam.ch2, fam.ch3, fam.ch4)
+
+    @property
+    def valid_fam_cts(self) -> tuple[float, ...]:
+        """FAM Ct values of channels that amplified (no missing or zero values)."""
+        return tuple(ct for ct in self.fam_cts if ct is not None and ct > 0)
+
 
 class Experiment(BaseModel):
     """A complete experiment parsed from a device testing sheet."""
@@ -5,18 +5,32 @@ Generates a weekly report presentation and uploads it to Google Drive.
 
 import logging
 import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from uuid import uuid4
 
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 
+from src.config import MAX_DRIVE_CONCURRENCY
 from src.drive.client import DriveClient
 from src.models.data import AnalysisResult, Experiment, RecommendationResult
 
 logger = logging.getLogger(__name__)
 
+_NUMBERED_HEADING_RE = re.compile(r"\n\d+\.\s+[A-Z]")
+# A numbered all-caps heading line and its heading text, e.g.
+# "2. EXECUTIVE SUMMARY (for leadership)" or "1. DEVICE STATUS: ...".
+# Numbered list items in a section body ("1. Preheat test: ...") don't match
+_SECTION_HEADING_RE = re.compile(
+    r"^\d+\.\s+([A-Z][A-Z \-&/]{3,}?)[^\S\n]*(?:[(:][^\n]*)?$", re.MULTILINE
+)
+
+_TRUNCATION_MARKER = "\n\n[... continued in appendix ...]"
+
 # Slide dimensions (standard 16:9 in EMU - English Metric Units)
 SLIDE_WIDTH = 9144000   # 10 inches
 SLIDE_HEIGHT = 5143500  # 5.625 inches
@@ -49,28 +63,89 @@ def create_weekly_report(
     """
     slides_service = drive_client.slides
 
-    title = f"Stampede Weekly Report - {week_start.strftime('%b %d')} to {week_end.strftime('%b %d, %Y')}"
+    # Upload charts in the background while the deck is created and built.
+    # The same worker threads delete them afterwards, reusing the Drive
+    # connections their uploads opened.
+    with ThreadPoolExecutor(max_workers=MAX_DRIVE_CONCURRENCY) as chart_pool:
+        chart_uploads = [
+            (chart_path, chart_pool.submit(_upload_chart, drive_client, chart_path, reports_folder_id))
+            for chart_path in chart_paths
+            if chart_path.exists()
+        ]
+
+        title = f"Stampede Weekly Report - {week_start.strftime('%b %d')} to {week_end.strftime('%b %d, %Y')}"
+
+        # Create presentation directly in the reports folder (avoids move permission issues)
+        presentation_id, presentation = drive_client.create_presentation_in_folder(
+            title, reports_folder_id
+        )
+
+        # Build all slides
+        requests = []
 
-    # Create presentation directly in the reports folder (avoids move permission issues)
-    presentation_id, presentation = drive_client.create_presentation_in_folder(
-        title, reports_folder_id
-    )
+        # Remove the default blank slide
+        default_slides = presentation.get("slides", [])
+        if default_slides:
+            requests.append({
+                "deleteObject": {"objectId": default_slides[0]["objectId"]}
+            })
+
+        requests.extend(_report_slide_requests(
+            title, week_start, week_end, analysis, recommendations, experiments
+        ))
 
-    # Build all slides
+        # Chart slides go in the same batchUpdate, so the whole deck is one call
+        image_ids = _uploaded_chart_ids(chart_uploads)
+        shared_ids = _share_charts(drive_client, image_ids)
+        chart_requests = [_chart_slide_requests(image_id) for image_id in shared_ids]
+        try:
+            _batch_update(
+                slides_service,
+                presentation_id,
+                requests + [r for chart_request in chart_requests for r in chart_request],
+            )
+        except HttpError as e:
+            if not chart_requests:
+                raise
+            # Slides applies a batch atomically, so one image it cannot fetch
+            # fails the whole deck; add the charts one by one instead
+            logger.warning(f"Combined slide update failed, adding charts separately: {e}")
+            _batch_update(slides_service, presentation_id, requests)
+            for chart_request in chart_requests:
+                try:
+                    _batch_update(slides_service, presentation_id, chart_request)
+                except HttpError as chart_error:
+                    logger.warning(f"Failed to add chart slide: {chart_error}")
+        finally:
+            # Slides stores its own copy of an image on insert, so the public
+            # Drive files are only needed until the batchUpdate returns
+            _delete_chart_files(drive_client, image_ids, chart_pool)
+
+    url = f"https://docs.google.com/presentation/d/{presentation_id}"
+    logger.info(f"Created report: {url}")
+    return url
+
+
+def _report_slide_requests(
+    title: str,
+    week_start: date,
+    week_end: date,
+    analysis: AnalysisResult,
+    recommendations: RecommendationResult,
+    experiments: list[Experiment],
+) -> list[dict]:
+    """Build the requests for the title and text slides, in deck order."""
     requests = []
 
-    # Remove the default blank slide
-    default_slides = presentation.get("slides", [])
-    if default_slides:
-        requests.append({
-            "deleteObject": {"objectId": default_slides[0]["objectId"]}
-        })
+    # Split each response into sections once, not once per slide
+    analysis_section = _section_reader(analysis.raw_response)
+    recommendations_section = _section_reader(recommendations.raw_response)
 
     # 1. Title Slide
     requests.extend(_create_title_slide(title, week_start, week_end))
 
     # 2. Executive Summary
-    exec_summary = _extract_section(analysis.raw_response, "EXECUTIVE SUMMARY")
+    exec_summary = analysis_section("EXECUTIVE SUMMARY")
     requests.extend(_create_text_slide("Executive Summary", exec_summary))
 
     # 3. Experiments This Week
@@ -78,49 +153,37 @@ def create_weekly_report(
     requests.extend(_create_text_slide("Experiments This Week", exp_table))
 
     # 4. Key Results (with charts)
-    exp_analysis = _extract_section(analysis.raw_response, "EXPERIMENT-BY-EXPERIMENT ANALYSIS")
-    requests.extend(_create_text_slide("Key Results", exp_analysis[:3000]))
+    exp_analysis = analysis_section("EXPERIMENT-BY-EXPERIMENT ANALYSIS")
+    requests.extend(_create_text_slide("Key Results", exp_analysis))
 
     # 5. Anomalies & Contradictions
-    anomalies = _extract_section(analysis.raw_response, "CONTRADICTION")
+    anomalies = analysis_section("CONTRADICTION")
     if anomalies:
-        requests.extend(_create_text_slide("Anomalies & Contradictions", anomalies[:2000]))
+        requests.extend(_create_text_slide("Anomalies & Contradictions", anomalies, 2000))
 
     # 6. Cross-Experiment Insights
-    insights = _extract_section(analysis.raw_response, "CROSS-EXPERIMENT INSIGHTS")
+    insights = analysis_section("CROSS-EXPERIMENT INSIGHTS")
     if insights:
-        requests.extend(_create_text_slide("Cross-Experiment Insights", insights[:2000]))
+        requests.extend(_create_text_slide("Cross-Experiment Insights", insights, 2000))
 
     # 7. Goal Progress
-    goal_text = _extract_section(recommendations.raw_response, "GOAL URGENCY")
-    requests.extend(_create_text_slide("Goal Progress", goal_text[:2000]))
+    goal_text = recommendations_section("GOAL URGENCY")
+    requests.extend(_create_text_slide("Goal Progress", goal_text, 2000))
 
     # 8. Strategic Direction
-    strategy = _extract_section(recommendations.raw_response, "STRATEGIC DIRECTION")
-    requests.extend(_create_text_slide("Strategic Direction", strategy[:2000]))
+    strategy = recommendations_section("STRATEGIC DIRECTION")
+    requests.extend(_create_text_slide("Strategic Direction", strategy, 2000))
 
     # 9. Recommended Experiments
-    recs = _extract_section(recommendations.raw_response, "SPECIFIC EXPERIMENT RECOMMENDATIONS")
-    requests.extend(_create_text_slide("Recommended Next Experiments", recs[:3000]))
+    recs = recommendations_section("SPECIFIC EXPERIMENT RECOMMENDATIONS")
+    requests.extend(_create_text_slide("Recommended Next Experiments", recs))
 
     # 10. Experiments to Avoid
-    avoid = _extract_section(recommendations.raw_response, "EXPERIMENTS TO AVOID")
+    avoid = recommendations_section("EXPERIMENTS TO AVOID")
     if avoid:
-        requests.extend(_create_text_slide("Experiments to Avoid", avoid[:2000]))
+        requests.extend(_create_text_slide("Experiments to Avoid", avoid, 2000))
 
-    # Execute all slide creation requests
-    if requests:
-        slides_service.presentations().batchUpdate(
-            presentationId=presentation_id,
-            body={"requests": requests},
-        ).execute()
-
-    # Upload chart images to slides
-    _add_chart_images(drive_client, presentation_id, chart_paths, reports_folder_id)
-
-    url = f"https://docs.google.com/presentation/d/{presentation_id}"
-    logger.info(f"Created report: {url}")
-    return url
+    return requests
 
 
 def _create_title_slide(title: str, week_start: date, week_end: date) -> list[dict]:
@@ -156,15 +219,21 @@ def _create_title_slide(title: str, week_start: date, week_end: date) -> list[di
     ]
 
 
-def _create_text_slide(title: str, body_text: str) -> list[dict]:
-    """Create a text content slide with title and body."""
+def _create_text_slide(title: str, body_text: str, max_len: int = 3000) -> list[dict]:
+    """Create a text content slide with title and body.
+
+    Args:
+        title: Slide title.
+        body_text: Slide body; cut to ``max_len`` characters (marker included).
+        max_len: Longest body that fits the slide.
+    """
     slide_id = _new_id()
     title_id = _new_id()
     body_id = _new_id()
 
-    # Truncate body text to avoid API limits
-    if len(body_text) > 3000:
-        body_text = body_text[:2950] + "\n\n[... continued in appendix ...]"
+    # Truncate body text to fit the slide, slicing only once
+    if len(body_text) > max_len:
+        body_text = body_text[:max_len - len(_TRUNCATION_MARKER)] + _TRUNCATION_MARKER
 
     return [
         {
@@ -201,93 +270,170 @@ def _create_text_slide(title: str, body_text: str) -> list[dict]:
     ]
 
 
-def _add_chart_images(
-    drive_client: DriveClient,
-    presentation_id: str,
-    chart_paths: list[Path],
-    reports_folder_id: str,
-) -> None:
-    """Upload chart images and add them as slides."""
-    slides_service = drive_client.slides
+def _upload_chart(drive_client: DriveClient, chart_path: Path, reports_folder_id: str) -> str:
+    """Upload a chart PNG to the reports folder.
 
-    for chart_path in chart_paths:
-        if not chart_path.exists():
-            continue
+    Runs in a worker thread, so it uses that thread's Drive service. The
+    file is shared publicly afterwards, together with the other charts.
 
-        # Upload image to reports folder
+    Returns:
+        Drive file ID of the uploaded image.
+    """
+    image = (
+        drive_client.thread_drive()
+        .files()
+        .create(
+            body={
+                "name": f"stampede_chart_{chart_path.stem}.png",
+                "parents": [reports_folder_id],
+            },
+            media_body=MediaFileUpload(str(chart_path), mimetype="image/png"),
+            fields="id",
+            supportsAllDrives=True,
+        )
+        .execute()
+    )
+    return image["id"]
+
+
+def _uploaded_chart_ids(chart_uploads: list[tuple[Path, Future]]) -> list[str]:
+    """Wait for chart uploads, logging and skipping the ones that failed."""
+    image_ids = []
+    for chart_path, upload in chart_uploads:
         try:
-            image_id = drive_client.upload_file(
-                str(chart_path),
-                folder_id=reports_folder_id,
-                mime_type="image/png",
-                name=f"stampede_chart_{chart_path.stem}.png",
-            )
+            image_ids.append(upload.result())
+        except Exception as e:
+            logger.warning(f"Failed to add chart {chart_path.name}: {e}")
+    return image_ids
 
-            # Make the file publicly readable (needed for Slides to embed)
-            drive_client.drive.permissions().create(
-                fileId=image_id,
-                body={"type": "anyone", "role": "reader"},
-                supportsAllDrives=True,
-            ).execute()
 
-            image_url = f"https://drive.google.com/uc?id={image_id}"
+def _share_charts(drive_client: DriveClient, image_ids: list[str]) -> list[str]:
+    """Make uploaded chart images public, returning the IDs that were shared.
 
-            # Create a new slide with the image
-            slide_id = _new_id()
-            title_id = _new_id()
-            image_obj_id = _new_id()
+    Slides fetches createImage URLs anonymously, so the images must be
+    public; they are shared in one batch request. A failure only costs the
+    chart slides, so it is logged and no IDs are returned.
+    """
+    try:
+        return drive_client.share_with_anyone(image_ids)
+    except Exception as e:
+        logger.warning(f"Failed to share chart images, skipping chart slides: {e}")
+        return []
 
-            chart_title = chart_path.stem.replace("_", " ").title()
 
-            requests = [
-                {
-                    "createSlide": {
-                        "objectId": slide_id,
-                        "slideLayoutReference": {"predefinedLayout": "BLANK"},
-                    }
-                },
-                {
-                    "createImage": {
-                        "objectId": image_obj_id,
-                        "url": image_url,
-                        "elementProperties": {
-                            "pageObjectId": slide_id,
-                            "size": {
-                                "width": {"magnitude": 8000000, "unit": "EMU"},
-                                "height": {"magnitude": 4500000, "unit": "EMU"},
-                            },
-                            "transform": {
-                                "scaleX": 1,
-                                "scaleY": 1,
-                                "translateX": 572000,
-                                "translateY": 500000,
-                                "unit": "EMU",
-                            },
-                        },
-                    }
-                },
-            ]
+def _delete_chart_files(
+    drive_client: DriveClient, image_ids: list[str], pool: ThreadPoolExecutor
+) -> None:
+    """Delete uploaded chart images from Drive once they are in the deck."""
 
-            slides_service.presentations().batchUpdate(
-                presentationId=presentation_id,
-                body={"requests": requests},
+    def delete(image_id: str) -> None:
+        try:
+            drive_client.thread_drive().files().delete(
+                fileId=image_id, supportsAllDrives=True
             ).execute()
-
         except Exception as e:
-            logger.warning(f"Failed to add chart {chart_path.name}: {e}")
+            logger.warning(f"Failed to delete chart image {image_id}: {e}")
 
+    list(pool.map(delete, image_ids))
 
-def _extract_section(text: str, section_name: str) -> str:
-    """Extract a section from the AI response text by heading."""
-    # Try numbered section pattern: "1. SECTION NAME" or "## SECTION NAME"
-    patterns = [
-        rf"\d+\.\s*{re.escape(section_name)}.*?\n(.*?)(?=\n\d+\.\s+[A-Z]|\Z)",
-        rf"#+\s*{re.escape(section_name)}.*?\n(.*?)(?=\n#+\s+|\Z)",
-        rf"{re.escape(section_name)}.*?\n(.*?)(?=\n[A-Z]{{2,}}|\Z)",
+
+def _chart_slide_requests(image_id: str) -> list[dict]:
+    """Build the requests for a blank slide showing an uploaded chart image."""
+    slide_id = _new_id()
+    image_obj_id = _new_id()
+    return [
+        {
+            "createSlide": {
+                "objectId": slide_id,
+                "slideLayoutReference": {"predefinedLayout": "BLANK"},
+            }
+        },
+        {
+            "createImage": {
+                "objectId": image_obj_id,
+                "url": f"https://drive.google.com/uc?id={image_id}",
+                "elementProperties": {
+                    "pageObjectId": slide_id,
+                    "size": {
+                        "width": {"magnitude": 8000000, "unit": "EMU"},
+                        "height": {"magnitude": 4500000, "unit": "EMU"},
+                    },
+                    "transform": {
+                        "scaleX": 1,
+                        "scaleY": 1,
+                        "translateX": 572000,
+                        "translateY": 500000,
+                        "unit": "EMU",
+                    },
+                },
+            }
+        },
     ]
 
-    for pattern in patterns:
-        m = re.search(pattern, text, re.DOTALL | re.IGNORECASE)
+
+def _batch_update(slides_service, presentation_id: str, requests: list[dict]) -> None:
+    """Apply Slides requests in one batchUpdate call (no-op when empty)."""
+    if requests:
+        slides_service.presentations().batchUpdate(
+            presentationId=presentation_id,
+            body={"requests": requests},
+        ).execute()
+
+
+def _section_reader(text: str) -> Callable[[str], str]:
+    """Return a section lookup for a response, parsing its numbered headings once.
+
+    The lookup matches headings by prefix, like the numbered pattern in
+    ``_extract_section``, and falls back to ``_extract_section`` for
+    sections not found under a numbered heading.
+    """
+    sections = _parse_numbered_sections(text)
+
+    def section(section_name: str) -> str:
+        prefix = section_name.upper()
+        for heading, body in sections.items():
+            if heading.startswith(prefix):
+                return body
+        return _extract_section(text, section_name)
+
+    return section
+
+
+def _parse_numbered_sections(text: str) -> dict[str, str]:
+    """Split text at numbered all-caps headings ("2. HEADING") in a single scan.
+
+    Returns:
+        Dict of heading text to the stripped text up to the next heading,
+        in order of appearance. The first occurrence of a heading wins.
+    """
+    sections: dict[str, str] = {}
+    matches = list(_SECTION_HEADING_RE.finditer(text))
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        body = text[m.end() + 1:end] if m.end() < end else ""
+        sections.setdefault(m.group(1), body.strip())
+    return sections
+
+
+@lru_cache(maxsize=64)
+def _section_patterns(section_name: str) -> tuple[re.Pattern, ...]:
+    """Compiled heading patterns for a section, tried in order."""
+    name = re.escape(section_name)
+    flags = re.DOTALL | re.IGNORECASE
+    return (
+        # Numbered section: "1. SECTION NAME"
+        re.compile(rf"\d+\.\s*{name}.*?\n(.*?)(?=\n\d+\.\s+[A-Z]|\Z)", flags),
+        # Markdown heading: "## SECTION NAME"
+        re.compile(rf"#+\s*{name}.*?\n(.*?)(?=\n#+\s+|\Z)", flags),
+        # Bare heading, up to the next all-caps line
+        re.compile(rf"{name}.*?\n(.*?)(?=\n[A-Z]{{2,}}|\Z)", flags),
+    )
+
+
+def _extract_section(text: str, section_name: str) -> str:
+    """Extract a section from the AI response text by heading."""
+    for pattern in _section_patterns(section_name):
+        m = pattern.search(text)
         if m:
             return m.group(1).strip()
 
@@ -299,7 +445,7 @@ def _extract_section(text: str, section_name: str) -> str:
         if newline >= 0:
             remaining = text[newline + 1:]
             # Take until next major heading
-            next_heading = re.search(r"\n\d+\.\s+[A-Z]", remaining)
+            next_heading = _NUMBERED_HEADING_RE.search(remaining)
             if next_heading:
                 return remaining[:next_heading.start()].strip()
             return remaining[:2000].strip()
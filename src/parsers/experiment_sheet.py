@@ -26,6 +26,20 @@ from src.models.data import (
 
 logger = logging.getLogger(__name__)
 
+# MM_DD_YYYY date in a file name
+_DATE_RE = re.compile(r"(\d{2})_(\d{2})_(\d{4})")
+# Channel number in a label like "CH 0"
+_CHANNEL_RE = re.compile(r"CH\s*(\d)")
+# Header metadata keys in (lowercased) col A, matched in one step per row
+_HEADER_KEY_RE = re.compile(
+    r"(?P<purpose>purpose\Z)|(?P<experiments>experiment)|(?P<tester>tester)"
+    r"|(?P<device>device\Z)|(?P<notes>notes)|(?P<resume>resume)"
+)
+# Col A prefixes that end each multi-row header field
+_EXPERIMENTS_END_KEYS = ("tester", "device", "notes", "resume", "fam", "rox")
+_NOTES_END_KEYS = ("resume", "video", "fam", "rox", "device", "tester")
+_RESUME_END_KEYS = ("fam", "rox", "notes")
+
 
 def parse_experiment_csv(filepath: str | Path) -> Experiment:
     """Parse an experiment CSV file into an Experiment model.
@@ -37,31 +51,12 @@ def parse_experiment_csv(filepath: str | Path) -> Experiment:
         Parsed Experiment object.
     """
     filepath = Path(filepath)
+    name = filepath.name
     rows = _read_csv(filepath)
     if not rows:
-        return Experiment(source_file=filepath.name)
-
-    exp = Experiment(source_file=filepath.name)
+        return Experiment(source_file=name)
 
-    # Extract date from filename
-    exp.experiment_date = _extract_date_from_filename(filepath.name)
-
-    # Parse header metadata
-    _parse_header_metadata(rows, exp)
-
-    # Parse channel assignments and Ct summary table
-    ct_table_row = _find_ct_table_start(rows)
-    if ct_table_row is not None:
-        _parse_channel_assignments(rows, ct_table_row, exp)
-        _parse_ct_table(rows, ct_table_row, exp)
-
-    # Parse per-run details (sequence, sample setup, etc.)
-    _parse_run_details(rows, exp)
-
-    # Parse reagents from header area
-    _parse_reagents(rows, exp)
-
-    return exp
+    return parse_experiment_grid(rows, name)
 
 
 def parse_experiment_grid(rows: list[list[str]], source_name: str = "") -> Experiment:
@@ -77,16 +72,28 @@ def parse_experiment_grid(rows: list[list[str]], source_name: str = "") -> Exper
         Parsed Experiment object.
     """
     exp = Experiment(source_file=source_name)
+
+    # Extract date from filename
     exp.experiment_date = _extract_date_from_filename(source_name)
 
-    _parse_header_metadata(rows, exp)
+    # Col A holds the section landmarks; normalize it once for every scan
+    col_a = [_cell(rows, i, 0).lower() for i in range(len(rows))]
 
-    ct_table_row = _find_ct_table_start(rows)
+    # Parse header metadata
+    _parse_header_metadata(rows, col_a, exp)
+
+    # Locate the Ct table and the per-run blocks in one pass over the sheet
+    ct_table_row, run_id_rows = _find_landmarks(rows, col_a)
+
+    # Parse channel assignments and Ct summary table
     if ct_table_row is not None:
         _parse_channel_assignments(rows, ct_table_row, exp)
         _parse_ct_table(rows, ct_table_row, exp)
 
-    _parse_run_details(rows, exp)
+    # Parse per-run details (sequence, sample setup, etc.)
+    _parse_run_details(rows, col_a, run_id_rows, exp)
+
+    # Parse reagents from header area
     _parse_reagents(rows, exp)
 
     return exp
@@ -96,10 +103,8 @@ def _read_csv(filepath: Path) -> list[list[str]]:
     """Read CSV file into a 2D list of strings."""
     rows = []
     try:
-        with open(filepath, "r", encoding="utf-8-sig") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                rows.append(row)
+        with open(filepath, "r", encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
     except Exception as e:
         logger.error(f"Failed to read CSV {filepath}: {e}")
     return rows
@@ -118,7 +123,7 @@ def _cell(rows: list[list[str]], r: int, c: int) -> str:
 def _extract_date_from_filename(filename: str) -> Optional[date]:
     """Extract experiment date from filename patterns like '01_05_2026' or '01_08_2026'."""
     # Match MM_DD_YYYY pattern
-    m = re.search(r"(\d{2})_(\d{2})_(\d{4})", filename)
+    m = _DATE_RE.search(filename)
     if m:
         try:
             return date(int(m.group(3)), int(m.group(1)), int(m.group(2)))
@@ -127,79 +132,88 @@ def _extract_date_from_filename(filename: str) -> Optional[date]:
     return None
 
 
-def _parse_header_metadata(rows: list[list[str]], exp: Experiment) -> None:
-    """Extract Purpose, Experiments, Tester, Device, Notes, Resume from the header area."""
-    for i, row in enumerate(rows):
-        if i > 40:  # header metadata is always in the first ~30 rows
-            break
+def _parse_header_metadata(rows: list[list[str]], col_a: list[str], exp: Experiment) -> None:
+    """Extract Purpose, Experiments, Tester, Device, Notes, Resume from the header area.
+
+    The first row for each key wins; a repeated key further down (e.g. a
+    notes row inside a run block) is ignored. Stops once every field has
+    been seen.
+    """
+    seen: set[str] = set()
+    for i in range(min(len(rows), 41)):  # header metadata is always in the first ~30 rows
+        m = _HEADER_KEY_RE.match(col_a[i])
+        if m is None:
+            continue
 
-        col_a = _cell(rows, i, 0).lower()
+        key = m.lastgroup
+        if key in seen:
+            continue
+        seen.add(key)
 
-        if col_a == "purpose":
+        if key == "purpose":
             exp.purpose = _cell(rows, i, 2)
-        elif col_a.startswith("experiment"):
+        elif key == "experiments":
             # May span multiple rows
-            lines = [_cell(rows, i, 2)]
-            j = i + 1
-            while j < len(rows) and j < i + 6:
-                next_a = _cell(rows, j, 0).lower()
-                if next_a and next_a not in ("", ) and any(
-                    next_a.startswith(k) for k in ["tester", "device", "notes", "resume", "fam", "rox"]
-                ):
-                    break
-                val = _cell(rows, j, 2)
-                if val:
-                    lines.append(val)
-                j += 1
-            exp.experiments_desc = "\n".join(lines)
-        elif col_a.startswith("tester"):
+            exp.experiments_desc = _collect_lines(rows, col_a, i, 6, _EXPERIMENTS_END_KEYS)
+        elif key == "tester":
             exp.tester = _cell(rows, i, 2)
-        elif col_a == "device":
+        elif key == "device":
             exp.device = _cell(rows, i, 2)
-        elif col_a.startswith("notes"):
+        elif key == "notes":
             # Notes may span multiple rows
-            lines = [_cell(rows, i, 2)]
-            j = i + 1
-            while j < len(rows) and j < i + 10:
-                next_a = _cell(rows, j, 0).lower()
-                if next_a and any(
-                    next_a.startswith(k) for k in ["resume", "video", "fam", "rox", "device", "tester"]
-                ):
-                    break
-                val = _cell(rows, j, 2)
-                if val:
-                    lines.append(val)
-                j += 1
-            exp.notes = "\n".join(lines)
-        elif col_a.startswith("resume"):
-            lines = [_cell(rows, i, 2)]
-            j = i + 1
-            while j < len(rows) and j < i + 10:
-                next_a = _cell(rows, j, 0).lower()
-                if next_a and any(
-                    next_a.startswith(k) for k in ["fam", "rox", "notes"]
-                ):
-                    break
-                val = _cell(rows, j, 2)
-                if val:
-                    lines.append(val)
-                j += 1
-            exp.resume = "\n".join(lines)
+            exp.notes = _collect_lines(rows, col_a, i, 10, _NOTES_END_KEYS)
+        elif key == "resume":
+            exp.resume = _collect_lines(rows, col_a, i, 10, _RESUME_END_KEYS)
+
+        if len(seen) == len(_HEADER_KEY_RE.groupindex):
+            break
+
+
+def _collect_lines(
+    rows: list[list[str]],
+    col_a: list[str],
+    start_row: int,
+    max_rows: int,
+    end_keys: tuple[str, ...],
+) -> str:
+    """Join the col C values of a multi-row header field.
+
+    Reads from ``start_row`` for at most ``max_rows`` rows, stopping early at
+    a row whose col A starts with one of ``end_keys``.
+    """
+    lines = [_cell(rows, start_row, 2)]
+    for j in range(start_row + 1, min(len(rows), start_row + max_rows)):
+        if col_a[j].startswith(end_keys):
+            break
+        val = _cell(rows, j, 2)
+        if val:
+            lines.append(val)
+    return "\n".join(lines)
 
 
-def _find_ct_table_start(rows: list[list[str]]) -> Optional[int]:
-    """Find the row where the FAM/ROX Ct summary table starts.
+def _find_landmarks(
+    rows: list[list[str]], col_a: list[str]
+) -> tuple[Optional[int], list[int]]:
+    """Find the Ct summary table and the per-run detail blocks in one scan.
 
-    Looks for a row with 'FAM' in col A and 'TRIAL' or 'RUN ID' nearby.
+    The Ct table starts at the first row with 'FAM' in col A and 'TRIAL' or
+    'RUN ID' elsewhere in the row. Run detail blocks start at rows whose
+    col A begins with 'RUN ID:'.
+
+    Returns:
+        Tuple of (Ct table header row or None, run detail start rows).
     """
+    ct_table_row = None
+    run_id_rows = []
     for i, row in enumerate(rows):
-        col_a = _cell(rows, i, 0).upper()
-        if col_a == "FAM":
+        if col_a[i].startswith("run id:"):
+            run_id_rows.append(i)
+        elif col_a[i] == "fam" and ct_table_row is None:
             # Verify this is the Ct table header by checking for TRIAL/RUN ID
             row_text = " ".join(c.upper() for c in row if c.strip())
             if "TRIAL" in row_text or "RUN ID" in row_text:
-                return i
-    return None
+                ct_table_row = i
+    return ct_table_row, run_id_rows
 
 
 def _parse_channel_assignments(
@@ -247,7 +261,7 @@ def _parse_channel_assignments(
 
 def _extract_channel_num(text: str) -> Optional[int]:
     """Extract channel number from text like 'CH 0', 'CH 1', 'CH 4'."""
-    m = re.search(r"CH\s*(\d)", text)
+    m = _CHANNEL_RE.search(text)
     return int(m.group(1)) if m else None
 
 
@@ -313,6 +327,15 @@ def _parse_ct_value(val: str) -> Optional[float]:
         return None
 
 
+def _row_ct_values(row: list[str], start_col: int) -> CtValues:
+    """Parse the five channel Ct cells of a data row starting at a column."""
+    ch0, ch1, ch2, ch3, ch4 = (
+        _parse_ct_value(row[c]) if c < len(row) else None
+        for c in range(start_col, start_col + 5)
+    )
+    return CtValues(ch0=ch0, ch1=ch1, ch2=ch2, ch3=ch3, ch4=ch4)
+
+
 def _parse_ct_table(rows: list[list[str]], ct_table_row: int, exp: Experiment) -> None:
     """Parse the Ct summary table to extract runs with FAM and ROX Ct values."""
     fam_start, fam_end, rox_start, rox_end = _find_ct_columns(rows, ct_table_row)
@@ -364,21 +387,8 @@ def _parse_ct_table(rows: list[list[str]], ct_table_row: int, exp: Experiment) -
         except ValueError:
             trial_num = 0
 
-        ct_fam = CtValues(
-            ch0=_parse_ct_value(_cell(rows, r, fam_start)),
-            ch1=_parse_ct_value(_cell(rows, r, fam_start + 1)),
-            ch2=_parse_ct_value(_cell(rows, r, fam_start + 2)),
-            ch3=_parse_ct_value(_cell(rows, r, fam_start + 3)),
-            ch4=_parse_ct_value(_cell(rows, r, fam_start + 4)),
-        )
-
-        ct_rox = CtValues(
-            ch0=_parse_ct_value(_cell(rows, r, rox_start)),
-            ch1=_parse_ct_value(_cell(rows, r, rox_start + 1)),
-            ch2=_parse_ct_value(_cell(rows, r, rox_start + 2)),
-            ch3=_parse_ct_value(_cell(rows, r, rox_start + 3)),
-            ch4=_parse_ct_value(_cell(rows, r, rox_start + 4)),
-        )
+        ct_fam = _row_ct_values(rows[r], fam_start)
+        ct_rox = _row_ct_values(rows[r], rox_start)
 
         notes = ""
         if notes_col is not None:
@@ -395,19 +405,31 @@ def _parse_ct_table(rows: list[list[str]], ct_table_row: int, exp: Experiment) -
         r += 1
 
 
-def _parse_run_details(rows: list[list[str]], exp: Experiment) -> None:
-    """Parse per-run detail sections (RUN ID: N blocks) for sample setup and sequence."""
+def _parse_run_details(
+    rows: list[list[str]], col_a: list[str], run_id_rows: list[int], exp: Experiment
+) -> None:
+    """Parse per-run detail sections (RUN ID: N blocks) for sample setup and sequence.
+
+    Args:
+        rows: 2D list of cell values.
+        col_a: Stripped, lowercased col A of each row.
+        run_id_rows: Rows starting a run block, from _find_landmarks.
+        exp: Experiment to attach the details to.
+    """
     run_detail_starts = []
 
-    for i, row in enumerate(rows):
-        col_a = _cell(rows, i, 0).upper()
-        if col_a.startswith("RUN ID:") or col_a == "RUN ID:":
-            # Could be "RUN ID: 1" in col A, or "RUN ID:" in col A with number in col B
-            run_num_str = col_a.replace("RUN ID:", "").strip()
-            if not run_num_str:
-                run_num_str = _cell(rows, i, 1).strip()
-            run_id_value = _cell(rows, i, 2)
-            run_detail_starts.append((i, run_num_str, run_id_value))
+    for i in run_id_rows:
+        # Could be "RUN ID: 1" in col A, or "RUN ID:" in col A with number in col B
+        run_num_str = col_a[i].replace("run id:", "").strip()
+        if not run_num_str:
+            run_num_str = _cell(rows, i, 1).strip()
+        run_id_value = _cell(rows, i, 2)
+        run_detail_starts.append((i, run_num_str, run_id_value))
+
+    # Index the Ct table runs by ID; the first run with an ID wins, as before
+    runs_by_id: dict[str, Run] = {}
+    for run in exp.runs:
+        runs_by_id.setdefault(run.run_id, run)
 
     for idx, (start_row, run_num_str, run_id_value) in enumerate(run_detail_starts):
         # Determine end of this run's section
@@ -417,11 +439,7 @@ def _parse_run_details(rows: list[list[str]], exp: Experiment) -> None:
             end_row = min(start_row + 100, len(rows))
 
         # Find matching run by run_id
-        matching_run = None
-        for run in exp.runs:
-            if run.run_id == run_id_value:
-                matching_run = run
-                break
+        matching_run = runs_by_id.get(run_id_value)
 
         if matching_run is None and run_id_value:
             # Create a stub run if not found in Ct table
@@ -434,23 +452,23 @@ def _parse_run_details(rows: list[list[str]], exp: Experiment) -> None:
 
         # Parse details from this section
         for r in range(start_row + 1, end_row):
-            col_a = _cell(rows, r, 0).lower()
-            if col_a.startswith("sample setup"):
+            label = col_a[r]
+            if label.startswith("sample setup"):
                 if matching_run:
                     matching_run.sample_setup = _cell(rows, r, 2)
-            elif col_a.startswith("batch number"):
+            elif label.startswith("batch number"):
                 if matching_run:
                     matching_run.batch_number = _cell(rows, r, 2)
-            elif "notes" in col_a and not col_a.startswith("run"):
+            elif "notes" in label and not label.startswith("run"):
                 if matching_run and not matching_run.run_notes:
                     matching_run.run_notes = _cell(rows, r, 2)
-            elif col_a.startswith("video"):
+            elif label.startswith("video"):
                 if matching_run:
                     matching_run.video_file = _cell(rows, r, 2)
-            elif col_a.startswith("report"):
+            elif label.startswith("report"):
                 if matching_run:
                     matching_run.report_file = _cell(rows, r, 2)
-            elif col_a.startswith("sequence setup"):
+            elif label.startswith("sequence setup"):
                 if matching_run:
                     matching_run.sequence = _parse_sequence_section(rows, r)
 
@@ -470,11 +488,9 @@ def _parse_sequence_section(rows: list[list[str]], start_row: int) -> SequenceSe
     current_step_name = ""
 
     while r < len(rows) and r < start_row + 15:
-        col_b = _cell(rows, r, 2)  # Step name column
-        col_c = _cell(rows, r, 3)  # Temp column
-        col_d = _cell(rows, r, 4)  # Time column
-        col_e = _cell(rows, r, 5)  # Cycle column
-        col_f = _cell(rows, r, 6)  # Offset column
+        # Step name, Temp, Time, Cycle and Offset columns, padded for short rows
+        cells = [c.strip() for c in rows[r][2:7]]
+        col_b, col_c, col_d, col_e, col_f = cells + [""] * (5 - len(cells))
 
         # Empty row or new section
         if not col_b and not col_c:
@@ -505,39 +521,17 @@ def _parse_reagents(rows: list[list[str]], exp: Experiment) -> None:
     1. Single column (right side): Reagent name, Volume
     2. Per-channel columns: channel 0 ... channel 4, each with reagent lists
     """
-    # Find "Reagents:" landmark in the first 5 rows
-    reagent_col = None
-    reagent_row = None
-
-    for i in range(min(5, len(rows))):
-        for c in range(len(rows[i])):
-            val = rows[i][c].strip().lower()
-            if val.startswith("reagent"):
-                reagent_col = c
-                reagent_row = i
-                break
-        if reagent_row is not None:
-            break
-
-    if reagent_row is None:
-        # Try alternative: look for "Number of samples" or "Master mix"
-        for i in range(min(5, len(rows))):
-            for c in range(len(rows[i])):
-                val = rows[i][c].strip().lower()
-                if "number of samples" in val or "master mix" in val:
-                    reagent_col = c
-                    reagent_row = i
-                    break
-            if reagent_row is not None:
-                break
-
-    if reagent_row is None:
+    anchor = _find_reagent_anchor(rows)
+    if anchor is None:
         return
+    reagent_row, reagent_col = anchor
 
     # Determine if per-channel or single column
     # Per-channel: "channel 0", "channel 1", etc. in the header row
-    header_text = " ".join(c.strip().lower() for c in rows[reagent_row] if c.strip())
-    is_per_channel = "channel 0" in header_text or "channel 1" in header_text
+    is_per_channel = any(
+        "channel 0" in v or "channel 1" in v
+        for v in (c.lower() for c in rows[reagent_row])
+    )
 
     if is_per_channel:
         _parse_per_channel_reagents(rows, reagent_row, reagent_col, exp)
@@ -545,6 +539,23 @@ def _parse_reagents(rows: list[list[str]], exp: Experiment) -> None:
         _parse_single_reagent_list(rows, reagent_row, reagent_col, exp)
 
 
+def _find_reagent_anchor(rows: list[list[str]]) -> Optional[tuple[int, int]]:
+    """Find the (row, col) of the reagent header in the first 5 rows.
+
+    A "Reagents:" cell wins; otherwise the first "Number of samples" or
+    "Master mix" cell is used. Each cell is normalized once for both checks.
+    """
+    fallback = None
+    for i in range(min(5, len(rows))):
+        for c, cell in enumerate(rows[i]):
+            val = cell.strip().lower()
+            if val.startswith("reagent"):
+                return i, c
+            if fallback is None and ("number of samples" in val or "master mix" in val):
+                fallback = (i, c)
+    return fallback
+
+
 def _parse_single_reagent_list(
     rows: list[list[str]], start_row: int, start_col: int, exp: Experiment
 ) -> None:
@@ -661,6 +672,15 @@ def _parse_per_channel_reagents(
             exp.reagent_formulations.append(formulation)
 
 
+def _fmt_ct(v: Optional[float]) -> str:
+    """Format a Ct value for the summary table ("-" when missing)."""
+    if v is None:
+        return "-"
+    if v == 0.0:
+        return "0.00"
+    return f"{v:.2f}"
+
+
 def experiment_to_summary_text(exp: Experiment) -> str:
     """Convert an Experiment to a human-readable text summary for AI analysis."""
     lines = []
@@ -693,20 +713,11 @@ def experiment_to_summary_text(exp: Experiment) -> str:
         for run in exp.runs:
             fam = run.ct_fam
             rox = run.ct_rox
-
-            def fmt(v: Optional[float]) -> str:
-                if v is None:
-                    return "-"
-                if v == 0.0:
-                    return "0.00"
-                return f"{v:.2f}"
-
-            lines.append(
-                f"| {run.trial_num} | {run.run_id} | "
-                f"{fmt(fam.ch0)} | {fmt(fam.ch1)} | {fmt(fam.ch2)} | {fmt(fam.ch3)} | {fmt(fam.ch4)} | "
-                f"{fmt(rox.ch0)} | {fmt(rox.ch1)} | {fmt(rox.ch2)} | {fmt(rox.ch3)} | {fmt(rox.ch4)} | "
-                f"{run.notes} |"
-            )
+            cts = " | ".join(map(_fmt_ct, (
+                fam.ch0, fam.ch1, fam.ch2, fam.ch3, fam.ch4,
+                rox.ch0, rox.ch1, rox.ch2, rox.ch3, rox.ch4,
+            )))
+            lines.append(f"| {run.trial_num} | {run.run_id} | {cts} | {run.notes} |")
 
     # Sequence info (from first run that has it)
     for run in exp.runs:
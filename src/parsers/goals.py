@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import csv
+import io
 import logging
 import re
 from pathlib import Path
@@ -11,6 +12,10 @@ from src.models.data import Goal
 
 logger = logging.getLogger(__name__)
 
+# Line terminators csv.reader recognizes (unlike str.splitlines, which also
+# breaks on \v, \f, \x1c-\x1e, \x85, \u2028 and \u2029)
+_LINE_BREAK_RE = re.compile(r"\r\n|\r|\n")
+
 
 def parse_goals_csv(filepath: str | Path) -> list[Goal]:
     """Parse the goals CSV file into a list of Goal objects.
@@ -31,128 +36,60 @@ def parse_goals_csv(filepath: str | Path) -> list[Goal]:
     if not rows:
         return []
 
-    goals = []
-    i = 0
-
-    while i < len(rows):
-        row = rows[i]
-
-        # Look for goal rows: col B (index 1) has the short name
-        short_name = _cell(row, 1).strip()
-        if not short_name or short_name.lower() in (
-            "high", "low", "", "individual % check:",
-        ):
-            i += 1
-            continue
-
-        # Skip header rows and section headers
-        if short_name.lower().startswith("active goal") or "/" in short_name:
-            i += 1
-            continue
-
-        # This looks like a goal row. Extract requirements from col C (index 3)
-        requirements_lines = [_cell(row, 3)]
-        points_str = _cell(row, 4)
-        sign_off = _cell(row, 5)
-        due_date = _cell(row, 6)
-        goal_type = _cell(row, 7)
-
-        # Requirements may span multiple rows (multiline cell in CSV)
-        j = i + 1
-        while j < len(rows):
-            next_short = _cell(rows[j], 1).strip()
-            # If next row has a new short name or is a known marker, stop
-            if next_short and next_short.lower() not in ("",):
-                break
-            # Check if this row has requirement continuation text in col 3
-            req_text = _cell(rows[j], 3)
-            if req_text:
-                requirements_lines.append(req_text)
-            # Also check if points are in this row (sometimes split across rows)
-            if not points_str:
-                points_str = _cell(rows[j], 4)
-            if not due_date:
-                due_date = _cell(rows[j], 6)
-            j += 1
-
-        requirements = "\n".join(line for line in requirements_lines if line)
-
-        # Parse points
-        try:
-            points = int(points_str) if points_str else 0
-        except ValueError:
-            points = 0
-
-        # Skip non-goal rows (like "Total" or formatting rows)
-        if short_name.lower() in ("total", "stampede / discoplex", "stampede"):
-            i = j
-            continue
-
-        goal = Goal(
-            short_name=short_name,
-            requirements=requirements,
-            points=points,
-            sign_off=sign_off,
-            due_date=due_date,
-            goal_type=goal_type,
-        )
-        goals.append(goal)
-        i = j
-
-    return goals
+    return parse_goals_grid(rows, filepath.name)
 
 
 def parse_goals_grid(rows: list[list[str]], source_name: str = "") -> list[Goal]:
     """Parse goals from a pre-loaded grid of cell values (Google Sheets API)."""
-    # Same logic but operating on pre-loaded grid
-    goals = []
-    i = 0
+    # Strip the columns the parser reads once per row: short name (B),
+    # requirements (D), points (E), sign-off (F), due date (G), type (H)
+    cells = [
+        (_cell(row, 1), _cell(row, 3), _cell(row, 4), _cell(row, 5), _cell(row, 6), _cell(row, 7))
+        for row in rows
+    ]
 
-    while i < len(rows):
-        row = rows[i] if i < len(rows) else []
-        short_name = _cell(row, 1).strip()
+    # Rows with a short name start a goal or header; the rows between two of
+    # them are continuation rows of the first
+    named = [k for k, c in enumerate(cells) if c[0]]
 
-        if not short_name or short_name.lower() in (
-            "high", "low", "individual % check:",
-        ):
-            i += 1
+    goals = []
+    for idx, i in enumerate(named):
+        # Look for goal rows: col B (index 1) has the short name
+        short_name, requirements_text, points_str, sign_off, due_date, goal_type = cells[i]
+        short_lower = short_name.lower()
+        if short_lower in ("high", "low", "individual % check:"):
+            continue
+
+        # Skip header rows and section headers
+        if short_lower.startswith("active goal") or "/" in short_name:
             continue
 
-        if short_name.lower().startswith("active goal") or "/" in short_name:
-            i += 1
+        # Skip non-goal rows (like "Total" or formatting rows) along with
+        # their continuation rows, without reading them
+        if short_lower in ("total", "stampede / discoplex", "stampede"):
             continue
 
-        requirements_lines = [_cell(row, 3)]
-        points_str = _cell(row, 4)
-        sign_off = _cell(row, 5)
-        due_date = _cell(row, 6)
-        goal_type = _cell(row, 7)
-
-        j = i + 1
-        while j < len(rows):
-            next_short = _cell(rows[j], 1).strip()
-            if next_short:
-                break
-            req_text = _cell(rows[j], 3)
+        # This looks like a goal row. Requirements may span multiple rows
+        # (multiline cell in CSV), up to the next row with a short name
+        j = named[idx + 1] if idx + 1 < len(named) else len(cells)
+        requirements_lines = [requirements_text]
+        for _, req_text, next_points, _, next_due, _ in cells[i + 1:j]:
             if req_text:
                 requirements_lines.append(req_text)
+            # Also check if points are in this row (sometimes split across rows)
             if not points_str:
-                points_str = _cell(rows[j], 4)
+                points_str = next_points
             if not due_date:
-                due_date = _cell(rows[j], 6)
-            j += 1
+                due_date = next_due
 
         requirements = "\n".join(line for line in requirements_lines if line)
 
+        # Parse points
         try:
             points = int(points_str) if points_str else 0
         except ValueError:
             points = 0
 
-        if short_name.lower() in ("total", "stampede / discoplex", "stampede"):
-            i = j
-            continue
-
         goals.append(Goal(
             short_name=short_name,
             requirements=requirements,
@@ -161,34 +98,40 @@ def parse_goals_grid(rows: list[list[str]], source_name: str = "") -> list[Goal]
             due_date=due_date,
             goal_type=goal_type,
         ))
-        i = j
 
     return goals
 
 
 def goals_to_summary_text(goals: list[Goal]) -> str:
     """Convert goals to a text summary for AI analysis."""
-    lines = ["## Team Goals\n"]
+    # One fragment per goal, each starting with the blank line that
+    # separates it from the previous block
+    parts = ["## Team Goals\n"]
     for g in goals:
-        lines.append(f"### {g.short_name} ({g.points} pts)")
-        lines.append(f"**Due**: {g.due_date}")
-        lines.append(f"**Requirements**: {g.requirements}")
-        if g.notes:
-            lines.append(f"**Notes**: {g.notes}")
-        lines.append("")
-    return "\n".join(lines)
+        notes = f"\n**Notes**: {g.notes}" if g.notes else ""
+        parts.append(
+            f"\n### {g.short_name} ({g.points} pts)"
+            f"\n**Due**: {g.due_date}"
+            f"\n**Requirements**: {g.requirements}{notes}\n"
+        )
+    return "".join(parts)
 
 
 def _read_csv(filepath: Path) -> list[list[str]]:
-    rows = []
     try:
-        with open(filepath, "r", encoding="utf-8-sig") as f:
-            reader = csv.reader(f)
-            for row in reader:
-                rows.append(row)
+        raw = filepath.read_bytes().decode("utf-8-sig")
+        # Without quotes there are no embedded commas or line breaks, so
+        # splitting on the csv module's line terminators and on commas
+        # gives the same cells as the tokenizer
+        if '"' not in raw:
+            lines = _LINE_BREAK_RE.split(raw)
+            if not lines[-1]:
+                lines.pop()  # nothing after the final line break
+            return [line.split(",") for line in lines]
+        return list(csv.reader(io.StringIO(raw, newline="")))
     except Exception as e:
         logger.error(f"Failed to read goals CSV {filepath}: {e}")
-    return rows
+        return []
 
 
 def _cell(row: list[str], idx: int) -> str:
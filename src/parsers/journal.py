@@ -5,7 +5,8 @@ Handles multiple date formats and splits content by date boundaries.
 
 import logging
 import re
-from datetime import date, datetime
+from datetime import date
+from itertools import groupby
 from pathlib import Path
 from typing import Optional
 
@@ -13,20 +14,36 @@ from src.models.data import JournalEntry
 
 logger = logging.getLogger(__name__)
 
-# Date patterns to detect entry boundaries
-DATE_PATTERNS = [
-    # MM/DD/YYYY
-    (re.compile(r"^(\d{1,2}/\d{1,2}/\d{4})\s*$"), "%m/%d/%Y"),
-    # YYYY-MM-DD
-    (re.compile(r"^(\d{4}-\d{2}-\d{2})\s*$"), "%Y-%m-%d"),
+# Date formats that mark entry boundaries, one named group per format.
+# [^\S\n] is whitespace that stays on the line.
+_DATE_ALTERNATIVES = (
+    r"(?P<mdy>\d{1,2}/\d{1,2}/\d{4})"  # MM/DD/YYYY
+    r"|(?P<ymd>\d{4}-\d{2}-\d{2})"  # YYYY-MM-DD
     # Month DD, YYYY
-    (re.compile(r"^((?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4})\s*$", re.IGNORECASE), "%B %d, %Y"),
-    # MM-DD-YYYY
-    (re.compile(r"^(\d{1,2}-\d{1,2}-\d{4})\s*$"), "%m-%d-%Y"),
-]
+    r"|(?P<month_name>(?:January|February|March|April|May|June|July|August|September|October|November|December)"
+    r"[^\S\n]+\d{1,2},?[^\S\n]+\d{4})"
+    r"|(?P<mdy_dash>\d{1,2}-\d{1,2}-\d{4})"  # MM-DD-YYYY
+)
+# Month number by lowercase name, for the month_name format
+_MONTHS = {
+    name: i for i, name in enumerate(
+        ["january", "february", "march", "april", "may", "june", "july",
+         "august", "september", "october", "november", "december"],
+        start=1,
+    )
+}
+# A whole (stripped) line that is a date
+_DATE_RE = re.compile(rf"(?:{_DATE_ALTERNATIVES})\s*$", re.IGNORECASE)
+# Any date line in a text, found in one pass over the whole text
+_DATE_LINE_RE = re.compile(
+    rf"^[^\S\n]*(?:{_DATE_ALTERNATIVES})[^\S\n]*$", re.IGNORECASE | re.MULTILINE
+)
 
 # Image/comment placeholder pattern to strip
 PLACEHOLDER_PATTERN = re.compile(r"\[([a-z])\]")
+# A newline run with placeholders in it, or 3+ newlines: stripping the
+# placeholders and collapsing blank lines in one pass
+_CLEAN_RE = re.compile(r"\n*(?:\[[a-z]\]\n*)+|\n{3,}")
 
 
 def parse_journal_txt(filepath: str | Path) -> list[JournalEntry]:
@@ -61,7 +78,9 @@ def parse_journal_docx(filepath: str | Path) -> list[JournalEntry]:
     try:
         import docx
         doc = docx.Document(str(filepath))
-        text = "\n".join(para.text for para in doc.paragraphs)
+        # doc.paragraphs rebuilds its proxy list on every access; read it once
+        # and join a list rather than a generator
+        text = "\n".join([para.text for para in doc.paragraphs])
     except ImportError:
         logger.warning("python-docx not installed, skipping .docx file")
         return []
@@ -86,37 +105,49 @@ def parse_journal_text(text: str, source_name: str = "") -> list[JournalEntry]:
 
 
 def _parse_journal_text(text: str, source_name: str) -> list[JournalEntry]:
-    """Core parsing logic for journal text content."""
-    lines = text.split("\n")
+    """Core parsing logic for journal text content.
+
+    Date lines are located with one multiline regex pass over the whole
+    text; only the lines inside each dated block are walked in Python.
+    Text before the first date belongs to no entry and is skipped.
+    """
+    # Candidate date lines that also parse to a real date
+    boundaries = []
+    for m in _DATE_LINE_RE.finditer(text):
+        parsed_date = _match_to_date(m)
+        if parsed_date is not None:
+            boundaries.append((m, parsed_date, m.group(0).strip()))
+
+    entries = []
+    for k, (m, parsed_date, date_str) in enumerate(boundaries):
+        if k + 1 < len(boundaries):
+            # Lines between this date line and the next one
+            lines = text[m.end() + 1:boundaries[k + 1][0].start()].split("\n")[:-1]
+        elif m.end() < len(text):
+            lines = text[m.end() + 1:].split("\n")
+        else:
+            lines = []
+        entries.extend(_parse_dated_block(parsed_date, date_str, lines, source_name))
+
+    return entries
+
+
+def _parse_dated_block(
+    entry_date: date, date_str: str, lines: list[str], source_name: str
+) -> list[JournalEntry]:
+    """Split the lines under one date line into author entries."""
     entries = []
-    current_date: Optional[date] = None
-    current_date_str = ""
     current_author = ""
     current_content_lines: list[str] = []
+    # Bound method for the hot append; rebound whenever the list is replaced
+    append_line = current_content_lines.append
     collecting_content = False
 
     for line_raw in lines:
         line = line_raw.rstrip()
 
-        # Check if this line is a date boundary
-        parsed_date = _try_parse_date(line.strip())
-        if parsed_date is not None:
-            # Save previous entry if we have content
-            if current_date is not None and (current_content_lines or current_author):
-                entries.append(_build_entry(
-                    current_date, current_date_str, current_author,
-                    current_content_lines, source_name
-                ))
-
-            current_date = parsed_date
-            current_date_str = line.strip()
-            current_author = ""
-            current_content_lines = []
-            collecting_content = False
-            continue
-
         # If we have a date but no author yet, the next non-empty line is the author
-        if current_date is not None and not current_author and not collecting_content:
+        if not current_author and not collecting_content:
             stripped = line.strip()
             if stripped:
                 # Check if this looks like an author name (short, no special chars)
@@ -128,45 +159,44 @@ def _parse_journal_text(text: str, source_name: str) -> list[JournalEntry]:
                     # Content starts immediately (no separate author line)
                     current_author = ""
                     collecting_content = True
-                    current_content_lines.append(line)
+                    append_line(line)
             continue
 
         # Check if this is a new author within the same date
         # (some journals have multiple authors per date, separated by just a name on its own line)
-        if current_date is not None and collecting_content:
+        if collecting_content:
             stripped = line.strip()
+            # Cheapest tests first: most content lines fail on the blank-line
+            # or single-word checks before the per-character digit scan
             if (
-                stripped
-                and len(stripped) < 30
-                and not stripped.startswith("*")
-                and not stripped.startswith("-")
-                and not stripped.startswith("#")
-                and not any(c.isdigit() for c in stripped)
-                and stripped.istitle()
-                and " " not in stripped.strip()  # single word, capitalized
-                and len(current_content_lines) > 0
+                current_content_lines
                 and not current_content_lines[-1].strip()  # preceded by blank line
+                and 0 < len(stripped) < 30
+                and " " not in stripped  # single word, capitalized
+                and stripped.istitle()
+                and not stripped.startswith(("*", "-", "#"))
+                and not any(c.isdigit() for c in stripped)
             ):
                 # This might be a new author block under the same date
                 # Save current entry and start new one
                 if current_content_lines:
                     entries.append(_build_entry(
-                        current_date, current_date_str, current_author,
+                        entry_date, date_str, current_author,
                         current_content_lines, source_name
                     ))
                 current_author = stripped
                 current_content_lines = []
+                append_line = current_content_lines.append
                 continue
 
         # Regular content line
-        if current_date is not None:
-            collecting_content = True
-            current_content_lines.append(line)
+        collecting_content = True
+        append_line(line)
 
     # Don't forget the last entry
-    if current_date is not None and (current_content_lines or current_author):
+    if current_content_lines or current_author:
         entries.append(_build_entry(
-            current_date, current_date_str, current_author,
+            entry_date, date_str, current_author,
             current_content_lines, source_name
         ))
 
@@ -175,20 +205,34 @@ def _parse_journal_text(text: str, source_name: str) -> list[JournalEntry]:
 
 def _try_parse_date(text: str) -> Optional[date]:
     """Try to parse a line as a date using all known patterns."""
-    for pattern, fmt in DATE_PATTERNS:
-        m = pattern.match(text)
-        if m:
-            date_str = m.group(1)
-            # Handle comma-optional format
-            date_str = date_str.replace(",", "")
-            try:
-                return datetime.strptime(date_str, fmt.replace(",", "")).date()
-            except ValueError:
-                try:
-                    return datetime.strptime(date_str, fmt).date()
-                except ValueError:
-                    continue
-    return None
+    m = _DATE_RE.match(text)
+    return _match_to_date(m) if m else None
+
+
+def _match_to_date(m: re.Match) -> Optional[date]:
+    """Parse the date captured by a _DATE_RE or _DATE_LINE_RE match.
+
+    Returns:
+        The date, or None if the text only looks like one (e.g. 13/45/2024).
+    """
+    # The regex has already checked the shape, so the fields can be split
+    # out directly instead of going through strptime's format parser
+    fmt_name = m.lastgroup
+    date_str = m.group(fmt_name)
+    if fmt_name == "month_name":
+        # Handle comma-optional format
+        month_name, day, year = date_str.replace(",", "").split()
+        month = _MONTHS[month_name.lower()]
+    elif fmt_name == "ymd":
+        year, month, day = date_str.split("-")
+    elif fmt_name == "mdy":
+        month, day, year = date_str.split("/")
+    else:
+        month, day, year = date_str.split("-")
+    try:
+        return date(int(year), int(month), int(day))
+    except ValueError:
+        return None
 
 
 def _build_entry(
@@ -201,9 +245,9 @@ def _build_entry(
     """Build a JournalEntry from accumulated data."""
     # Clean content: strip image placeholders and excessive whitespace
     content = "\n".join(content_lines)
-    content = PLACEHOLDER_PATTERN.sub("", content)
-    # Collapse multiple blank lines
-    content = re.sub(r"\n{3,}", "\n\n", content)
+    # Most entries have neither, so skip the regex with two substring scans
+    if "[" in content or "\n\n\n" in content:
+        content = _CLEAN_RE.sub(_clean_run, content)
     content = content.strip()
 
     return JournalEntry(
@@ -215,6 +259,12 @@ def _build_entry(
     )
 
 
+def _clean_run(m: re.Match) -> str:
+    """Replace a _CLEAN_RE match with its newlines, collapsed to at most two."""
+    newlines = m.group(0).count("\n")
+    return "\n\n" if newlines >= 3 else "\n" * newlines
+
+
 def filter_entries_by_date_range(
     entries: list[JournalEntry],
     start_date: date,
@@ -232,19 +282,35 @@ def entries_to_summary_text(entries: list[JournalEntry]) -> str:
     if not entries:
         return "No journal entries for this period."
 
-    lines = ["## Journal Entries\n"]
-    # Group by date
-    by_date: dict[str, list[JournalEntry]] = {}
-    for e in sorted(entries, key=lambda x: x.entry_date or date.min, reverse=True):
-        key = e.date_str or str(e.entry_date)
-        by_date.setdefault(key, []).append(e)
-
-    for date_key, date_entries in by_date.items():
-        lines.append(f"### {date_key}")
-        for e in date_entries:
-            if e.author:
-                lines.append(f"**{e.author}**")
-            lines.append(e.content)
-            lines.append("")
-
-    return "\n".join(lines)
+    parts = ["## Journal Entries\n"]
+    # Group by date. The sort is stable, so groupby streams each date's
+    # entries in input order; a date spelled differently across journals
+    # gets one heading per spelling, in order of first appearance
+    ordered = sorted(entries, key=_entry_date_key, reverse=True)
+
+    for _, day_entries in groupby(ordered, key=_entry_date_key):
+        by_heading: dict[str, list[JournalEntry]] = {}
+        for e in day_entries:
+            by_heading.setdefault(_date_heading(e), []).append(e)
+
+        for date_key, date_entries in by_heading.items():
+            # Each fragment starts with its own line break, so the blank line
+            # after an entry's content separates it from the next block
+            parts.append(f"\n### {date_key}")
+            for e in date_entries:
+                if e.author:
+                    parts.append(f"\n**{e.author}**\n{e.content}\n")
+                else:
+                    parts.append(f"\n{e.content}\n")
+
+    return "".join(parts)
+
+
+def _entry_date_key(entry: JournalEntry) -> date:
+    """Sort key for an entry's date; undated entries sort last."""
+    return entry.entry_date or date.min
+
+
+def _date_heading(entry: JournalEntry) -> str:
+    """Heading an entry is grouped under in the summary text."""
+    return entry.date_str or str(entry.entry_date)
@@ -0,0 +1,213 @@
+"""Tests for the on-disk caches: Claude responses, Drive listings, parsed files."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import orjson
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis.llm_cache import MAX_TEMPLATE_ENTRIES, LLMCache
+from src.bootstrap.parsed_cache import ParsedCache
+from src.config import PARSED_CACHE_VERSION
+from src.drive.cache import DriveCache
+
+
+def test_llm_cache_round_trip():
+    """Responses are returned for the same key and missing for any other."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMCache(Path(tmp))
+        key = LLMCache.make_key("model", "system", "user", 0.0, 100)
+        assert cache.get(key) is None
+        cache.set(key, "response text")
+        assert cache.get(key) == "response text"
+        assert LLMCache.make_key("model", "system", "user", 0.0, 100) == key
+        assert LLMCache.make_key("model", "system", "user", 0.0, 200) != key
+        assert LLMCache.make_key("model", "system", "other", 0.0, 100) != key
+    print("  PASS: LLMCache round trip")
+
+
+def test_llm_cache_expiry_and_corrupt_entries():
+    """Expired and unreadable entries are treated as misses."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMCache(Path(tmp), ttl_seconds=60)
+        key = LLMCache.make_key("model", "system", "user", 0.0, 100)
+        cache.set(key, "fresh")
+        assert cache.get(key) == "fresh"
+
+        path = cache._path(key)
+        path.write_bytes(orjson.dumps({"created_at": time.time() - 120, "response": "stale"}))
+        assert cache.get(key) is None
+
+        path.write_bytes(b"{not json")
+        assert cache.get(key) is None
+    print("  PASS: LLMCache expiry and corrupt entries")
+
+
+def test_llm_cache_accepts():
+    """Only enabled caches at or below the temperature limit accept a call."""
+    assert LLMCache(Path("unused")).accepts(0.0)
+    assert not LLMCache(Path("unused")).accepts(0.3)
+    assert LLMCache(Path("unused"), max_temperature=0.3).accepts(0.3)
+    assert not LLMCache(Path("unused"), enabled=False).accepts(0.0)
+    print("  PASS: LLMCache temperature gate")
+
+
+def test_llm_cache_find_similar():
+    """Near-duplicate inputs on a template find the previous response."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = LLMCache(Path(tmp))
+        old_text = "\n".join(f"row {i}" for i in range(100))
+        cache.set("k1", "old response")
+        cache.remember("tmpl", old_text, "k1")
+
+        near = old_text.replace("row 50", "row 50 corrected")
+        assert cache.find_similar("tmpl", near, 0.95) == (old_text, "old response")
+        assert cache.find_similar("tmpl", "something else entirely", 0.95) is None
+        assert cache.find_similar("other-template", near, 0.95) is None
+
+        for i in range(MAX_TEMPLATE_ENTRIES + 2):
+            cache.remember("tmpl", f"text {i}", f"key{i}")
+        assert len(cache._load_template_entries("tmpl")) == MAX_TEMPLATE_ENTRIES
+    print("  PASS: LLMCache near-duplicate lookup")
+
+
+def test_drive_cache_listings():
+    """Listings are stored per key, expire, and can be dropped per folder."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "drive.sqlite3"
+        files = [{"id": "a", "name": "Sheet A"}]
+
+        cache = DriveCache(path)
+        assert cache.get("folder1:q") is None
+        cache.set("folder1:q", "folder1", files)
+        cache.set("folder2:q", "folder2", files)
+        assert cache.get("folder1:q") == files
+
+        cache.invalidate("folder1")
+        assert cache.get("folder1:q") is None
+        assert cache.get("folder2:q") == files
+
+        expired = DriveCache(path, ttl_seconds=-1)
+        assert expired.get("folder2:q") is None
+        assert expired.prune() == 1
+        assert cache.get("folder2:q") is None
+
+        disabled = DriveCache(path, enabled=False)
+        disabled.set("folder3:q", "folder3", files)
+        assert cache.get("folder3:q") is None
+
+        broken = DriveCache(Path(tmp))  # a directory, so SQLite cannot open it
+        broken.set("folder1:q", "folder1", files)
+        assert broken.get("folder1:q") is None
+        broken.invalidate("folder1")
+        assert broken.prune() == 0
+    print("  PASS: DriveCache listings")
+
+
+def test_drive_cache_recent_files():
+    """Recent files follow a full reset and then incremental changes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DriveCache(Path(tmp) / "drive.sqlite3")
+        assert cache.sync_state("") is None
+
+        sheet = "application/vnd.google-apps.spreadsheet"
+        doc = "application/vnd.google-apps.document"
+        cache.reset_recent_files(
+            "",
+            [
+                {"id": "a", "mimeType": sheet, "modifiedTime": "2026-01-02T00:00:00Z"},
+                {"id": "b", "mimeType": doc, "modifiedTime": "2026-01-03T00:00:00Z"},
+            ],
+            page_token="t1",
+            covered_since="2026-01-01T00:00:00Z",
+        )
+        assert cache.sync_state("") == ("t1", "2026-01-01T00:00:00Z")
+
+        cache.apply_changes(
+            "",
+            [{"id": "c", "mimeType": sheet, "modifiedTime": "2026-01-04T00:00:00Z"}],
+            removed_ids=["b"],
+            page_token="t2",
+        )
+        assert cache.sync_state("").page_token == "t2"
+
+        recent = cache.recent_files("", "2026-01-01T00:00:00Z")
+        assert [f["id"] for f in recent] == ["c", "a"]  # newest first
+        assert [f["id"] for f in cache.recent_files("", "2026-01-03T00:00:00Z")] == ["c"]
+        assert cache.recent_files("", "2026-01-01T00:00:00Z", mime_type=doc) == []
+        assert cache.recent_files("drive2", "2026-01-01T00:00:00Z") == []
+    print("  PASS: DriveCache recent files")
+
+
+def test_parsed_cache_hits_and_invalidation():
+    """Parser output is reused until the file changes in Drive."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParsedCache(Path(tmp))
+        calls = []
+
+        def parse(text):
+            def run():
+                calls.append(text)
+                return text
+            return run
+
+        v1 = {"id": "abc", "modifiedTime": "2026-01-01T00:00:00.000Z"}
+        v2 = {"id": "abc", "modifiedTime": "2026-02-01T00:00:00.000Z"}
+        other = {"id": "abcd", "modifiedTime": "2026-01-01T00:00:00.000Z"}
+
+        assert cache.get_or_parse("docs", v1, parse("first")) == "first"
+        assert cache.get_or_parse("docs", v1, parse("unused")) == "first"
+        assert cache.get_or_parse("docs", other, parse("other")) == "other"
+        assert cache.get_or_parse("docs", v2, parse("second")) == "second"
+        assert calls == ["first", "other", "second"]
+
+        # The older version of abc is gone; abcd, which shares its prefix, is not
+        names = sorted(p.name for p in (Path(tmp) / "docs").iterdir())
+        assert names == [
+            f"abc.2026-02-01T000000000Z.v{PARSED_CACHE_VERSION}.txt",
+            f"abcd.2026-01-01T000000000Z.v{PARSED_CACHE_VERSION}.txt",
+        ]
+    print("  PASS: ParsedCache hits and invalidation")
+
+
+def test_parsed_cache_bypass():
+    """Disabled caches, unversioned files and failed parses store nothing."""
+    with tempfile.TemporaryDirectory() as tmp:
+        file = {"id": "abc", "modifiedTime": "2026-01-01T00:00:00.000Z"}
+
+        disabled = ParsedCache(Path(tmp), enabled=False)
+        assert disabled.get_or_parse("docs", file, lambda: "x") == "x"
+        assert not (Path(tmp) / "docs").exists()
+
+        cache = ParsedCache(Path(tmp))
+        assert cache.get_or_parse("docs", {"id": "abc"}, lambda: "no time") == "no time"
+        assert not (Path(tmp) / "docs").exists()
+
+        def fail():
+            raise ValueError("bad sheet")
+
+        try:
+            cache.get_or_parse("docs", file, fail)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("parse error was swallowed")
+        assert cache.get_or_parse("docs", file, lambda: "retry") == "retry"
+    print("  PASS: ParsedCache bypass cases")
+
+
+if __name__ == "__main__":
+    print("Running cache tests...\n")
+    test_llm_cache_round_trip()
+    test_llm_cache_expiry_and_corrupt_entries()
+    test_llm_cache_accepts()
+    test_llm_cache_find_similar()
+    test_drive_cache_listings()
+    test_drive_cache_recent_files()
+    test_parsed_cache_hits_and_invalidation()
+    test_parsed_cache_bypass()
+    print("\nAll tests passed!")
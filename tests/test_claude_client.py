@@ -0,0 +1,213 @@
+"""Tests for ClaudeClient retries, streaming and batches, run against a fake Anthropic SDK."""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import anthropic
+import httpx
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis.claude_client import MAX_RETRY_WAIT, ClaudeClient, _retry_wait
+from src.analysis.llm_cache import LLMCache
+
+_REQUEST = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+
+
+def _rate_limited(headers: dict) -> anthropic.RateLimitError:
+    response = httpx.Response(429, headers=headers, request=_REQUEST)
+    return anthropic.RateLimitError("rate limited", response=response, body=None)
+
+
+def _status_error(status: int) -> anthropic.APIStatusError:
+    response = httpx.Response(status, request=_REQUEST)
+    return anthropic.APIStatusError(f"status {status}", response=response, body=None)
+
+
+def _message(text: str) -> SimpleNamespace:
+    return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+
+class _FakeStream:
+    def __init__(self, chunks: list, error: Exception = None):
+        self._chunks = chunks
+        self._error = error
+
+    async def __aenter__(self):
+        if self._error is not None and not self._chunks:
+            raise self._error
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self._chunks:
+            yield chunk
+        if self._error is not None:
+            raise self._error
+
+
+class _FakeMessages:
+    """Replays scripted outcomes for messages.create and messages.stream."""
+
+    def __init__(self, outcomes: list):
+        self._outcomes = list(outcomes)
+        self.calls = []
+
+    async def create(self, **params):
+        self.calls.append(params)
+        outcome = self._outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _message(outcome)
+
+    def stream(self, **params):
+        self.calls.append(params)
+        return self._outcomes.pop(0)
+
+
+def _client(messages) -> ClaudeClient:
+    """Build a ClaudeClient that talks to a fake SDK instead of the API."""
+    client = ClaudeClient(api_key="test", cache=LLMCache(enabled=False))
+    client._client = SimpleNamespace(messages=messages)
+    return client
+
+
+def _run_recording_sleeps(coro):
+    """Run a coroutine, recording asyncio.sleep calls instead of waiting."""
+    sleep = mock.AsyncMock()
+    with mock.patch("asyncio.sleep", sleep):
+        result = asyncio.run(coro)
+    return result, [call.args[0] for call in sleep.await_args_list]
+
+
+def test_retry_wait_honors_server_hint():
+    """Waits are at least the server's hint and never above the cap."""
+    assert _retry_wait(0, _rate_limited({"retry-after": "7"})) == 7.0
+    assert _retry_wait(0, _rate_limited({"retry-after": "600"})) == MAX_RETRY_WAIT
+
+    reset_at = datetime.now(timezone.utc) + timedelta(seconds=20)
+    wait = _retry_wait(0, _rate_limited({"anthropic-ratelimit-tokens-reset": reset_at.isoformat()}))
+    assert 18 < wait <= 20
+
+    for attempt in range(3):
+        wait = _retry_wait(attempt, _rate_limited({}))
+        assert 2 ** attempt <= wait <= 3 * 2 ** attempt
+    print("  PASS: Retry wait honors server hints")
+
+
+def test_send_message_retries_rate_limits():
+    """A 429 is retried after the Retry-After wait; a 400 is raised at once."""
+    messages = _FakeMessages([_rate_limited({"retry-after": "7"}), "hello"])
+    text, sleeps = _run_recording_sleeps(_client(messages).send_message("hi"))
+    assert text == "hello"
+    assert sleeps == [7.0]
+    assert len(messages.calls) == 2
+
+    messages = _FakeMessages([_status_error(400), "unused"])
+    try:
+        _run_recording_sleeps(_client(messages).send_message("hi"))
+    except anthropic.APIStatusError as e:
+        assert e.status_code == 400
+    else:
+        raise AssertionError("client error was retried")
+    assert len(messages.calls) == 1
+    print("  PASS: send_message retries rate limits only")
+
+
+def test_stream_retries_until_first_chunk():
+    """Streams are retried before any text arrives, but not after."""
+
+    async def collect(client):
+        return [chunk async for chunk in client.send_message_stream("hi")]
+
+    messages = _FakeMessages([
+        _FakeStream([], error=_status_error(529)),
+        _FakeStream(["Hel", "lo"]),
+    ])
+    chunks, sleeps = _run_recording_sleeps(collect(_client(messages)))
+    assert chunks == ["Hel", "lo"]
+    assert len(sleeps) == 1
+
+    messages = _FakeMessages([
+        _FakeStream(["Hel"], error=_status_error(529)),
+        _FakeStream(["unused"]),
+    ])
+    try:
+        _run_recording_sleeps(collect(_client(messages)))
+    except anthropic.APIStatusError as e:
+        assert e.status_code == 529
+    else:
+        raise AssertionError("stream was retried after text arrived")
+    assert len(messages.calls) == 1
+    print("  PASS: Streams retry only before the first chunk")
+
+
+class _FakeBatches:
+    def __init__(self, statuses: list, entries: list):
+        self._statuses = list(statuses)
+        self._entries = entries
+        self.submitted = None
+
+    async def create(self, requests):
+        self.submitted = requests
+        return SimpleNamespace(id="batch-1")
+
+    async def retrieve(self, batch_id):
+        return SimpleNamespace(processing_status=self._statuses.pop(0))
+
+    async def results(self, batch_id):
+        async def entries():
+            for entry in self._entries:
+                yield entry
+        return entries()
+
+
+def test_submit_and_poll_batch():
+    """Batch jobs are sent as Messages API params and their results collected by ID."""
+    batches = _FakeBatches(
+        ["in_progress", "ended"],
+        [
+            SimpleNamespace(
+                custom_id="week-0",
+                result=SimpleNamespace(type="succeeded", message=_message("analysis 0")),
+            ),
+            SimpleNamespace(custom_id="week-1", result=SimpleNamespace(type="errored")),
+        ],
+    )
+    client = _client(SimpleNamespace(batches=batches))
+
+    async def run():
+        batch_id = await client.submit_batch([
+            {"custom_id": "week-0", "user_prompt": "week 0", "cached_prefix": "prefix"},
+            {"custom_id": "week-1", "user_prompt": "week 1", "max_tokens": 100},
+        ])
+        return batch_id, await client.poll_batch(batch_id, poll_interval=5)
+
+    (batch_id, results), sleeps = _run_recording_sleeps(run())
+    assert batch_id == "batch-1"
+    assert results == {"week-0": "analysis 0", "week-1": None}
+    assert sleeps == [5]
+
+    first, second = batches.submitted
+    assert first["custom_id"] == "week-0"
+    assert [block["text"] for block in first["params"]["messages"][0]["content"]] == ["prefix", "week 0"]
+    assert second["params"]["max_tokens"] == 100
+    assert second["params"]["messages"][0]["content"] == "week 1"
+    print("  PASS: Batch submit and poll")
+
+
+if __name__ == "__main__":
+    print("Running Claude client tests...\n")
+    test_retry_wait_honors_server_hint()
+    test_send_message_retries_rate_limits()
+    test_stream_retries_until_first_chunk()
+    test_submit_and_poll_batch()
+    print("\nAll tests passed!")
@@ -0,0 +1,120 @@
+"""Tests for DriveClient's recent-files sync and sharing, run against mocked Drive responses."""
+
+import sys
+import tempfile
+import threading
+from http import HTTPStatus
+from pathlib import Path
+
+import orjson
+from googleapiclient.discovery import build
+from googleapiclient.http import HttpMockSequence
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.drive.cache import DriveCache
+from src.drive.client import MIME_SPREADSHEET, DriveClient
+
+
+def _client(responses: list, cache: DriveCache) -> DriveClient:
+    """Build a DriveClient whose Drive service replays the given responses.
+
+    Each response is a JSON body, or a (headers, body) pair sent as is.
+    """
+    client = DriveClient.__new__(DriveClient)
+    http = HttpMockSequence([
+        r if isinstance(r, tuple) else ({"status": "200"}, orjson.dumps(r).decode())
+        for r in responses
+    ])
+    client._drive_service = build("drive", "v3", http=http, static_discovery=True)
+    client._local = threading.local()
+    client._shared_drive_ids = {"folder": None}
+    client._cache = cache
+    return client
+
+
+def test_sync_changes_skips_drive_changes():
+    """Shared Drive changes are skipped; removed and trashed files leave the index."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DriveCache(Path(tmp) / "drive.sqlite3")
+        old = {"id": "a", "mimeType": MIME_SPREADSHEET, "modifiedTime": "2026-01-02T00:00:00Z"}
+        gone = {"id": "b", "mimeType": MIME_SPREADSHEET, "modifiedTime": "2026-01-02T00:00:00Z"}
+        cache.reset_recent_files("", [old, gone], "t1", "2026-01-01T00:00:00Z")
+
+        new = {"id": "c", "mimeType": MIME_SPREADSHEET, "modifiedTime": "2026-01-03T00:00:00Z"}
+        client = _client(
+            [
+                {
+                    "nextPageToken": "t2",
+                    "changes": [
+                        {"changeType": "drive", "driveId": "shared", "removed": False},
+                        {"changeType": "file", "fileId": "b", "removed": True},
+                    ],
+                },
+                {
+                    "newStartPageToken": "t3",
+                    "changes": [
+                        {"changeType": "file", "fileId": "c", "file": {**new, "trashed": False}},
+                        {"changeType": "file", "fileId": "a", "file": {**old, "trashed": True}},
+                    ],
+                },
+            ],
+            cache,
+        )
+        client._sync_changes("", "t1", None)
+
+        assert cache.recent_files("", "2026-01-01T00:00:00Z") == [new]
+        assert cache.sync_state("").page_token == "t3"
+    print("  PASS: Change sync skips Shared Drive changes")
+
+
+def test_recent_files_fall_back_when_cache_fails():
+    """An unusable cache database falls back to a direct modifiedTime query."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = DriveCache(Path(tmp))  # a directory, so SQLite cannot open it
+        files = [{"id": "a", "name": "Sheet A", "mimeType": MIME_SPREADSHEET}]
+        client = _client([{"files": files}], cache)
+        assert client.list_recent_files("folder", days=7, mime_type=MIME_SPREADSHEET) == files
+    print("  PASS: Recent files fall back to a Drive query")
+
+
+def _batch_response(parts: list[tuple[str, int, dict]]) -> tuple[dict, str]:
+    """Build a multipart batch response from (request ID, status, body) parts."""
+    body = ""
+    for request_id, status, payload in parts:
+        body += (
+            "--batch\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <response-x + {request_id}>\r\n\r\n"
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            "Content-Type: application/json\r\n\r\n"
+            f"{orjson.dumps(payload).decode()}\r\n"
+        )
+    body += "--batch--\r\n"
+    return {"status": "200", "content-type": "multipart/mixed; boundary=batch"}, body
+
+
+def test_share_with_anyone():
+    """Files are shared in one batch; failures are left out of the result."""
+    with tempfile.TemporaryDirectory() as tmp:
+        client = _client(
+            [
+                _batch_response([
+                    ("img1", 200, {"id": "perm1"}),
+                    ("img2", 403, {"error": {"code": 403, "message": "not allowed"}}),
+                    ("img3", 200, {"id": "perm3"}),
+                ])
+            ],
+            DriveCache(Path(tmp) / "drive.sqlite3"),
+        )
+        assert client.share_with_anyone(["img1", "img2", "img3", "img1"]) == ["img1", "img3"]
+    print("  PASS: share_with_anyone batches and skips failures")
+
+
+if __name__ == "__main__":
+    print("Running Drive client tests...\n")
+    test_sync_changes_skips_drive_changes()
+    test_recent_files_fall_back_when_cache_fails()
+    test_share_with_anyone()
+    print("\nAll tests passed!")
@@ -0,0 +1,124 @@
+"""Check the parsers against output recorded from the original implementations.
+
+``fixtures/parser_expected.json`` holds what the parsers produced on the
+checked-in fixtures before they were rewritten for speed, so any change in
+parsed fields or summary text shows up here.
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.parsers.experiment_sheet import (
+    experiment_to_summary_text,
+    parse_experiment_csv,
+    parse_experiment_grid,
+)
+from src.parsers.goals import goals_to_summary_text, parse_goals_csv, parse_goals_grid
+from src.parsers.journal import entries_to_summary_text, parse_journal_txt
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+EXPECTED = json.loads((FIXTURES_DIR / "parser_expected.json").read_text(encoding="utf-8"))
+
+
+def _read_rows(path: Path) -> list[list[str]]:
+    """Read a fixture CSV the way the Sheets API hands over a grid."""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_experiment_sheets_match_baseline():
+    """Experiment sheets parse and summarize exactly as before."""
+    for name, expected in EXPECTED["experiments"].items():
+        exp = parse_experiment_csv(FIXTURES_DIR / name)
+        assert exp.model_dump(mode="json") == expected["experiment"], name
+        assert experiment_to_summary_text(exp) == expected["summary"], name
+    print(f"  PASS: {len(EXPECTED['experiments'])} experiment sheets match baseline")
+
+
+def test_experiment_grid_matches_csv():
+    """The Sheets API grid path gives the same experiment as the CSV path."""
+    for name in EXPECTED["experiments"]:
+        from_csv = parse_experiment_csv(FIXTURES_DIR / name)
+        from_grid = parse_experiment_grid(_read_rows(FIXTURES_DIR / name), name)
+        assert from_grid.model_dump() == from_csv.model_dump(), name
+    print("  PASS: Experiment grid path matches CSV path")
+
+
+def test_experiment_header_first_value_wins():
+    """A header key repeated further down does not replace the first value."""
+    rows = [
+        ["Purpose", "", "first purpose"],
+        ["Notes", "", "note a"],
+        ["Tester", "", "Adit"],
+        ["Purpose", "", "second purpose"],
+        ["Notes", "", "note b"],
+    ]
+    exp = parse_experiment_grid(rows, "Device Testing - 01_05_2026 Header.csv")
+    assert exp.purpose == "first purpose"
+    assert exp.notes == "note a"
+    assert exp.tester == "Adit"
+    print("  PASS: Repeated header keys keep the first value")
+
+
+def test_goals_match_baseline():
+    """Goals CSVs (with and without quoted cells) parse and summarize as before."""
+    for name, expected in EXPECTED["goals"].items():
+        goals = parse_goals_csv(FIXTURES_DIR / name)
+        assert [g.model_dump(mode="json") for g in goals] == expected["goals"], name
+        assert goals_to_summary_text(goals) == expected["summary"], name
+    print(f"  PASS: {len(EXPECTED['goals'])} goals CSVs match baseline")
+
+
+def test_goals_grid_matches_csv():
+    """The Sheets API grid path gives the same goals as the CSV path."""
+    for name in EXPECTED["goals"]:
+        from_csv = parse_goals_csv(FIXTURES_DIR / name)
+        from_grid = parse_goals_grid(_read_rows(FIXTURES_DIR / name))
+        assert [g.model_dump() for g in from_grid] == [g.model_dump() for g in from_csv], name
+    print("  PASS: Goals grid path matches CSV path")
+
+
+def test_goals_csv_keeps_non_newline_breaks_in_cells():
+    """Only CR/LF end a row; other line-break characters stay inside the cell."""
+    goals = parse_goals_csv(FIXTURES_DIR / "goals_simple.csv")
+    clinical = next(g for g in goals if g.short_name == "Clinical Verification Study")
+    assert "more\x0breqs" in clinical.requirements
+    print("  PASS: Vertical tab kept inside a goals cell")
+
+
+def test_journals_match_baseline():
+    """Journals (LF and CRLF) split into the same entries and summary as before."""
+    for name, expected in EXPECTED["journals"].items():
+        entries = parse_journal_txt(FIXTURES_DIR / name)
+        assert [e.model_dump(mode="json") for e in entries] == expected["entries"], name
+        assert entries_to_summary_text(entries) == expected["summary"], name
+    print(f"  PASS: {len(EXPECTED['journals'])} journals match baseline")
+
+
+def test_combined_journal_summary_heading_order():
+    """Dates spelled differently across journals keep first-appearance order."""
+    entries = []
+    for name in EXPECTED["journals"]:
+        entries.extend(parse_journal_txt(FIXTURES_DIR / name))
+    text = entries_to_summary_text(entries)
+    assert text == EXPECTED["combined_journal_summary"]
+    assert text.index("### 01/05/2026") < text.index("### 2026-01-05")
+    print("  PASS: Combined journal summary matches baseline")
+
+
+if __name__ == "__main__":
+    print("Running parser equivalence tests...\n")
+    test_experiment_sheets_match_baseline()
+    test_experiment_grid_matches_csv()
+    test_experiment_header_first_value_wins()
+    test_goals_match_baseline()
+    test_goals_grid_matches_csv()
+    test_goals_csv_keeps_non_newline_breaks_in_cells()
+    test_journals_match_baseline()
+    test_combined_journal_summary_heading_order()
+    print("\nAll tests passed!")
@@ -0,0 +1,202 @@
+"""Tests for the report section reader and the Ct box plot statistics."""
+
+import sys
+import tempfile
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+from matplotlib import cbook
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.graphics.charts import _box_stats
+from src.models.data import AnalysisResult, RecommendationResult
+from src.output.slides import _extract_section, _section_reader, create_weekly_report
+
+# Stage 1 response in the analysis prompt's heading format
+ANALYSIS_RESPONSE = """1. EXPERIMENT FAMILY CLASSIFICATION
+- LOD series: 01_05 Liquid + TS
+
+2. EXECUTIVE SUMMARY (for leadership)
+LOD reached 100 cp on TS-003.
+
+3. EXPERIMENT-BY-EXPERIMENT ANALYSIS (for scientists)
+Liquid + TS: clean sigmoid curves in all FAM channels.
+Preheat: ROX dropped out in CH 2.
+
+4. CONTRADICTION & ANOMALY CHECK
+None this week.
+
+5. CROSS-EXPERIMENT INSIGHTS
+Preheat helps fTaq more than DsBio.
+
+6. UPDATED CUMULATIVE LEARNINGS
+```json
+{"key_learnings": []}
+```
+"""
+
+ANALYSIS_SECTIONS = [
+    "EXECUTIVE SUMMARY",
+    "EXPERIMENT-BY-EXPERIMENT ANALYSIS",
+    "CONTRADICTION",
+    "CROSS-EXPERIMENT INSIGHTS",
+]
+
+
+def test_section_reader_matches_extract_section():
+    """On responses in the prompt format, the reader agrees with _extract_section."""
+    section = _section_reader(ANALYSIS_RESPONSE)
+    for name in ANALYSIS_SECTIONS:
+        assert section(name) == _extract_section(ANALYSIS_RESPONSE, name), name
+    assert section("EXECUTIVE SUMMARY") == "LOD reached 100 cp on TS-003."
+    print("  PASS: Section reader matches _extract_section")
+
+
+def test_section_reader_keeps_numbered_lists():
+    """Numbered list items inside a section are not mistaken for headings."""
+    response = (
+        "3. SPECIFIC EXPERIMENT RECOMMENDATIONS (3-5 experiments)\n"
+        "1. Preheat test: Ct dropped by 2 cycles\n"
+        "2. Evagreen: repeat with fresh master mix\n"
+        "\n"
+        "4. EXPERIMENTS TO AVOID\n"
+        "1. DNA extraction without the new buffer\n"
+    )
+    section = _section_reader(response)
+    assert section("SPECIFIC EXPERIMENT RECOMMENDATIONS") == (
+        "1. Preheat test: Ct dropped by 2 cycles\n"
+        "2. Evagreen: repeat with fresh master mix"
+    )
+    assert section("EXPERIMENTS TO AVOID") == "1. DNA extraction without the new buffer"
+    print("  PASS: Section reader keeps numbered lists")
+
+
+def test_section_reader_falls_back():
+    """Sections under other heading styles are still found."""
+    response = "## Executive Summary\nAll good.\n\n## Next Steps\nMore runs.\n"
+    section = _section_reader(response)
+    assert section("EXECUTIVE SUMMARY") == "All good."
+    assert section("GOAL URGENCY") == ""
+    print("  PASS: Section reader fallback")
+
+
+def test_box_stats_match_matplotlib():
+    """Batched box statistics match matplotlib's per-box computation."""
+    rng = np.random.default_rng(0)
+    values = [
+        [24.63, 25.1, 24.9],
+        [31.5],
+        list(rng.normal(28, 2, 12)) + [45.0, 12.0],  # with outliers
+        [20.0, 20.0, 20.0, 20.0],
+    ]
+    labels = [f"run {i}" for i in range(len(values))]
+
+    expected = cbook.boxplot_stats(values, labels=labels)
+    for got, want in zip(_box_stats(values, labels), expected):
+        assert got["label"] == want["label"]
+        for key in ("q1", "med", "q3", "whislo", "whishi"):
+            assert np.isclose(got[key], want[key]), (want["label"], key)
+        assert np.allclose(np.sort(got["fliers"]), np.sort(want["fliers"])), want["label"]
+    print("  PASS: Box stats match matplotlib")
+
+
+class _FakeRequest:
+    def __init__(self, result=None):
+        self._result = result
+
+    def execute(self):
+        return self._result
+
+
+class _FakeFiles:
+    def __init__(self, deleted):
+        self._deleted = deleted
+
+    def create(self, **kwargs):
+        return _FakeRequest({"id": "chart-1"})
+
+    def delete(self, fileId, **kwargs):
+        self._deleted.append(fileId)
+        return _FakeRequest()
+
+
+class _FakeDrive:
+    def __init__(self, deleted):
+        self._deleted = deleted
+
+    def files(self):
+        return _FakeFiles(self._deleted)
+
+
+class _FakePresentations:
+    def __init__(self, updates):
+        self._updates = updates
+
+    def batchUpdate(self, presentationId, body):
+        self._updates.append(body["requests"])
+        return _FakeRequest()
+
+
+class _FakeSlides:
+    def __init__(self):
+        self.updates = []
+
+    def presentations(self):
+        return _FakePresentations(self.updates)
+
+
+class _UnsharingDriveClient:
+    """Drive client stand-in whose chart sharing always fails."""
+
+    def __init__(self):
+        self.slides = _FakeSlides()
+        self.deleted = []
+
+    def thread_drive(self):
+        return _FakeDrive(self.deleted)
+
+    def create_presentation_in_folder(self, title, folder_id):
+        return "deck-1", {"slides": [{"objectId": "blank"}]}
+
+    def share_with_anyone(self, file_ids):
+        raise RuntimeError("sharing disabled for this drive")
+
+
+def test_report_built_when_chart_sharing_fails():
+    """A sharing failure drops the chart slides but still builds the text slides."""
+    client = _UnsharingDriveClient()
+    with tempfile.TemporaryDirectory() as tmp:
+        chart_path = Path(tmp) / "ct.png"
+        chart_path.write_bytes(b"png")
+        url = create_weekly_report(
+            client,
+            date(2026, 1, 5),
+            date(2026, 1, 11),
+            AnalysisResult(raw_response=ANALYSIS_RESPONSE),
+            RecommendationResult(),
+            [],
+            [chart_path],
+            "reports-folder",
+        )
+
+    assert url == "https://docs.google.com/presentation/d/deck-1"
+    assert len(client.slides.updates) == 1
+    requests = client.slides.updates[0]
+    assert requests[0] == {"deleteObject": {"objectId": "blank"}}
+    assert any("insertText" in r for r in requests)
+    assert not any("createImage" in r for r in requests)
+    assert client.deleted == ["chart-1"]
+    print("  PASS: Report built without charts when sharing fails")
+
+
+if __name__ == "__main__":
+    print("Running report helper tests...\n")
+    test_section_reader_matches_extract_section()
+    test_section_reader_keeps_numbered_lists()
+    test_section_reader_falls_back()
+    test_box_stats_match_matplotlib()
+    test_report_built_when_chart_sharing_fails()
+    print("\nAll tests passed!")
@@ -0,0 +1,99 @@
+"""Tests for reading Stage 1 responses: tagged sections and the learnings JSON."""
+
+import asyncio
+import sys
+from datetime import date
+from pathlib import Path
+
+import orjson
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.analysis.summarizer import _repair_json, _tagged_section, run_analysis_with_constraints
+from src.models.data import JournalEntry, WeeklyData
+
+LEARNINGS_BLOCK = '```json\n{"key_learnings": ["Preheat lowers fTaq Ct"]}\n```'
+CONSTRAINTS_BLOCK = '```json\n{"equipment": ["Device 3 is down"]}\n```'
+
+
+class _FakeClaude:
+    """Streams a canned response in small chunks."""
+
+    def __init__(self, response: str):
+        self._response = response
+
+    async def send_message_stream(self, prompt, **kwargs):
+        for start in range(0, len(self._response), 7):
+            yield self._response[start:start + 7]
+
+
+def _weekly_data() -> WeeklyData:
+    return WeeklyData(
+        week_start=date(2026, 1, 5),
+        week_end=date(2026, 1, 11),
+        journal_entries=[
+            JournalEntry(entry_date=date(2026, 1, 6), author="Adit", content="Device 3 is down.")
+        ],
+    )
+
+
+def test_tagged_section():
+    """Sections are found between their tags and missing when a tag is."""
+    response = "<analysis>\n1. SUMMARY\n</analysis>\n<constraints>{}</constraints>"
+    assert _tagged_section(response, "analysis") == "1. SUMMARY"
+    assert _tagged_section(response, "constraints") == "{}"
+    assert _tagged_section(response, "missing") is None
+    assert _tagged_section("<analysis>never closed", "analysis") is None
+    print("  PASS: Tagged sections")
+
+
+def test_repair_json():
+    """Raw control characters in strings and trailing commas are fixed."""
+    broken = '{"key_learnings": ["line one\nline two\tend", "a, ]b",], "open_questions": [],}'
+    assert orjson.loads(_repair_json(broken)) == {
+        "key_learnings": ["line one\nline two\tend", "a, ]b"],
+        "open_questions": [],
+    }
+    valid = '{"a": "x\\"y", "b": [1, 2]}'
+    assert _repair_json(valid) == valid
+    print("  PASS: JSON repair")
+
+
+def test_combined_analysis_learnings_from_analysis_section():
+    """With tags, the learnings come from the analysis, not the constraints block."""
+    response = (
+        f"<constraints>\n{CONSTRAINTS_BLOCK}\n</constraints>\n"
+        f"<analysis>\n1. EXECUTIVE SUMMARY\nGood week.\n\n{LEARNINGS_BLOCK}\n</analysis>"
+    )
+    constraints, result = asyncio.run(
+        run_analysis_with_constraints(_weekly_data(), _FakeClaude(response))
+    )
+    assert constraints == CONSTRAINTS_BLOCK
+    assert result.updated_learnings.key_learnings == ["Preheat lowers fTaq Ct"]
+    assert result.raw_response.startswith("1. EXECUTIVE SUMMARY")
+    print("  PASS: Learnings read from the analysis section")
+
+
+def test_combined_analysis_without_tags():
+    """Without tags, the first JSON block is used only if it has learnings fields."""
+    response = f"1. EXECUTIVE SUMMARY\nGood week.\n\n{CONSTRAINTS_BLOCK}\n\n{LEARNINGS_BLOCK}\n"
+    _, result = asyncio.run(run_analysis_with_constraints(_weekly_data(), _FakeClaude(response)))
+    assert result.updated_learnings is None
+
+    response = f"1. EXECUTIVE SUMMARY\nGood week.\n\n{LEARNINGS_BLOCK}\n"
+    constraints, result = asyncio.run(
+        run_analysis_with_constraints(_weekly_data(), _FakeClaude(response))
+    )
+    assert constraints == "{}"
+    assert result.updated_learnings.key_learnings == ["Preheat lowers fTaq Ct"]
+    print("  PASS: Untagged responses fall back to the learnings guard")
+
+
+if __name__ == "__main__":
+    print("Running summarizer tests...\n")
+    test_tagged_section()
+    test_repair_json()
+    test_combined_analysis_learnings_from_analysis_section()
+    test_combined_analysis_without_tags()
+    print("\nAll tests passed!")